@@ -1,10 +1,27 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from PyQt5 import QtWidgets
-from PyQt5.QtWidgets import QVBoxLayout
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QShortcut, QVBoxLayout
 
+from app.services.filter_catalog_view import FilterCatalogDialog
+from app.services.first_frame_watcher import FirstFrameWatcher
+from app.services.frame_scheduler import FrameScheduler
 from app.services.mouse_signal_input import MouseSignalInput
+from app.services.signal_playback import SPEED_SLIDER_RANGE, SignalPlayback, samples_per_tick
+from app.services.timing_overlay import TimingOverlay
 from app.services.zplane_controller import ZPlaneController
 from app.ui.design02 import Ui_MainWindow
 from app.utils.clean_cache import remove_directories
+from app.utils.compute_pipeline import ComputePipeline
+from app.utils.filter_catalog import FilterCatalog
+from app.utils.instrumentation import instrumentation
+from app.utils.quantization import STREAMING_PRECISIONS, format_reports, quantization_reports
+from app.utils.startup_profiler import exit_after_first_frame, report_path, startup_profiler
 
 
 class MainWindowController(QtWidgets.QMainWindow):
@@ -13,12 +30,34 @@ class MainWindowController(QtWidgets.QMainWindow):
         self.app = app
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
+        # Shared display-rate timer that coalesces plot updates
+        self.frame_scheduler = FrameScheduler(max_fps=60, parent=self)
+        # Worker threads for re-filtering and response rebuilds; results are
+        # picked up on the frame after they finish
+        self.compute_pipeline = ComputePipeline()
         self.initialize_z_plane()
         self.initialize_mouse_signal_input()
-        # self.zplane_controller.export_filter_to_c()
+        self.initialize_playback()
+        self.initialize_instrumentation()
 
         self.connect_signals()
 
+        # Background work starts once the window is on screen (see on_first_frame)
+        self.ui.catalog_button.setEnabled(False)
+        self.first_frame_watcher = FirstFrameWatcher(self)
+        self.first_frame_watcher.first_frame.connect(self.on_first_frame)
+
+    def on_first_frame(self):
+        startup_profiler.mark("first_frame")
+        path = report_path()
+        if path:
+            print(startup_profiler.format_report())
+            startup_profiler.write(path)
+        if exit_after_first_frame():
+            self.quit_app()
+            return
+        self.initialize_catalog()
+
     def initialize_z_plane(self):
         # Initialize ZPlaneController
         self.zplane_controller = ZPlaneController(
@@ -33,48 +72,190 @@ class MainWindowController(QtWidgets.QMainWindow):
             self.ui.all_pass_remove_radioButton,
             self.ui.all_pass_add_radioButton,
             self.ui.select_all_pass_filters_button,
-            self.ui.create_button
+            self.ui.create_button,
+            frame_scheduler=self.frame_scheduler,
+            pipeline=self.compute_pipeline,
         )
 
     def initialize_mouse_signal_input(self):
         """Set up the mouse signal generator."""
         self.original_plot_widget = self.ui.original_plot_widget  # Plot to display the signal
-        self.mouse_signal_input = MouseSignalInput(self.original_plot_widget, self.ui.filtered_plot_widget, self.zplane_controller,self.ui.all_pass_add_radioButton,self.ui.all_pass_remove_radioButton)
+        self.mouse_signal_input = MouseSignalInput(self.original_plot_widget, self.ui.filtered_plot_widget, self.zplane_controller, frame_scheduler=self.frame_scheduler, pipeline=self.compute_pipeline)
 
         # Embed the MouseSignalInput into the padding_area
         self.padding_area_layout = QVBoxLayout(self.ui.padding_area)
         self.padding_area_layout.addWidget(self.mouse_signal_input)
 
+    def initialize_playback(self):
+        """Timer-driven playback of loaded signal files into the live signal plots."""
+        self.signal_playback = SignalPlayback(self.mouse_signal_input, tick_ms=16, parent=self)
+        self.signal_playback.finished.connect(lambda: self.ui.play_button.setText("Play"))
+        self.ui.speed_slider.setRange(*SPEED_SLIDER_RANGE)
+        self.ui.speed_slider.valueChanged.connect(self.update_playback_speed)
+        self.ui.speed_slider.setValue(60)  # 1000 samples per tick
+        self.update_playback_speed(self.ui.speed_slider.value())
+        self.ui.play_button.setEnabled(False)
+
+    def update_playback_speed(self, value):
+        block_size = samples_per_tick(value)
+        self.signal_playback.set_block_size(block_size)
+        self.ui.speed_label.setText(f"{block_size} smp/tick")
+
+    def load_signal(self):
+        filepath, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Load Signal", "", "Signals (*.csv *.npy *.wav);;All Files (*)"
+        )
+        if not filepath:
+            return
+        try:
+            length = self.signal_playback.load(filepath)
+        except (OSError, ValueError) as e:
+            print(f"Error loading signal {filepath}: {e}")
+            return
+        print(f"Loaded {length} samples from {filepath}")
+        self.ui.play_button.setText("Play")
+        self.ui.play_button.setEnabled(length > 0)
+
+    def toggle_playback(self):
+        self.signal_playback.toggle()
+        self.ui.play_button.setText("Pause" if self.signal_playback.is_playing else "Play")
+
+    def initialize_catalog(self):
+        """Build the filter catalog in the background so startup isn't blocked."""
+        cache_root = os.environ.get("DIGITAL_FILTER_CACHE_DIR")
+        cache_dir = os.path.join(cache_root or tempfile.gettempdir(), "digital_filter_catalog")
+        self.catalog = FilterCatalog(cache_dir=cache_dir)
+        self.catalog_executor = ThreadPoolExecutor(max_workers=1)
+        self.catalog_future = self.catalog_executor.submit(
+            self.catalog.build, os.environ.get("DIGITAL_FILTER_DESIGNS_DIR")
+        )
+        self.ui.catalog_button.setEnabled(False)
+
+        # Poll for completion from the GUI thread
+        self.catalog_timer = QTimer(self)
+        self.catalog_timer.timeout.connect(self.check_catalog)
+        self.catalog_timer.start(100)
+
+    def check_catalog(self):
+        if not self.catalog_future.done():
+            return
+        self.catalog_timer.stop()
+        self.catalog_executor.shutdown(wait=False)
+        try:
+            self.catalog_future.result()
+        except Exception as e:
+            print(f"Error building the filter catalog: {e}")
+            return
+        self.ui.catalog_button.setEnabled(True)
+
+    def show_catalog(self):
+        dialog = FilterCatalogDialog(self.catalog.entries, parent=self)
+        dialog.entry_selected.connect(self.apply_catalog_entry)
+        dialog.exec_()
+
+    def apply_catalog_entry(self, entry):
+        if entry.source == "library":
+            # Goes through apply_selected_filter like a manual selection
+            self.ui.filters_library_combobox.setCurrentText(entry.payload)
+        elif entry.source == "project":
+            # Restore the whole project (library gain and all-pass sections included), as Load does
+            if self.zplane_controller.load_file(entry.payload) is not None:
+                self.show_filter_selection(self.zplane_controller.model.filter_selection)
+        else:
+            # The loaded roots replace any library design, so show and filter with "None"
+            self.zplane_controller.model.filter_selection = "None"
+            self.show_filter_selection("None")
+            self.zplane_controller.model.load_roots(entry.zeros, entry.poles)
+
+    def initialize_instrumentation(self):
+        """Timing overlay and profiling hotkeys (F9 overlay, F10 profile, F11 dump)."""
+        self.timing_overlay = TimingOverlay(self)
+        QShortcut(QKeySequence("F9"), self, activated=self.timing_overlay.toggle)
+        QShortcut(QKeySequence("F10"), self, activated=self.toggle_profile)
+        QShortcut(QKeySequence("F11"), self, activated=self.dump_timings)
+
+    def toggle_profile(self):
+        if instrumentation.profiler is None:
+            instrumentation.start_profile()
+            print("Profiling started (press F10 again to stop)")
+            return
+        path = os.path.join(tempfile.gettempdir(), time.strftime("digital_filter_%Y%m%d_%H%M%S.prof"))
+        instrumentation.stop_profile(path)
+        print(f"Profile written to {path}")
+
+    def dump_timings(self):
+        path = os.path.join(tempfile.gettempdir(), "digital_filter_timings_summary.jsonl")
+        instrumentation.dump_summary(path)
+        print(f"Timings written to {path}")
+
+    def show_quantization_report(self):
+        """Report the SNR and pole movement of the current design in float32/q31/q15."""
+        report = format_reports(quantization_reports(self.mouse_signal_input.current_sos()))
+        print(report)
+        QtWidgets.QMessageBox.information(self, "Quantization Report", f"<pre>{report}</pre>")
+
     def connect_signals(self):
         self.ui.quit_button.clicked.connect(self.quit_app)
-        #self.ui.horizontalSlider.valueChanged.connect(self.ui.update_slider_label)
 
         self.ui.save_filter_button.clicked.connect(lambda: self.zplane_controller.save_to_file())
-        self.ui.load_filter_button.clicked.connect(lambda: self.zplane_controller.load_from_file())
+        self.ui.load_filter_button.clicked.connect(self.load_filter)
+        self.ui.catalog_button.clicked.connect(self.show_catalog)
+        self.ui.load_signal_button.clicked.connect(self.load_signal)
+        self.ui.play_button.clicked.connect(self.toggle_playback)
+        # Fixed point is only offered in the quantization report
+        self.ui.precision_combobox.addItems(STREAMING_PRECISIONS)
+        self.ui.precision_combobox.currentTextChanged.connect(self.mouse_signal_input.set_precision)
+        self.ui.quantization_button.clicked.connect(self.show_quantization_report)
 
         # Connect Z-plane actions
-        self.ui.swap_button.clicked.connect(self.zplane_controller.swap_zeros_poles)
-        self.ui.clear_zeros_button.clicked.connect(self.zplane_controller.clear_zeros)
-        self.ui.clear_poles_button.clicked.connect(self.zplane_controller.clear_poles)
-        self.ui.clear_all_button.clicked.connect(self.zplane_controller.clear_all)
-        self.ui.undo_button.clicked.connect(self.zplane_controller.undo)
-        self.ui.redo_button.clicked.connect(self.zplane_controller.redo)
+        zplane_model = self.zplane_controller.model
+        self.ui.swap_button.clicked.connect(zplane_model.swap_zeros_poles)
+        self.ui.clear_zeros_button.clicked.connect(zplane_model.clear_zeros)
+        self.ui.clear_poles_button.clicked.connect(zplane_model.clear_poles)
+        self.ui.clear_all_button.clicked.connect(zplane_model.clear_all)
+        self.ui.undo_button.clicked.connect(zplane_model.undo)
+        self.ui.redo_button.clicked.connect(zplane_model.redo)
         # Populate the combobox with filters
         self.ui.filters_library_combobox.addItems(self.zplane_controller.filter_library.keys())
         self.ui.filters_library_combobox.currentIndexChanged.connect(self.apply_selected_filter)
         self.ui.filter_realizaion_structure.clicked.connect(self.zplane_controller.display_circuit_in_groupbox)
+        self.ui.filter_realization_code.clicked.connect(self.zplane_controller.export_filter_to_c)
         self.zplane_controller.configure_x_axis(self.ui.magnitude_plot_widget)
         self.zplane_controller.configure_x_axis(self.ui.phase_plot_widget)
 
+    def load_filter(self):
+        project = self.zplane_controller.load_from_file()
+        if project is None:
+            return
+        # Show the restored library choice without re-applying it over the loaded roots
+        self.show_filter_selection(self.zplane_controller.model.filter_selection)
+
+    def show_filter_selection(self, filter_name):
+        """Sync the library combobox with the model without triggering apply_selected_filter."""
+        self.ui.filters_library_combobox.blockSignals(True)
+        self.ui.filters_library_combobox.setCurrentText(filter_name)
+        self.ui.filters_library_combobox.blockSignals(False)
+
     def apply_selected_filter(self, index):
         """Handle filter selection from the combobox."""
         if index < 0:
             return  # Ignore invalid selection
         filter_name = self.ui.filters_library_combobox.itemText(index)
-        self.zplane_controller.filter_selection = filter_name
-        self.zplane_controller.update_z_plane_from_filter()  # Update Z-plane
-        self.mouse_signal_input.set_filter(filter_name)
+        self.zplane_controller.select_library(filter_name)  # Update Z-plane (the live filter follows the model)
 
     def quit_app(self):
+        self.shut_down()
         self.app.quit()
         remove_directories()
+
+    def closeEvent(self, event):
+        # Closing the window (not only the quit button) also deletes the capture files
+        self.shut_down()
+        super().closeEvent(event)
+
+    def shut_down(self):
+        """Stop the background workers and delete the spilled capture files (safe to call twice)."""
+        instrumentation.close()
+        self.zplane_controller.diagram_renderer.close()
+        self.compute_pipeline.close()
+        self.mouse_signal_input.close_session()
@@ -0,0 +1,163 @@
+"""
+A growing signal filtered as it arrives, without any GUI.
+
+``LiveFilter`` keeps the complete input and output captures (as min/max
+pyramids, so any range can be plotted cheaply) and a streaming filter whose
+state carries over between blocks. ``set_design`` switches to a new
+``FilterState`` and re-filters the history: inline without a pipeline, or on
+a ``ComputePipeline`` worker into the back copy of the output, which
+``collect`` swaps in once it is done (new samples keep going through the old
+filter meanwhile).
+"""
+import numpy as np
+
+from app.utils.c_export import make_streaming_filter
+from app.utils.cascade import IDENTITY_SECTION
+from app.utils.compute_pipeline import DoubleBuffer
+from app.utils.filter_state import FilterState
+from app.utils.instrumentation import instrumentation
+from app.utils.minmax_pyramid import MinMaxPyramid
+from app.utils.quantization import check_streaming_precision, make_precision_filter
+
+# Block size used when re-filtering the whole capture after a design change
+REFILTER_CHUNK = 1 << 16
+
+
+def make_live_filter(sos, precision="float64"):
+    """Streaming filter for ``sos`` in float64 or float32 (float64 if the design does not fit)."""
+    if check_streaming_precision(precision) == "float64":
+        return make_streaming_filter(sos)
+    try:
+        return make_precision_filter(sos, precision)
+    except ValueError as e:
+        print(f"Filtering in float64 instead of {precision}: {e}")
+        return make_streaming_filter(sos)
+
+
+def refilter_job(filter_state, precision, samples, target, is_stale):
+    """Pipeline job: filter the ``samples`` snapshot into ``target`` with a fresh filter."""
+    stream_filter = make_live_filter(filter_state.sos(), precision)
+    target.clear()
+    length = 0
+    for part in samples:
+        for start in range(0, len(part), REFILTER_CHUNK):
+            if is_stale():
+                return None  # A newer design (or a reset) supersedes this one
+            chunk = part[start:start + REFILTER_CHUNK]
+            target.extend(np.real(stream_filter.process(chunk)))
+            length += len(chunk)
+    return stream_filter, length
+
+
+class LiveFilter:
+    def __init__(self, pipeline=None, session=None, precision="float64"):
+        self.pipeline = pipeline
+        # With a SignalSession, older samples spill to memory-mapped files
+        self.session = session
+        self.precision = check_streaming_precision(precision)
+        self.filter_state = FilterState()
+
+        self.signal = MinMaxPyramid(make_store=self._store_factory("original_"))
+        # The filtered capture is double-buffered: a re-filter on the pipeline
+        # writes the back copy while the front one keeps growing
+        self.filtered_buffers = DoubleBuffer(
+            MinMaxPyramid(make_store=self._store_factory("filtered_a_")),
+            MinMaxPyramid(make_store=self._store_factory("filtered_b_")),
+        )
+        # Streaming filter engine: keeps its state between blocks so each new
+        # sample is filtered in O(order) instead of re-filtering the history
+        # (compiled C kernel when DIGITAL_FILTER_NATIVE=1, scipy otherwise)
+        self.stream_filter = make_streaming_filter(IDENTITY_SECTION)
+
+    def _store_factory(self, prefix):
+        if self.session is None:
+            return None
+        return lambda name: self.session.store(prefix + name)
+
+    @property
+    def filtered_signal(self):
+        return self.filtered_buffers.front
+
+    def __len__(self):
+        return len(self.signal)
+
+    def append(self, value):
+        """Append and filter one sample."""
+        self.signal.append(value)
+        self.apply_filter([value])
+
+    def extend(self, samples):
+        """Append and filter a block of samples in one call."""
+        self.signal.extend(samples)
+        self.apply_filter(samples)
+
+    @instrumentation.timed("filter_compute")
+    def apply_filter(self, samples):
+        """Filter new samples with the streaming filter and append the output."""
+        filtered = np.real(self.stream_filter.process(samples))  # Ensure the signal is real
+        if len(filtered) == 1:
+            self.filtered_signal.append(filtered[0])  # Mouse events: the pyramid's scalar fast path
+        else:
+            self.filtered_signal.extend(filtered)
+
+    def set_design(self, filter_state):
+        """Switch to a new FilterState and re-filter the history with it."""
+        self.filter_state = filter_state
+        self.refilter()
+
+    def set_precision(self, precision):
+        """Switch to float64 or float32 and re-filter the history."""
+        self.precision = check_streaming_precision(precision)
+        self.refilter()
+
+    @instrumentation.timed("filter_reset")
+    def refilter(self):
+        """
+        Re-filter the history with the current design and precision.
+
+        With a pipeline the worker gets the (immutable) filter state and a
+        snapshot of the samples and fills the back buffer; ``collect`` swaps
+        it in. Without one the history is filtered right away.
+        """
+        args = (self.filter_state, self.precision, self.signal.snapshot(), self.filtered_buffers.back)
+        if self.pipeline is None:
+            self._swap_in(refilter_job(*args, lambda: False))
+        else:
+            self.pipeline.submit("refilter", refilter_job, *args)
+
+    def refilter_pending(self):
+        return self.pipeline is not None and self.pipeline.pending("refilter")
+
+    def collect(self):
+        """Swap in a finished re-filter; returns True when the output changed."""
+        if self.pipeline is None:
+            return False  # Inline re-filters are swapped in right away
+        result = self.pipeline.take("refilter")
+        if result is None:
+            return False
+        self._swap_in(result)
+        return True
+
+    def _swap_in(self, result):
+        stream_filter, length = result
+        target = self.filtered_buffers.back
+        # Catch up on the samples captured while the worker was busy
+        for start in range(length, len(self.signal), REFILTER_CHUNK):
+            target.extend(np.real(stream_filter.process(self.signal.read(start, start + REFILTER_CHUNK))))
+        self.filtered_buffers.swap()
+        self.stream_filter = stream_filter
+
+    def reset(self):
+        """Drop both captures and restart the filter from rest."""
+        refilter_pending = self.refilter_pending()
+        self.signal.clear()
+        self.filtered_signal.clear()
+        self.stream_filter.reset()
+        if refilter_pending:
+            # Supersede the re-filter of the old capture, but still switch to the new design
+            self.refilter()
+
+    def close(self):
+        """Delete the spilled capture files (when using a session)."""
+        if self.session is not None:
+            self.session.close()
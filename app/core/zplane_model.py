@@ -0,0 +1,462 @@
+"""
+The editable zero/pole design, without any GUI.
+
+``ZPlaneModel`` owns the zeros and poles, the library selection and the
+all-pass sections, with undo/redo, a spatial index for hit tests and an
+incrementally updated frequency response. ``filter_state`` is the immutable
+snapshot (see ``app.utils.filter_state``) every consumer reads.
+
+Without a ``pipeline`` everything runs inline, which is what scripts and
+batch jobs want. The GUI passes a ``ComputePipeline``: full response
+rebuilds of large designs and uncached library designs then run on its
+workers, and ``collect_response`` / ``collect_library_design`` pick the
+results up (the GUI calls them once per frame while they are pending).
+"""
+from app.utils.compute_pipeline import DoubleBuffer
+from app.utils.edit_history import Edit, EditHistory
+from app.utils.filter_design import FILTER_LIBRARY_SPECS, FilterDesignCache
+from app.utils.filter_io import read_roots_csv, write_roots_csv
+from app.utils.filter_project import PROJECT_EXTENSION, load_project, save_project
+from app.utils.filter_state import FilterState
+from app.utils.instrumentation import instrumentation
+from app.utils.root_response import RootResponse
+from app.utils.spatial_index import RootIndex
+
+# Grid of the plotted frequency response
+RESPONSE_POINTS = 500
+# Full response rebuilds for more roots than this run on the compute pipeline;
+# smaller ones are cheaper than the hand-off and stay inline
+ASYNC_RESPONSE_ROOTS = 64
+
+# All-pass sections offered by default
+ALL_PASS_LIBRARY = {
+    "All-Pass 1": {'zeros': [-2], 'poles': [-0.5]},
+    "All-Pass 2": {'zeros': [1/0.8], 'poles': [0.8]},
+    "All-Pass 3": {'zeros': [-2-1j], 'poles': [1/(-2+1j)]},
+    "All-Pass 4": {'zeros': [2j], 'poles': [1 / (-2j)]},
+}
+
+
+def rebuild_response_job(engine, zeros, poles, gain, is_stale):
+    """Pipeline job: recompute ``engine`` (the back buffer) from a snapshot of the roots."""
+    engine.reset(zeros, poles, gain)
+    return engine
+
+
+def library_design_job(design_cache, spec, is_stale):
+    """Pipeline job: look up (or run) a library design; the first one also imports scipy."""
+    return design_cache.zpk(spec)
+
+
+def custom_all_pass(zeros):
+    """All-pass section with the given zeros: each pole is 1 / conj(zero)."""
+    zeros = [complex(zero) for zero in zeros]
+    return {'zeros': zeros, 'poles': [1 / zero.conjugate() for zero in zeros]}
+
+
+class ZPlaneModel:
+    def __init__(self, design_cache=None, pipeline=None, worN=RESPONSE_POINTS):
+        # Filter library: designs are memoized (ba, zpk and sos forms), so
+        # selecting an entry does not re-run the scipy design routine
+        self.design_cache = design_cache or FilterDesignCache()
+        self.pipeline = pipeline
+
+        # Data storage
+        self.zeros = []
+        self.poles = []
+        # Grid index over root positions, keyed by (kind, list index)
+        self.root_index = RootIndex(cell_size=0.05)
+        # Undo/redo history of compact, reversible edits
+        self.history = EditHistory(max_entries=1000)
+
+        self.filter_selection = "None"  # Default to no filtering
+        self.all_pass_filter_library = {name: dict(section) for name, section in ALL_PASS_LIBRARY.items()}
+        self.selected_all_pass_filters = []
+        self.all_pass_enabled = False
+
+        # Immutable snapshot of the design, replaced on every update;
+        # ba/sos/responses derived from it are memoized per version
+        self.filter_state = FilterState(design_cache=self.design_cache)
+
+        # Response of the combined zeros/poles (times the library design's gain)
+        # on a fixed grid, updated per root.
+        # Full rebuilds of large designs fill the back engine on the pipeline;
+        # until it is swapped in, the front one keeps the last response
+        self.response_buffers = DoubleBuffer(RootResponse(worN=worN), RootResponse(worN=worN))
+        self.response_pending = False
+
+        # Called after every update (e.g. to redraw the plots)
+        self.update_listeners = []
+        # Called when the effective filter design changed (e.g. to re-filter a signal)
+        self.filter_change_listeners = []
+
+    @property
+    def response_engine(self):
+        return self.response_buffers.front
+
+    def update(self, rebuild_response=True):
+        """
+        Take a new filter state after a change and notify the listeners.
+
+        Callers that already applied their edit to ``response_engine`` pass
+        ``rebuild_response=False`` to skip recomputing it from every root.
+        """
+        previous_state = self.filter_state
+        self.filter_state = self.filter_state.replace(
+            zeros=self.zeros,
+            poles=self.poles,
+            library=self.filter_selection,
+            all_pass=[(filter['zeros'], filter['poles']) for filter in self.selected_all_pass_filters],
+            all_pass_enabled=self.all_pass_enabled,
+        )
+        with instrumentation.stage("frequency_response"):
+            if rebuild_response or self.response_pending:
+                self.rebuild_response()
+
+        for listener in self.update_listeners:
+            listener()
+        if self.filter_state is not previous_state:
+            for listener in self.filter_change_listeners:
+                listener()
+
+    def rebuild_response(self):
+        """Recompute the response from every combined root (on the pipeline for large designs)."""
+        zeros, poles = self.filter_state.combined_zeros, self.filter_state.combined_poles
+        gain = self.response_gain()
+        if self.pipeline is None or len(zeros) + len(poles) <= ASYNC_RESPONSE_ROOTS:
+            if self.pipeline is not None:
+                self.pipeline.cancel("response")
+            self.response_pending = False
+            self.response_engine.reset(zeros, poles, gain)
+            return
+
+        # Edits made before the result arrives resubmit, so the newest roots always win
+        self.response_pending = True
+        self.pipeline.submit("response", rebuild_response_job, self.response_buffers.back, zeros, poles, gain)
+
+    def response_gain(self):
+        """Gain of the applied filter (the library design's; 1 for hand-placed roots)."""
+        return self.filter_state.zpk()[2]
+
+    def collect_response(self):
+        """Swap in a finished response rebuild; returns True when the response changed."""
+        if not self.response_pending:
+            return False
+        if self.pipeline.take("response") is not None:
+            self.response_buffers.swap()
+        elif self.pipeline.pending("response"):
+            return False
+        else:
+            # The job failed (and printed why): rebuild inline instead
+            self.response_engine.reset(self.filter_state.combined_zeros, self.filter_state.combined_poles,
+                                       self.response_gain())
+        self.response_pending = False
+        return True
+
+    def update_response(self, method, *args):
+        """Apply an incremental change (e.g. ``add_zero``) to the response engine."""
+        if self.response_pending:
+            return  # The front engine is stale; update() resubmits the full rebuild instead
+        getattr(self.response_engine, method)(*args)
+
+    def select_library(self, filter_name):
+        """Load the zeros and poles of a filter_library design (computed on the pipeline if not cached)."""
+        self.filter_selection = filter_name if filter_name in FILTER_LIBRARY_SPECS else "None"
+        if self.filter_selection == "None":
+            self.load_roots((), ())
+            return
+
+        # Zeros and poles come straight from the cached design (no np.roots)
+        spec = FILTER_LIBRARY_SPECS[self.filter_selection]
+        if self.pipeline is None:
+            zeros, poles, _ = self.design_cache.zpk(spec)
+            self.load_roots(zeros, poles)
+        else:
+            self.pipeline.submit("library_design", library_design_job, self.design_cache, spec)
+
+    def library_design_pending(self):
+        return self.pipeline is not None and self.pipeline.pending("library_design")
+
+    def collect_library_design(self):
+        """Load a finished library design; returns True once it was loaded."""
+        if self.pipeline is None:
+            return False  # Inline, select_library already loaded it
+        design = self.pipeline.take("library_design")
+        if design is None:
+            return False
+        zeros, poles, _ = design
+        self.load_roots(zeros, poles)
+        return True
+
+    def set_all_pass_enabled(self, enabled):
+        self.all_pass_enabled = bool(enabled)
+        self.update()
+
+    def select_all_pass(self, names):
+        """Select all-pass sections from the library by name and enable them."""
+        self.selected_all_pass_filters = [self.all_pass_filter_library[name] for name in names]
+        self.all_pass_enabled = True
+        self.update()
+
+    def add_custom_all_pass(self, zeros):
+        """Add an all-pass section with the given zeros as "Custom", select it alone and enable it."""
+        section = custom_all_pass(zeros)
+        self.all_pass_filter_library["Custom"] = section
+        self.selected_all_pass_filters = [section]
+        self.all_pass_enabled = True
+        self.update()
+
+    def selected_all_pass_sections(self):
+        """The selected all-pass filters as (name, zeros, poles), named after their library entry."""
+        names = {id(section): name for name, section in self.all_pass_filter_library.items()}
+        return [
+            (names.get(id(section), "Custom"), section['zeros'], section['poles'])
+            for section in self.selected_all_pass_filters
+        ]
+
+    def all_pass_roots_enabled(self):
+        """True when all-pass zeros/poles are part of the combined design."""
+        return self.all_pass_enabled and bool(self.selected_all_pass_filters)
+
+    def save(self, filepath):
+        """Save the design as a .dfp project, or only its zeros and poles when ``filepath`` is a .csv."""
+        if filepath.lower().endswith(".csv"):
+            write_roots_csv(filepath, self.zeros, self.poles)
+            return filepath
+        if not filepath.lower().endswith(PROJECT_EXTENSION):
+            filepath += PROJECT_EXTENSION
+        save_project(
+            filepath, self.zeros, self.poles, library=self.filter_selection,
+            all_pass=self.selected_all_pass_sections(), all_pass_enabled=self.all_pass_enabled,
+            filter_state=self.filter_state,
+        )
+        return filepath
+
+    def load(self, filepath):
+        """
+        Load a .dfp project or a zeros/poles CSV.
+
+        Returns the FilterProject (None for CSV files). Raises OSError or
+        ValueError when the file cannot be read.
+        """
+        if filepath.lower().endswith(".csv"):
+            zeros, poles = read_roots_csv(filepath)
+            self.load_roots(zeros, poles)
+            return None
+
+        project = load_project(filepath)
+        # Restore the all-pass selection before the roots, so the reload includes it
+        self.selected_all_pass_filters = []
+        for name, ap_zeros, ap_poles in project.all_pass:
+            section = {'zeros': [complex(z) for z in ap_zeros], 'poles': [complex(p) for p in ap_poles]}
+            self.all_pass_filter_library[name] = section
+            self.selected_all_pass_filters.append(section)
+        if project.library in FILTER_LIBRARY_SPECS or project.library == "None":
+            self.filter_selection = project.library
+        self.all_pass_enabled = bool(project.all_pass_enabled)
+
+        # Copy out of the memory map, so the file can be overwritten later
+        self.load_roots([complex(z) for z in project.zeros], [complex(p) for p in project.poles])
+        return project
+
+    def add_root(self, kind, position, conjugate=False):
+        """Add a zero or pole ("zero"/"pole") and optionally its conjugate."""
+        new_roots = [complex(position)]
+        if conjugate and new_roots[0].imag != 0:
+            new_roots.append(new_roots[0].conjugate())
+        self.perform(Edit("add", kind, len(self.roots_of(kind)), None, tuple(new_roots)))
+
+    def remove_closest(self, position):
+        """Remove the zero or pole closest to ``position``."""
+        hit = self.root_index.nearest(complex(position))
+        if hit is None:
+            return
+
+        (kind, index), _ = hit
+        closest = self.roots_of(kind)[index]
+        self.perform(Edit("remove", kind, index, (closest,), None))
+
+    def root_near(self, position, radius):
+        """Return ((kind, index), root) of the root within ``radius`` of ``position``, or None."""
+        hit = self.root_index.nearest(complex(position), max_distance=radius)
+        if hit is None:
+            return None
+        (kind, index), _ = hit
+        return (kind, index), self.roots_of(kind)[index]
+
+    def find_drag_target(self, position, radius, conjugate=False):
+        """Return (kind, indices) of the root near ``position`` and (optionally) its conjugate partner."""
+        hit = self.root_near(position, radius)
+        if hit is None:
+            return None
+
+        (kind, index), root = hit
+        indices = [index]
+        # Keep a conjugate pair together while dragging
+        if conjugate and root.imag != 0:
+            for partner_kind, partner in self.root_index.within(root.conjugate(), 1e-12):
+                if partner_kind == kind and partner != index:
+                    indices.append(partner)
+                    break
+        return kind, indices
+
+    def move_roots(self, kind, indices, position):
+        """Move the root(s) at ``indices`` to ``position`` (the second one to its conjugate), without recording an edit."""
+        position = complex(position)
+        new_roots = [position]
+        if len(indices) > 1:
+            new_roots.append(position.conjugate())
+        for index, new_root in zip(indices, new_roots):
+            self.set_root(kind, index, new_root)
+        self.update(rebuild_response=False)
+
+    def roots_in_radius(self, position, radius):
+        """Return the (kind, index) of every root within ``radius`` of ``position``."""
+        return self.root_index.within(complex(position), radius)
+
+    def roots_of(self, kind):
+        """Return the zeros or poles list for an edit kind."""
+        return self.zeros if kind == "zero" else self.poles
+
+    def perform(self, edit):
+        """Apply a new edit and record it for undo."""
+        self.apply_edit(edit)
+        self.history.record(edit)
+
+    def apply_edit(self, edit, reverse=False):
+        """Apply (or revert) an edit, updating the response only for the roots it touches."""
+        before, after = (edit.new, edit.old) if reverse else (edit.old, edit.new)
+
+        if edit.op == "add":
+            if reverse:
+                # Added roots sit at the end of the list
+                for _ in edit.new:
+                    self.pop_root(edit.kind, len(self.roots_of(edit.kind)) - 1)
+            else:
+                for root in edit.new:
+                    self.append_root(edit.kind, root)
+            self.update(rebuild_response=False)
+
+        elif edit.op == "remove":
+            if reverse:
+                self.insert_root(edit.kind, edit.index, edit.old[0])
+            else:
+                self.pop_root(edit.kind, edit.index)
+            self.update(rebuild_response=False)
+
+        elif edit.op == "move":
+            for index, new in zip(edit.index, after):
+                self.set_root(edit.kind, index, new)
+            self.update(rebuild_response=False)
+
+        elif edit.op == "swap":
+            self.zeros, self.poles = self.poles, self.zeros
+            self.rebuild_root_index()
+            if self.all_pass_roots_enabled():
+                # The all-pass roots are not swapped, so rebuild the response
+                self.update()
+            else:
+                self.update_response("swap")
+                self.update(rebuild_response=False)
+
+        elif edit.op in ("clear", "load"):
+            if edit.kind is None:
+                self.zeros, self.poles = list(after[0]), list(after[1])
+            elif edit.kind == "zero":
+                self.zeros = list(after)
+            else:
+                self.poles = list(after)
+            self.rebuild_root_index()
+            self.update()
+
+        else:
+            raise ValueError(f"Unknown edit operation: {edit.op}")
+
+    def append_root(self, kind, root):
+        """Append a root to the zeros/poles, the spatial index and the response."""
+        roots = self.roots_of(kind)
+        roots.append(root)
+        self.root_index.insert((kind, len(roots) - 1), root)
+        self.update_response("add_" + kind, root)
+
+    def pop_root(self, kind, index):
+        """Remove the root at ``index`` in O(1) by moving the last root into its slot."""
+        roots = self.roots_of(kind)
+        root = roots[index]
+        last = roots.pop()
+        self.root_index.remove((kind, len(roots)))
+        if index < len(roots):
+            roots[index] = last
+            self.root_index.insert((kind, index), last)
+        self.update_response("remove_" + kind, root)
+        return root
+
+    def insert_root(self, kind, index, root):
+        """Undo ``pop_root``: put ``root`` back at ``index`` and its stand-in at the end."""
+        roots = self.roots_of(kind)
+        if index < len(roots):
+            displaced = roots[index]
+            roots.append(displaced)
+            self.root_index.insert((kind, len(roots) - 1), displaced)
+            roots[index] = root
+        else:
+            roots.append(root)
+        self.root_index.insert((kind, index), root)
+        self.update_response("add_" + kind, root)
+
+    def set_root(self, kind, index, root):
+        """Move the root at ``index`` to a new position."""
+        roots = self.roots_of(kind)
+        old = roots[index]
+        roots[index] = root
+        self.root_index.move((kind, index), root)
+        self.update_response("move_" + kind, old, root)
+
+    def rebuild_root_index(self):
+        """Re-index every root after a bulk change (load, clear, swap)."""
+        self.root_index.clear()
+        for kind in ("zero", "pole"):
+            for index, root in enumerate(self.roots_of(kind)):
+                self.root_index.insert((kind, index), root)
+
+    def undo(self):
+        """Undo the last operation."""
+        edit = self.history.undo()
+        if edit is not None:
+            self.apply_edit(edit, reverse=True)
+
+    def redo(self):
+        """Redo the last undone operation."""
+        edit = self.history.redo()
+        if edit is not None:
+            self.apply_edit(edit)
+
+    def record_move(self, kind, indices, origin):
+        """Record a finished drag (from ``origin`` to the current positions) as one undoable edit."""
+        roots = self.roots_of(kind)
+        moved_to = tuple(roots[index] for index in indices)
+        if moved_to != tuple(origin):
+            self.history.record(Edit("move", kind, tuple(indices), tuple(origin), moved_to))
+
+    def clear_zeros(self):
+        """Clear all zeros."""
+        self.perform(Edit("clear", "zero", None, tuple(self.zeros), ()))
+
+    def clear_poles(self):
+        """Clear all poles."""
+        self.perform(Edit("clear", "pole", None, tuple(self.poles), ()))
+
+    def clear_all(self):
+        """Clear all zeros and poles."""
+        self.perform(Edit("clear", None, None, (tuple(self.zeros), tuple(self.poles)), ((), ())))
+
+    def load_roots(self, zeros, poles):
+        """Replace all zeros and poles (as one undoable edit)."""
+        # Supersedes a library design that is still being computed
+        if self.pipeline is not None:
+            self.pipeline.cancel("library_design")
+        self.perform(Edit("load", None, None, (tuple(self.zeros), tuple(self.poles)), (tuple(zeros), tuple(poles))))
+
+    def swap_zeros_poles(self):
+        """Swap zeros and poles."""
+        self.perform(Edit("swap"))
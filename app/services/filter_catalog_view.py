@@ -0,0 +1,68 @@
+import numpy as np
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+THUMBNAIL_SIZE = 96
+
+
+def catalog_thumbnail(entry, size=THUMBNAIL_SIZE):
+    """Draw a small preview of an entry: magnitude curve on top, pole-zero plot below."""
+    pixmap = QtGui.QPixmap(size, size)
+    pixmap.fill(QtGui.QColor("#1e1e1e"))
+    painter = QtGui.QPainter(pixmap)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    half = size // 2
+
+    # Magnitude (dB, clipped to -60 dB) in the top half
+    magnitude_db = 20 * np.log10(np.maximum(entry.magnitude, 1e-3))
+    peak = magnitude_db.max() if magnitude_db.size else 0.0
+    xs = np.linspace(2, size - 2, len(magnitude_db))
+    ys = 2 + (peak - magnitude_db) / 60.0 * (half - 4)
+    painter.setPen(QtGui.QPen(QtGui.QColor("#4fc3f7"), 1.5))
+    painter.drawPolyline(QtGui.QPolygonF([QtCore.QPointF(x, y) for x, y in zip(xs, ys)]))
+
+    # Unit circle with zeros (o) and poles (x) in the bottom half
+    radius = half / 2 - 4
+    center = QtCore.QPointF(size / 2, half + half / 2)
+    painter.setPen(QtGui.QPen(QtGui.QColor("#888888"), 1))
+    painter.drawEllipse(center, radius, radius)
+    scale = radius / max(1.0, np.max(np.abs(np.concatenate([entry.zeros, entry.poles])), initial=1.0))
+    painter.setPen(QtGui.QPen(QtGui.QColor("#66bb6a"), 1.5))
+    for z in entry.zeros:
+        painter.drawEllipse(center + QtCore.QPointF(z.real * scale, -z.imag * scale), 2.5, 2.5)
+    painter.setPen(QtGui.QPen(QtGui.QColor("#ef5350"), 1.5))
+    for p in entry.poles:
+        point = center + QtCore.QPointF(p.real * scale, -p.imag * scale)
+        painter.drawLine(point + QtCore.QPointF(-2.5, -2.5), point + QtCore.QPointF(2.5, 2.5))
+        painter.drawLine(point + QtCore.QPointF(-2.5, 2.5), point + QtCore.QPointF(2.5, -2.5))
+    painter.end()
+    return QtGui.QIcon(pixmap)
+
+
+class FilterCatalogDialog(QtWidgets.QDialog):
+    """Thumbnail grid of the precomputed catalog; emits the chosen entry."""
+    entry_selected = QtCore.pyqtSignal(object)
+
+    def __init__(self, entries, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Filter Catalog")
+        self.resize(720, 480)
+        self.entries = entries
+
+        self.list_widget = QtWidgets.QListWidget(self)
+        self.list_widget.setViewMode(QtWidgets.QListView.IconMode)
+        self.list_widget.setIconSize(QtCore.QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.list_widget.setResizeMode(QtWidgets.QListView.Adjust)
+        self.list_widget.setMovement(QtWidgets.QListView.Static)
+        self.list_widget.setSpacing(8)
+        for entry in entries:
+            item = QtWidgets.QListWidgetItem(catalog_thumbnail(entry), entry.name)
+            item.setToolTip(f"{entry.name} ({entry.source})")
+            self.list_widget.addItem(item)
+        self.list_widget.itemActivated.connect(self.on_item_activated)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.list_widget)
+
+    def on_item_activated(self, item):
+        self.entry_selected.emit(self.entries[self.list_widget.row(item)])
+        self.accept()
@@ -0,0 +1,23 @@
+from PyQt5.QtCore import QEvent, QObject, QTimer, pyqtSignal
+
+
+class FirstFrameWatcher(QObject):
+    """
+    Emits ``first_frame`` once, right after the watched window first paints.
+
+    Work that is not needed to show the window (e.g. building the filter
+    catalog) can wait for this signal instead of delaying startup.
+    """
+    first_frame = pyqtSignal()
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            self.window.removeEventFilter(self)
+            # Queued, so the paint itself completes first
+            QTimer.singleShot(0, self.first_frame.emit)
+        return False
@@ -0,0 +1,47 @@
+from PyQt5.QtCore import QObject, QTimer
+
+
+class FrameScheduler(QObject):
+    """
+    Coalesce redraw requests onto a display-rate timer.
+
+    Callers ``request`` a callback as often as they like (e.g. on every mouse
+    event); each requested callback runs at most once per frame. The timer
+    only runs while there is pending work, and ``max_fps`` caps how often
+    frames are produced so rendering does not starve the input/filter path.
+    """
+
+    def __init__(self, max_fps=60, parent=None):
+        super().__init__(parent)
+        self._pending = {}  # Insertion-ordered set of callbacks for the next frame
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_frame)
+        self.set_max_fps(max_fps)
+
+    def set_max_fps(self, max_fps):
+        """Cap the redraw rate (frames per second)."""
+        self.max_fps = max(1, max_fps)
+        self._timer.setInterval(max(1, round(1000 / self.max_fps)))
+
+    def request(self, callback):
+        """Schedule ``callback`` for the next frame (duplicates are merged)."""
+        self._pending[callback] = None
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self, callback):
+        """Remove a pending callback, if scheduled."""
+        self._pending.pop(callback, None)
+
+    def flush(self):
+        """Run all pending callbacks immediately."""
+        pending, self._pending = self._pending, {}
+        for callback in pending:
+            callback()
+
+    def _on_frame(self):
+        if not self._pending:
+            # Nothing changed since the last frame: go idle until the next request
+            self._timer.stop()
+            return
+        self.flush()
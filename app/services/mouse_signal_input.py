@@ -1,37 +1,55 @@
-import numpy as np
 from pyqtgraph import mkPen
-from scipy.signal import lfilter
-
-from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QWidget
 
+from app.core.live_filter import LiveFilter
+from app.services.frame_scheduler import FrameScheduler
+from app.utils.instrumentation import instrumentation
+from app.utils.segmented_store import SignalSession
 
-class MouseSignalInput(QWidget):
-    signal_generated = pyqtSignal(np.ndarray)  # Emitted when a new signal is generated
 
-    def __init__(self, original_plot_widget, filtered_plot_widget, zplane_controller,all_pass_add_radioButton,all_pass_remove_radioButton):
+class MouseSignalInput(QWidget):
+    def __init__(self, original_plot_widget, filtered_plot_widget, zplane_controller, frame_scheduler=None, pipeline=None):
         super().__init__()
         self.original_plot_widget = original_plot_widget
         self.filtered_plot_widget = filtered_plot_widget
         self.zplane_controller = zplane_controller
-        self.all_pass_add_radioButton = all_pass_add_radioButton
-        self.all_pass_remove_radioButton = all_pass_remove_radioButton
-        self.signal = []
-        self.max_length = 10000
+        self.frame_scheduler = frame_scheduler or FrameScheduler(parent=self)
+        self.pipeline = pipeline or self.zplane_controller.pipeline
+        # The captures and the streaming filter live in the Qt-free LiveFilter:
+        # complete original and filtered signals with min/max summaries (older
+        # segments spill to memory-mapped files), re-filtered on the pipeline
+        # whenever the design or the precision changes
+        self.live_filter = LiveFilter(pipeline=self.pipeline, session=SignalSession())
         self.start_x, self.start_y = None, None
-        self.current_filter = None
         self.window_length = 100
+        # Follow the newest samples until the user pans/zooms away from them
+        self.follow = True
+
+        # Persistent curves, updated in place once per frame by redraw()
+        self.original_curve = self.original_plot_widget.plot(pen=mkPen("red"))
+        self.filtered_curve = self.filtered_plot_widget.plot(pen=mkPen("green"))
+        # Both plots share the x axis; mouse pan/zoom acts on time only
+        self.filtered_plot_widget.setXLink(self.original_plot_widget)
+        for plot_widget in (self.original_plot_widget, self.filtered_plot_widget):
+            view_box = plot_widget.getViewBox()
+            view_box.setMouseEnabled(x=True, y=False)
+            view_box.setAutoVisible(y=True)
+            view_box.sigRangeChangedManually.connect(self.on_manual_range)
 
         self.setMouseTracking(True)
-        self.all_pass_add_radioButton.toggled.connect(self.apply_filter)
-        self.all_pass_remove_radioButton.toggled.connect(self.apply_filter)
-
-
-
-
+        # The Z-plane model notifies us whenever the design (zeros/poles,
+        # library selection or all-pass selection) changes
+        self.zplane_controller.model.filter_change_listeners.append(self.reset_filter)
 
+    @property
+    def signal(self):
+        return self.live_filter.signal
 
+    @property
+    def filtered_signal(self):
+        return self.live_filter.filtered_signal
 
+    @instrumentation.timed("mouse_capture")
     def mouseMoveEvent(self, event):
         """Capture mouse movement and generate signal."""
         if self.start_x is None:
@@ -40,90 +58,86 @@ class MouseSignalInput(QWidget):
         dx = event.x() - self.start_x
         dy = event.y() - self.start_y
 
-        # Generate the signal based on y-movement
+        # Generate the signal based on y-movement and filter only the new sample
         point = dy
-        self.signal.append(point)
-
-        # Keep the signal within the max length
-        if len(self.signal) > self.max_length:
-            self.signal.pop(0)
-
-        # Define a fixed x-axis window length
-
-        # Determine the x-axis range
+        self.live_filter.append(point)
+
+        # Repaint on the next frame; events arriving before then are merged
+        self.frame_scheduler.request(self.redraw)
+
+    def push_samples(self, block):
+        """Append a block of samples (e.g. from playback), filtering it in one call."""
+        self.live_filter.extend(block)
+        self.frame_scheduler.request(self.redraw)
+
+    def current_sos(self):
+        """Return the active design as a cascade of second-order sections."""
+        return self.zplane_controller.model.filter_state.sos()
+
+    def set_precision(self, precision):
+        """Switch the live filter to float64 or float32 and re-filter the history."""
+        self.live_filter.set_precision(precision)
+        self.collect_refilter()
+
+    def reset_filter(self):
+        """
+        Re-filter the history with the current design on the pipeline.
+
+        Until ``collect_refilter`` swaps the result in on a later frame, new
+        samples still go through the old filter.
+        """
+        self.live_filter.set_design(self.zplane_controller.model.filter_state)
+        self.collect_refilter()
+
+    def collect_refilter(self):
+        """Frame callback: redraw once the re-filtered history is swapped in."""
+        if self.live_filter.collect():
+            self.frame_scheduler.request(self.redraw)
+        elif self.live_filter.refilter_pending():
+            self.frame_scheduler.request(self.collect_refilter)
+
+    @instrumentation.timed("curve_render")
+    def redraw(self):
+        """Send only the visible window (decimated to the plot width) to the curves."""
+        x_min, x_max = self.visible_range()
+        if self.follow:
+            # The filtered plot is x-linked and follows along
+            self.original_plot_widget.setXRange(x_min, x_max, padding=0)
+
+        max_points = 2 * max(100, int(self.original_plot_widget.getViewBox().width()))
+        # One extra sample on each side so the curve reaches the plot edges
+        self.original_curve.setData(*self.signal.window(x_min - 1, x_max + 1, max_points))
+        self.filtered_curve.setData(*self.filtered_signal.window(x_min - 1, x_max + 1, max_points))
+
+    def visible_range(self):
+        """Return the x-axis range to draw: the newest samples, or the user's view."""
+        if not self.follow:
+            return self.original_plot_widget.getViewBox().viewRange()[0]
         if len(self.signal) > self.window_length:
-            x_min = len(self.signal) - self.window_length
-            x_max = len(self.signal)
-        else:
-            x_min = 0
-            x_max = self.window_length
-
-        # Update the x-axis range
-        self.original_plot_widget.setXRange(x_min, x_max, padding=0)
-
-        # Plot the original signal
-        self.original_plot_widget.plot(self.signal, clear=True, pen=mkPen("red"))
-
-        # Filter the signal and plot the result
-        self.apply_filter()
-
-        # Emit the signal as a numpy array
-        self.signal_generated.emit(np.array(self.signal))
-
-    def set_filter(self, filter_name):
-        """Set the current filter by name."""
-        if filter_name in self.zplane_controller.filter_library:
-            self.current_filter = self.zplane_controller.filter_library[filter_name]
-
-    def apply_filter(self):
-        """Apply the selected filter and plot the filtered signal."""
-        if not self.signal:
-            return
-        # Convert the signal to float type
-        float_signal = np.array(self.signal, dtype=np.float64)
-
-        # Check for current filter
-        if self.zplane_controller.filter_selection != "None":
-
-            b, a = self.zplane_controller.filter_library[self.zplane_controller.filter_selection]()
-            if self.all_pass_add_radioButton.isChecked():
-                # Start with the current filter's zeros and poles
-                combined_zeros = []
-                combined_poles = []
-                # Include selected all-pass filters
-                for filter in self.zplane_controller.selected_all_pass_filters:
-                    combined_zeros.extend(filter['zeros'])
-                    combined_poles.extend(filter['poles'])
-
-                b_ap = np.poly(combined_zeros)  # Numerator coefficients
-                a_ap = np.poly(combined_poles)  # Numerator coefficients
-                # Combine filters
-                b = np.convolve(b, b_ap)
-                a = np.convolve(a, a_ap)
-
-        else:
-            # Default to filter coefficients from ZPlaneController
-            b, a = self.zplane_controller.get_filter_coefficients()
-
-
-        filtered_signal = lfilter(b, a, float_signal)
-        filtered_signal = np.real(filtered_signal)  # Ensure the signal is real
-
-        if len(filtered_signal) > self.window_length:
-            x_min = len(filtered_signal) - self.window_length
-            x_max = len(filtered_signal)
-        else:
-            x_min = 0
-            x_max = self.window_length
-        self.filtered_plot_widget.setXRange(x_min, x_max, padding=0)
-
-        # Plot the filtered signal
-        self.filtered_plot_widget.plot(filtered_signal, clear=True, pen=mkPen("green"))
+            return len(self.signal) - self.window_length, len(self.signal)
+        return 0, self.window_length
+
+    def on_manual_range(self, *args):
+        """Pan/zoom by the user: stop following unless the view still reaches the newest sample."""
+        x_min, x_max = self.original_plot_widget.getViewBox().viewRange()[0]
+        self.follow = x_max >= len(self.signal) - 1
+        if self.follow:
+            # Keep following with the zoom level the user picked
+            self.window_length = max(10, int(x_max - x_min))
+        self.frame_scheduler.request(self.redraw)
 
     def reset(self):
         """Reset the signal and clear plots."""
-        self.signal = []
-        self.original_plot_widget.clear()
-        self.filtered_plot_widget.clear()
+        self.live_filter.reset()
+        if self.live_filter.refilter_pending():
+            self.frame_scheduler.request(self.collect_refilter)
+        self.frame_scheduler.cancel(self.redraw)
+        self.follow = True
+        self.original_curve.setData([])
+        self.filtered_curve.setData([])
         self.start_x = None
         self.start_y = None
+
+    def close_session(self):
+        """Delete the spilled capture files."""
+        self.live_filter.close()
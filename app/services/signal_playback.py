@@ -0,0 +1,92 @@
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from app.utils.filter_io import iter_chunks, open_signal
+
+# Speed slider range: samples per tick = 10 ** (value / SPEED_SCALE), i.e. 1 to 100000
+SPEED_SLIDER_RANGE = (0, 100)
+SPEED_SCALE = 20
+
+
+def samples_per_tick(slider_value):
+    """Map a speed slider position to a block size (logarithmic)."""
+    return max(1, int(round(10 ** (slider_value / SPEED_SCALE))))
+
+
+class SignalPlayback(QObject):
+    """
+    Plays a loaded signal through the live signal view in timer-driven blocks.
+
+    Each tick takes the next ``block_size`` samples and hands them to
+    ``MouseSignalInput.push_samples``, which filters the whole block with
+    the streaming filter and schedules a single redraw. NPY and WAV signals
+    stay memory-mapped, so their length is not limited by memory or by the
+    size of the on-screen history.
+    """
+    finished = pyqtSignal()
+    position_changed = pyqtSignal(int, int)  # (position, length)
+
+    def __init__(self, signal_input, tick_ms=16, parent=None):
+        super().__init__(parent)
+        self.signal_input = signal_input
+        self.samples = np.zeros(0)
+        self.sample_rate = None
+        self.position = 0
+        self.block_size = 1000
+        self.timer = QTimer(self)
+        self.timer.setInterval(tick_ms)
+        self.timer.timeout.connect(self.tick)
+
+    def load(self, filepath):
+        """Load a signal file (CSV, NPY or WAV); multi-channel files play their first channel."""
+        self.stop()
+        samples, self.sample_rate = open_signal(filepath)
+        if not isinstance(samples, np.ndarray):
+            # CSV cannot be memory-mapped: read it once, chunk by chunk
+            chunks = [np.atleast_2d(chunk)[0] for chunk in iter_chunks(samples, 1 << 16)]
+            samples = np.concatenate(chunks) if chunks else np.zeros(0)
+        self.samples = samples if samples.ndim == 1 else samples[0]
+        self.position = 0
+        self.signal_input.reset()
+        self.position_changed.emit(self.position, len(self.samples))
+        return len(self.samples)
+
+    def set_block_size(self, block_size):
+        self.block_size = max(1, int(block_size))
+
+    @property
+    def is_playing(self):
+        return self.timer.isActive()
+
+    def play(self):
+        if self.position >= len(self.samples):
+            if not len(self.samples):
+                return
+            # Restart from the beginning once the end was reached
+            self.position = 0
+            self.signal_input.reset()
+        self.timer.start()
+
+    def pause(self):
+        self.timer.stop()
+
+    def toggle(self):
+        if self.is_playing:
+            self.pause()
+        else:
+            self.play()
+
+    def stop(self):
+        self.timer.stop()
+        self.position = 0
+
+    def tick(self):
+        """Push the next block of samples (one redraw per tick)."""
+        block = np.asarray(self.samples[self.position:self.position + self.block_size], dtype=np.float64)
+        self.position += len(block)
+        if len(block):
+            self.signal_input.push_samples(block)
+        self.position_changed.emit(self.position, len(self.samples))
+        if self.position >= len(self.samples):
+            self.timer.stop()
+            self.finished.emit()
@@ -0,0 +1,40 @@
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from app.utils.instrumentation import instrumentation
+
+
+class TimingOverlay(QtWidgets.QLabel):
+    """Semi-transparent p50/p95/p99 table drawn over the main window."""
+
+    def __init__(self, parent, refresh_ms=500):
+        super().__init__(parent)
+        font = QtGui.QFont("Courier New")
+        font.setPointSize(8)
+        self.setFont(font)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 180); color: #7CFC00; padding: 6px;")
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.move(10, 45)
+        self.hide()
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.refresh_ms = refresh_ms
+        self.was_enabled = instrumentation.enabled
+
+    def toggle(self):
+        """Show/hide the overlay; timing is enabled while it is visible."""
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+            instrumentation.enabled = self.was_enabled
+            return
+        self.was_enabled = instrumentation.enabled
+        instrumentation.enabled = True
+        self.refresh()
+        self.show()
+        self.raise_()
+        self.timer.start(self.refresh_ms)
+
+    def refresh(self):
+        self.setText(instrumentation.format_summary())
+        self.adjustSize()
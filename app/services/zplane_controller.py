@@ -1,24 +1,24 @@
-import csv
 import os
-from tkinter import Tk
-from tkinter.filedialog import askopenfilename, asksaveasfilename
+from functools import partial
 
 import numpy as np
 from pyqtgraph import mkPen
-from pyqtgraph.examples.glow import update_plot
-from scipy.signal import butter, cheby1, cheby2, ellip, freqz
-import schemdraw
-import schemdraw.elements as elm
-import schemdraw.flow as flow  # Use the flow module for box elements
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtWidgets import QLabel, QVBoxLayout
 from PyQt5 import QtWidgets
 
+from app.core.zplane_model import ZPlaneModel
+from app.services.frame_scheduler import FrameScheduler
+from app.utils.c_export import generate_c_code
+from app.utils.compute_pipeline import ComputePipeline
+from app.utils.filter_design import FILTER_LIBRARY_SPECS, FilterDesignCache
+from app.utils.instrumentation import instrumentation
+from app.utils.realization_diagram import DiagramRenderer
+
 
 class ZPlaneController:
-    def __init__(self, plot_widget, mag_plot_widget, phase_plot_widget, realization_plot, add_conjugate_checkbox, zeros_radio_button, poles_radio_button,custom_aribatry_input,all_pass_remove_radioButton,all_pass_add_radioButton,select_all_pass_filters_button,create_button):
+    def __init__(self, plot_widget, mag_plot_widget, phase_plot_widget, realization_plot, add_conjugate_checkbox, zeros_radio_button, poles_radio_button,custom_aribatry_input,all_pass_remove_radioButton,all_pass_add_radioButton,select_all_pass_filters_button,create_button, frame_scheduler=None, pipeline=None):
         self.plot_widget = plot_widget
         self.add_conjugate_checkbox = add_conjugate_checkbox
         self.zeros_radio_button = zeros_radio_button
@@ -31,12 +31,25 @@ class ZPlaneController:
         self.all_pass_add_radioButton =all_pass_add_radioButton
         self.select_all_pass_filters_button =select_all_pass_filters_button
         self.create_button = create_button
+        self.frame_scheduler = frame_scheduler or FrameScheduler()
+        # Worker threads for full response rebuilds and library designs
+        self.pipeline = pipeline or ComputePipeline()
+
+        # The design itself (roots, library and all-pass selection, undo history
+        # and frequency response) lives in the Qt-free model; this class turns
+        # widget events into model calls and draws the model after each update
+        self.model = ZPlaneModel(
+            FilterDesignCache(cache_dir=os.environ.get("DIGITAL_FILTER_CACHE_DIR")), pipeline=self.pipeline,
+        )
+        self.model.update_listeners.append(self.update_plot)
 
-        # Data storage
-        self.zeros = []
-        self.poles = []
-        self.history = []
-        self.redo_stack = []
+        # Realization diagrams render on a worker thread, cached by coefficients;
+        # the timer picks the result up on the UI thread
+        self.diagram_renderer = DiagramRenderer()
+        self.diagram_future = None
+        self.diagram_timer = QTimer()
+        self.diagram_timer.setInterval(50)
+        self.diagram_timer.timeout.connect(self.check_diagram)
 
         # Plot configuration
         self.unit_circle = self.plot_widget.plot(pen=mkPen("blue", width=3))
@@ -51,53 +64,37 @@ class ZPlaneController:
         # Frequency response plots
         self.mag_response = self.mag_plot_widget.plot(pen=mkPen("green"))
         self.phase_response = self.phase_plot_widget.plot(pen=mkPen("red"))
+        self.response_x = self.model.response_engine.w / (np.pi / 2)  # Scale x-axis
 
         # Signal connections
         self.plot_widget.scene().sigMouseClicked.connect(self.on_mouse_click)
 
-        # Filter library
+        # Drag-to-move: intercept the view box drags that start on a root,
+        # everything else still pans/zooms as before
+        self.drag_hit_radius = 0.08
+        self.drag_target = None  # (kind, indices) of the roots being dragged
+        self.drag_position = None  # Latest drag position, applied once per frame
+        self.drag_origin = None  # Positions of the dragged roots when the drag started
+        self.view_box = self.plot_widget.getViewBox()
+        self.default_drag_handler = self.view_box.mouseDragEvent
+        self.view_box.mouseDragEvent = self.on_mouse_drag
+
+        # Hover feedback: highlight the root under the cursor once per frame
+        self.hover_position = None
+        self.hover_marker = self.plot_widget.plot(pen=None, symbol='o', symbolBrush=None, symbolPen=mkPen('orange', width=2), symbolSize=20)
+        self.plot_widget.scene().sigMouseMoved.connect(self.on_mouse_hover)
+
+        # Filter library: designs are memoized (ba, zpk and sos forms), so
+        # calling an entry does not re-run the scipy design routine
         self.filter_library = {
-            # None Option
-            "None": lambda: (np.array([1.0]), np.array([1.0])),  # No filtering applied
-
-            # Butterworth Filters
-            "Butterworth LPF": lambda: butter(4, 0.4, btype="low", output="ba"),
-            "Butterworth HPF": lambda: butter(4, 0.4, btype="high", output="ba"),
-            "Butterworth BPF": lambda: butter(4, [0.3, 0.6], btype="band", output="ba"),
-
-            # Chebyshev I Filter
-            "Chebyshev I LPF": lambda: cheby1(4, 1, 0.4, btype="low", output="ba"),
-            "Chebyshev I HPF": lambda: cheby1(4, 1, 0.4, btype="high", output="ba"),
-            "Chebyshev I BPF": lambda: cheby1(4, 1, [0.3, 0.6], btype="band", output="ba"),
-
-            # Chebyshev II Filters
-            "Chebyshev II LPF": lambda: cheby2(4, 20, 0.4, btype="low", output="ba"),
-            "Chebyshev II HPF": lambda: cheby2(4, 20, 0.4, btype="high", output="ba"),
-            "Chebyshev II BPF": lambda: cheby2(4, 20, [0.3, 0.6], btype="band", output="ba"),
-
-            # Elliptic Filters
-            "Elliptic LPF": lambda: ellip(4, 1, 20, 0.4, btype="low", output="ba"),
-            "Elliptic HPF": lambda: ellip(4, 1, 20, 0.4, btype="high", output="ba"),
-        }
-
-        # Initial filter selection set to None
-        self.filter_selection = "None"  # Default to no filtering
-
-        # All-pass filter library
-        self.all_pass_filter_library = {
-            "All-Pass 1": {'zeros': [-2], 'poles': [-0.5]},
-            "All-Pass 2": {'zeros': [1/0.8], 'poles': [0.8]},
-            "All-Pass 3": {'zeros': [-2-1j], 'poles': [1/(-2+1j)]},
-            "All-Pass 4": {'zeros': [2j], 'poles': [1 / (-2j)]},
+            name: partial(self.model.design_cache.ba, spec) for name, spec in FILTER_LIBRARY_SPECS.items()
         }
 
-        self.selected_all_pass_filters = []
-
         self.select_all_pass_filters_button.clicked.connect(self.openFilterPopup)
         self.create_button.clicked.connect(self.add_custom_all_pass_filter)
 
-        self.all_pass_add_radioButton.toggled.connect(self.update_plot)
-        self.all_pass_remove_radioButton.toggled.connect(self.update_plot)
+        # Both buttons toggle together, so one connection sees every change
+        self.all_pass_add_radioButton.toggled.connect(self.model.set_all_pass_enabled)
 
     def openFilterPopup(self):
         # Create a new dialog
@@ -109,7 +106,7 @@ class ZPlaneController:
         layout = QtWidgets.QVBoxLayout()
 
         # Sample filter options (you can replace these with your actual filters)
-        filters = self.all_pass_filter_library
+        filters = self.model.all_pass_filter_library
 
         # Create checkboxes for each filter
         self.filter_checkboxes = {}
@@ -127,11 +124,9 @@ class ZPlaneController:
         self.filter_dialog.exec_()
 
     def applyFilters(self):
-        self.selected_all_pass_filters = [self.all_pass_filter_library[filter_name] for filter_name, checkbox in self.filter_checkboxes.items() if
-                            checkbox.isChecked()]
-        print("Selected Filters:", self.selected_all_pass_filters)  # Process the selected filters as needed
-        self.all_pass_add_radioButton.click()
-        self.update_plot()
+        self.model.select_all_pass([filter_name for filter_name, checkbox in self.filter_checkboxes.items() if checkbox.isChecked()])
+        print("Selected Filters:", self.model.selected_all_pass_filters)  # Process the selected filters as needed
+        self.sync_all_pass_buttons()
         self.filter_dialog.close()
 
     def add_custom_all_pass_filter(self):
@@ -139,31 +134,30 @@ class ZPlaneController:
 
         # Filter out empty strings and convert to complex numbers
         zeros = [complex(float(z.strip())) for z in a if z.strip()]
-        conjugates = np.conjugate(zeros)
-        poles = 1/conjugates
 
-        self.selected_all_pass_filters=[{'zeros': zeros, 'poles': poles}]
-        self.all_pass_add_radioButton.click()
-        self.update_plot()
-        self.all_pass_filter_library["Custom"] ={'zeros': zeros, 'poles': poles}
+        self.model.add_custom_all_pass(zeros)
+        self.sync_all_pass_buttons()
         self.custom_aribatry_input.clear()
-        print("Selected Filters:", self.selected_all_pass_filters)
+        print("Selected Filters:", self.model.selected_all_pass_filters)
 
+    def sync_all_pass_buttons(self):
+        """Check the all-pass radio button matching the model, without feeding the change back."""
+        radio_button = self.all_pass_add_radioButton if self.model.all_pass_enabled else self.all_pass_remove_radioButton
+        self.all_pass_add_radioButton.blockSignals(True)
+        radio_button.setChecked(True)
+        self.all_pass_add_radioButton.blockSignals(False)
 
-    def update_z_plane_from_filter(self):
+    def select_library(self, filter_name):
         """Update Z-plane with zeros and poles of the selected filter."""
-        if self.filter_selection == "None":
-            self.zeros.clear()
-            self.poles.clear()
-        else:
-            # Get numerator (b) and denominator (a) coefficients
-            b, a = self.filter_library[self.filter_selection]()
-            # Compute zeros and poles
-            self.zeros = list(np.roots(b))  # Zeros of the filter
-            self.poles = list(np.roots(a))  # Poles of the filter
+        self.model.select_library(filter_name)
+        # A design that is not cached yet is computed on the pipeline
+        if self.model.library_design_pending():
+            self.frame_scheduler.request(self.collect_library_design)
 
-        self.save_state()
-        self.update_plot()
+    def collect_library_design(self):
+        """Frame callback: load the library design once the worker has it."""
+        if not self.model.collect_library_design() and self.model.library_design_pending():
+            self.frame_scheduler.request(self.collect_library_design)
 
     def update_unit_circle(self):
         """Draw the unit circle."""
@@ -172,23 +166,14 @@ class ZPlaneController:
 
     def update_frequency_response(self):
         """Update the magnitude and phase response plots."""
-        if not (self.zeros or self.poles):
+        if not (self.model.zeros or self.model.poles):
             self.mag_response.setData([], [])
             self.phase_response.setData([], [])
             return
 
-        if self.all_pass_add_radioButton.isChecked():
-            b = np.poly(self.combined_zeros)  # Numerator coefficients
-            a = np.poly(self.combined_poles)  # Numerator coefficients
-        else:
-            # Convert zeros and poles to a transfer function
-            b = np.poly(self.zeros)  # Numerator coefficients
-            a = np.poly(self.poles)  # Denominator coefficients
-        w, h = freqz(b, a, worN=500)  # Frequency response
-
-        # Update magnitude and phase response
-        self.mag_response.setData(w / (np.pi / 2), np.abs(h))  # Scale x-axis
-        self.phase_response.setData(w / (np.pi / 2), np.angle(h))
+        # The response engine already holds H(e^jw) for the combined roots
+        self.mag_response.setData(self.response_x, self.model.response_engine.magnitude())
+        self.phase_response.setData(self.response_x, self.model.response_engine.phase())
 
     def configure_x_axis(self, plot_widget):
         """Configure the x-axis to display ticks in multiples of π/2."""
@@ -198,20 +183,24 @@ class ZPlaneController:
         axis.setTicks(ticks)
 
     def update_plot(self):
-        """Update the Z-plane plot with zeros and poles."""
-        # Start with the current filter's zeros and poles
-        self.combined_zeros = self.zeros.copy()
-        self.combined_poles = self.poles.copy()
-        if self.all_pass_add_radioButton.isChecked():
-
-            # Include selected all-pass filters
-            for filter in self.selected_all_pass_filters:
-                self.combined_zeros.extend(filter['zeros'])
-                self.combined_poles.extend(filter['poles'])
-
-        self.scatter_zeros.setData([z.real for z in self.combined_zeros], [z.imag for z in self.combined_zeros])
-        self.scatter_poles.setData([p.real for p in self.combined_poles], [p.imag for p in self.combined_poles])
-        self.update_frequency_response()
+        """Model listener: draw the combined zeros/poles and the frequency response."""
+        combined_zeros = self.model.filter_state.combined_zeros
+        combined_poles = self.model.filter_state.combined_poles
+
+        with instrumentation.stage("zplane_redraw"):
+            self.scatter_zeros.setData([z.real for z in combined_zeros], [z.imag for z in combined_zeros])
+            self.scatter_poles.setData([p.real for p in combined_poles], [p.imag for p in combined_poles])
+            self.update_frequency_response()
+        if self.model.response_pending:
+            # The response is being rebuilt on the pipeline; redraw once it is swapped in
+            self.frame_scheduler.request(self.collect_response)
+
+    def collect_response(self):
+        """Frame callback: redraw the response once the worker has rebuilt it."""
+        if self.model.collect_response():
+            self.update_frequency_response()
+        elif self.model.response_pending:
+            self.frame_scheduler.request(self.collect_response)
 
     def on_mouse_click(self, event):
         """Handle mouse click to add zeros/poles."""
@@ -226,233 +215,174 @@ class ZPlaneController:
         if event.button() == Qt.LeftButton:
             self.add_zero_or_pole(x, y)
         elif event.button() == Qt.RightButton:
-            self.remove_closest_element(x, y)
+            self.model.remove_closest(complex(x, y))
 
-    def add_zero_or_pole(self, x, y):
-        """Add zero or pole and optionally its conjugate."""
-        is_zero = self.zeros_radio_button.isChecked()
-        is_pole = self.poles_radio_button.isChecked()
-        if not (is_zero or is_pole):
+    def on_mouse_drag(self, event, axis=None):
+        """Move the zero/pole under the cursor while dragging with the left button."""
+        if event.button() != Qt.LeftButton:
+            self.default_drag_handler(event, axis)
             return
 
-        target_list = self.zeros if is_zero else self.poles
-        target_list.append(complex(x, y))
+        if event.isStart():
+            start = self.view_box.mapSceneToView(event.buttonDownScenePos())
+            self.drag_target = self.model.find_drag_target(
+                complex(start.x(), start.y()), self.drag_hit_radius, conjugate=self.add_conjugate_checkbox.isChecked(),
+            )
+            if self.drag_target is not None:
+                kind, indices = self.drag_target
+                roots = self.model.roots_of(kind)
+                self.drag_origin = tuple(roots[index] for index in indices)
+
+        if self.drag_target is None:
+            self.default_drag_handler(event, axis)
+            return
 
-        # Add conjugate if checkbox is checked
-        if self.add_conjugate_checkbox.isChecked() and y != 0:
-            target_list.append(complex(x, -y))
+        event.accept()
+        position = self.view_box.mapSceneToView(event.scenePos())
+        self.drag_position = complex(position.x(), position.y())
+
+        if event.isFinish():
+            # Apply the final position now and record the whole drag as one edit
+            self.frame_scheduler.cancel(self.apply_drag)
+            self.apply_drag()
+            kind, indices = self.drag_target
+            self.drag_target = None
+            self.model.record_move(kind, indices, self.drag_origin)
+        else:
+            # Intermediate positions are coalesced: only the latest one per frame is applied
+            self.frame_scheduler.request(self.apply_drag)
 
-        self.save_state()
-        self.update_plot()
+    def apply_drag(self):
+        """Move the dragged root(s) to the latest drag position."""
+        if self.drag_target is None or self.drag_position is None:
+            return
+        kind, indices = self.drag_target
+        self.model.move_roots(kind, indices, self.drag_position)
 
-    def remove_closest_element(self, x, y):
-        """Remove the closest zero or pole."""
-        all_elements = self.zeros + self.poles
-        if not all_elements:
+    def on_mouse_hover(self, scene_position):
+        """Track the cursor over the Z-plane; the highlight is updated once per frame."""
+        if not self.plot_widget.sceneBoundingRect().contains(scene_position):
+            self.hover_position = None
+        else:
+            position = self.view_box.mapSceneToView(scene_position)
+            self.hover_position = complex(position.x(), position.y())
+        self.frame_scheduler.request(self.update_hover)
+
+    def update_hover(self):
+        """Highlight the root under the cursor, if any."""
+        hit = None
+        if self.hover_position is not None:
+            hit = self.model.root_near(self.hover_position, self.drag_hit_radius)
+        if hit is None:
+            self.hover_marker.setData([], [])
             return
+        _, root = hit
+        self.hover_marker.setData([root.real], [root.imag])
 
-        closest = min(all_elements, key=lambda z: abs(z - complex(x, y)))
-        if closest in self.zeros:
-            self.zeros.remove(closest)
-        elif closest in self.poles:
-            self.poles.remove(closest)
+    def add_zero_or_pole(self, x, y):
+        """Add zero or pole and optionally its conjugate."""
+        is_zero = self.zeros_radio_button.isChecked()
+        is_pole = self.poles_radio_button.isChecked()
+        if not (is_zero or is_pole):
+            return
 
-        self.save_state()
-        self.update_plot()
+        kind = "zero" if is_zero else "pole"
+        self.model.add_root(kind, complex(x, y), conjugate=self.add_conjugate_checkbox.isChecked())
 
     def get_filter_coefficients(self):
-        """Get filter coefficients from the current zeros and poles."""
-        if not (self.zeros or self.poles):
-            return [1], [1]  # Default: No filtering
-        if self.all_pass_add_radioButton.isChecked:
-            b = np.poly(self.combined_zeros)  # Numerator coefficients
-            a = np.poly(self.combined_poles)  # Denominator coefficients
-        else:
-            b = np.poly(self.zeros)  # Numerator coefficients
-            a = np.poly(self.poles)  # Denominator coefficients
-        return b, a
-
-    def save_state(self):
-        """Save the current state for undo/redo functionality."""
-        self.history.append((self.zeros[:], self.poles[:]))
-        self.redo_stack.clear()
-
-    def undo(self):
-        """Undo the last operation."""
-        if not self.history:
-            return
-        self.redo_stack.append((self.zeros[:], self.poles[:]))
-        self.zeros, self.poles = self.history.pop()
-        self.update_plot()
+        """Get filter coefficients of the current design (memoized on the filter state)."""
+        return self.model.filter_state.ba()
 
-    def redo(self):
-        """Redo the last undone operation."""
-        if not self.redo_stack:
-            return
-        self.history.append((self.zeros[:], self.poles[:]))
-        self.zeros, self.poles = self.redo_stack.pop()
-        self.update_plot()
-
-    def clear_zeros(self):
-        """Clear all zeros."""
-        self.zeros.clear()
-        self.save_state()
-        self.update_plot()
-
-    def clear_poles(self):
-        """Clear all poles."""
-        self.poles.clear()
-        self.save_state()
-        self.update_plot()
-
-    def clear_all(self):
-        """Clear all zeros and poles."""
-        self.zeros.clear()
-        self.poles.clear()
-        self.save_state()
-        self.update_plot()
+    def get_filter_sos(self):
+        """Get the current design as a cascade of second-order sections."""
+        return self.model.filter_state.sos()
 
     def save_to_file(self):
-        """Save zeros and poles to a CSV file with a user-specified name and directory."""
-        # Initialize Tkinter and hide the root window
-        root = Tk()
-        root.withdraw()
-
-        # Prompt user to choose a file location and name
-        filepath = asksaveasfilename(
-            title="Save Filter Data",
-            filetypes=[("CSV Files", "*.csv")],
-            defaultextension=".csv"
+        """Save the design as a .dfp project, or its zeros and poles as CSV."""
+        filepath, _ = QtWidgets.QFileDialog.getSaveFileName(
+            None, "Save Filter Data", "", "Filter Project (*.dfp);;CSV Files (*.csv)"
         )
 
         # Exit if the user cancels the dialog
         if not filepath:
             return
 
-        # Save zeros and poles to the selected file
-        with open(filepath, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Type", "Real", "Imaginary"])
-            for z in self.zeros:
-                writer.writerow(["Zero", z.real, z.imag])
-            for p in self.poles:
-                writer.writerow(["Pole", p.real, p.imag])
-
+        filepath = self.model.save(filepath)
         print(f"Filter data successfully saved to {filepath}")
 
+    def export_filter_to_c(self):
+        """Export the current design as C code (direct form II transposed and cascade)."""
+        filepath, _ = QtWidgets.QFileDialog.getSaveFileName(
+            None, "Export Filter as C Code", "", "C Source Files (*.c)"
+        )
+        if not filepath:
+            return
+        if not filepath.lower().endswith(".c"):
+            filepath += ".c"
+
+        try:
+            code = generate_c_code(self.get_filter_sos())
+        except ValueError as e:
+            print(f"Error exporting filter: {e}")
+            return
+        with open(filepath, 'w') as file:
+            file.write(code)
+        print(f"Filter C code successfully exported to {filepath}")
+
     def load_from_file(self):
-        """Load zeros and poles from a user-selected CSV file."""
-        # Initialize Tkinter and hide the root window
-        root = Tk()
-        root.withdraw()
-
-        # Prompt user to choose a file to load
-        filepath = askopenfilename(
-            title="Load Filter Data",
-            filetypes=[("CSV Files", "*.csv")]
+        """
+        Load a .dfp project or a zeros/poles CSV chosen by the user.
+
+        Returns the loaded FilterProject (None for CSV files or on failure) so
+        the caller can sync the library selection widgets.
+        """
+        filepath, _ = QtWidgets.QFileDialog.getOpenFileName(
+            None, "Load Filter Data", "", "Filter Files (*.dfp *.csv);;Filter Project (*.dfp);;CSV Files (*.csv)"
         )
 
         # Exit if the user cancels the dialog
         if not filepath:
-            return
+            return None
+        return self.load_file(filepath)
 
+    def load_file(self, filepath):
+        """Load a .dfp project or zeros/poles CSV; returns the FilterProject as load_from_file does."""
         # Check if the file exists
         if not os.path.exists(filepath):
             print(f"Error: File {filepath} does not exist.")
-            return
-
-        # Load zeros and poles from the selected file
-        with open(filepath, 'r') as file:
-            reader = csv.reader(file)
-            next(reader)  # Skip header
-            self.zeros.clear()
-            self.poles.clear()
-            for row in reader:
-                if row[0] == "Zero":
-                    self.zeros.append(complex(float(row[1]), float(row[2])))
-                elif row[0] == "Pole":
-                    self.poles.append(complex(float(row[1]), float(row[2])))
-
-        # Update application state and visuals
-        self.save_state()
-        self.update_plot()
-        print(f"Filter data successfully loaded from {filepath}")
+            return None
 
-    def swap_zeros_poles(self):
-        """Swap zeros and poles."""
-        self.zeros, self.poles = self.poles, self.zeros
-        self.save_state()
-        self.update_plot()
+        try:
+            project = self.model.load(filepath)
+        except (OSError, ValueError) as e:
+            print(f"Error loading {filepath}: {e}")
+            return None
 
-    def draw_direct_form_ii_diagram(self):
-        """Draw Direct Form II realization using SchemDraw."""
+        self.sync_all_pass_buttons()
+        print(f"Filter data successfully loaded from {filepath}")
+        return project
 
-        # Get filter coefficients
+    def display_circuit_in_groupbox(self):
+        """Show the Direct Form II diagram of the current design (rendered in the background)."""
         b_coeffs, a_coeffs = self.get_filter_coefficients()
+        self.diagram_future = self.diagram_renderer.request(b_coeffs, a_coeffs)
+        if self.diagram_future.done():
+            self.check_diagram()  # Cached: no render needed
+        else:
+            self.diagram_timer.start()
 
-        # Normalize coefficients if a[0] != 1
-        if a_coeffs[0] != 1:
-            b_coeffs = b_coeffs / a_coeffs[0]
-            a_coeffs = a_coeffs / a_coeffs[0]
-        # Start drawing the circuit
-        with schemdraw.Drawing() as d:
-            d.config(unit=2)  # Set unit scale for spacing
-
-            # Input signal
-            d.add(elm.SourceV().label("x[n]", loc='left'))  # x_in
-
-            # First Summation Node (Input to Feedforward and Feedback Paths)
-            sum_node1 = d.add(elm.Dot(open=True).label("Σ", loc='center'))
-
-            # Feedforward Path (b-coefficients)
-            current = sum_node1
-            for i, b in enumerate(b_coeffs):
-                # d.add(elm.Rect(w=2, h=1).label(f"b{i}={b:.2f}", loc='center')) #coeff_block
-                # d.add(elm.Line().down().length(1.5))
-
-                d.add(elm.Line(w=1, h=1).label(f"b{i}={b:.2f}", loc='center'))
-                if i == 0:
-                    d.add(elm.Dot(open=True).label("y[n]", loc='center')) #output
-
-            # Feedback Path (a-coefficients)
-            current = sum_node1
-            delay_blocks = []
-
-            for i, a in enumerate(a_coeffs[1:], start=1):  # Skip a[0] (assumed 1)
-                d.add(elm.Line().down().length(1.5))
-                delay = d.add(elm.Rect(w=2, h=1).label("Z⁻¹", loc='center'))
-                delay_blocks.append(delay)
-                d.add(elm.Line().left().length(1.5))
-                # d.add(elm.Rect(w=2, h=1).label(f"a{i}={a:.2f}", loc='center'))
-                d.add(elm.Line(w=2, h=1).label(f"a{i}={a:.2f}", loc='center'))
-
-            # Shared Delay Line (Z⁻¹ blocks)
-            shared_delay_start = sum_node1
-            for _ in range(max(len(a_coeffs), len(b_coeffs)) - 1):
-                d.add(elm.Line().down().length(2))
-                d.add(elm.Rect(w=2, h=1).label("Z⁻¹", loc='center'))
-                d.add(elm.Line().down().length(2).at(shared_delay_start.end))
-
-            # Save the diagram
-            file_path = "static/images/direct_form_ii_diagram.png"
-            d.save(file_path)
-
-        return file_path
-
-    def display_circuit_in_groupbox(self):
-        """Display the generated circuit diagram in a PyQt GroupBox."""
-        # Generate the diagram
-        diagram_path = self.draw_direct_form_ii_diagram()
-
-        # Load the diagram into a QLabel
-        pixmap = QPixmap(diagram_path)
-
-        # Create a QLabel to hold the image
-        diagram_label = QLabel()
-        diagram_label.setPixmap(pixmap)
-        diagram_label.setScaledContents(True)  # Scale the image to fit
-
-        # Add the QLabel to the filter_realization_groupBox
-        layout = QVBoxLayout(self.realization_plot)  # Assuming QVBoxLayout
-        layout.addWidget(diagram_label)
-        self.realization_plot.setLayout(layout)
+    def check_diagram(self):
+        """Put the finished diagram into the existing label (the newest request wins)."""
+        if self.diagram_future is None or not self.diagram_future.done():
+            return
+        self.diagram_timer.stop()
+        future, self.diagram_future = self.diagram_future, None
+        try:
+            png = future.result()
+        except Exception as e:
+            print(f"Error drawing the realization diagram: {e}")
+            return
+        pixmap = QPixmap()
+        pixmap.loadFromData(png, "PNG")
+        self.realization_plot.setPixmap(pixmap)
+        self.realization_plot.setScaledContents(True)  # Scale the image to fit
@@ -134,6 +134,36 @@ class Ui_MainWindow(object):
         self.filters_library_combobox.setStyleSheet(COMBOBOX_STYLESHEET)
         self.filters_library_combobox.setObjectName("filters_library_combobox")
 
+        # Catalog Button
+        self.catalog_button = QtWidgets.QPushButton(self.header_widget)
+        self.catalog_button.setGeometry(QtCore.QRect(745, 2, 125, 37))
+        self.catalog_button.setMaximumSize(QtCore.QSize(240, 40))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        self.catalog_button.setFont(font)
+        self.catalog_button.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.catalog_button.setStyleSheet(BUTTON_STYLESHEET)
+        self.catalog_button.setObjectName("catalog_button")
+
+        # Precision of the live filter, and its quantization report
+        self.precision_combobox = QtWidgets.QComboBox(self.header_widget)
+        self.precision_combobox.setGeometry(QtCore.QRect(885, 8, 90, 27))
+        self.precision_combobox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.precision_combobox.setStyleSheet(COMBOBOX_STYLESHEET)
+        self.precision_combobox.setObjectName("precision_combobox")
+
+        self.quantization_button = QtWidgets.QPushButton(self.header_widget)
+        self.quantization_button.setGeometry(QtCore.QRect(990, 2, 125, 37))
+        self.quantization_button.setMaximumSize(QtCore.QSize(240, 40))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        self.quantization_button.setFont(font)
+        self.quantization_button.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.quantization_button.setStyleSheet(BUTTON_STYLESHEET)
+        self.quantization_button.setObjectName("quantization_button")
+
         # Quit Button
         self.quit_button = QtWidgets.QPushButton(self.header_widget)
         self.quit_button.setGeometry(QtCore.QRect(1134, 2, 125, 37))
@@ -183,6 +213,33 @@ class Ui_MainWindow(object):
         self.padding_area.setMinimumSize(200, 200)
         self.mouse_controller_layout.addWidget(self.padding_area)
 
+        # Playback controls: load a signal file and play it at the slider speed
+        self.playback_layout = QtWidgets.QHBoxLayout()
+        self.load_signal_button = QtWidgets.QPushButton(self.sidebar_widget)
+        self.load_signal_button.setMinimumSize(QtCore.QSize(80, 30))
+        self.load_signal_button.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.load_signal_button.setStyleSheet(BUTTON_STYLESHEET + "border-radius:10px;")
+        self.load_signal_button.setObjectName("load_signal_button")
+        self.playback_layout.addWidget(self.load_signal_button)
+
+        self.play_button = QtWidgets.QPushButton(self.sidebar_widget)
+        self.play_button.setMinimumSize(QtCore.QSize(60, 30))
+        self.play_button.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.play_button.setStyleSheet(BUTTON_STYLESHEET + "border-radius:10px;")
+        self.play_button.setObjectName("play_button")
+        self.playback_layout.addWidget(self.play_button)
+
+        self.speed_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal, self.sidebar_widget)
+        self.speed_slider.setObjectName("speed_slider")
+        self.playback_layout.addWidget(self.speed_slider)
+
+        self.speed_label = QtWidgets.QLabel(self.sidebar_widget)
+        self.speed_label.setMinimumSize(QtCore.QSize(90, 20))
+        self.speed_label.setStyleSheet("color: rgb(255, 255, 255);")
+        self.speed_label.setObjectName("speed_label")
+        self.playback_layout.addWidget(self.speed_label)
+        self.mouse_controller_layout.addLayout(self.playback_layout)
+
         self.sidebar_layout.addLayout(self.mouse_controller_layout)
 
         # Original signal groupbox
@@ -490,24 +547,24 @@ class Ui_MainWindow(object):
         self.filter_realizaion_structure.setObjectName("filter_realizaion_structure")
         self.filter_realizaion_structure.setText("Structure")
 
-        # self.filter_realization_code = QtWidgets.QPushButton(self.filter_realization_groupBox)
-        # self.filter_realization_code.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-        # self.filter_realization_code.setGeometry(QtCore.QRect(100, 5, 84, 25))
-        # self.filter_realization_code.setFont(font)
-        # self.filter_realization_code.setStyleSheet("""
-        #     QPushButton {
-        #         color: rgb(0, 0, 0);
-        #         background-color: rgba(255, 255, 255, 0);
-        #         border: 2px solid #809099;
-        #         padding: 1px;
-        #         border-radius: 7px;
-        #     }
-        #     QPushButton:hover {
-        #         background-color: rgba(255, 255, 255, 70);
-        #     }
-        # """)
-        # self.filter_realization_code.setObjectName("filter_realization_code")
-        # self.filter_realization_code.setText("Code")
+        self.filter_realization_code = QtWidgets.QPushButton(self.filter_realization_groupBox)
+        self.filter_realization_code.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.filter_realization_code.setGeometry(QtCore.QRect(100, 5, 84, 25))
+        self.filter_realization_code.setFont(font)
+        self.filter_realization_code.setStyleSheet("""
+            QPushButton {
+                color: rgb(0, 0, 0);
+                background-color: rgba(255, 255, 255, 0);
+                border: 2px solid #809099;
+                padding: 1px;
+                border-radius: 7px;
+            }
+            QPushButton:hover {
+                background-color: rgba(255, 255, 255, 70);
+            }
+        """)
+        self.filter_realization_code.setObjectName("filter_realization_code")
+        self.filter_realization_code.setText("Code")
 
         # Label for Diagram
         self.filter_realization_diagram_label = QtWidgets.QLabel(self.filter_realization_groupBox)
@@ -547,10 +604,14 @@ class Ui_MainWindow(object):
         self.app_title.setText(_translate("MainWindow", "Digital Filter"))
         self.load_filter_button.setText(_translate("MainWindow", "Load Filter"))
         self.save_filter_button.setText(_translate("MainWindow", "Save Filter"))
+        self.catalog_button.setText(_translate("MainWindow", "Catalog"))
+        self.quantization_button.setText(_translate("MainWindow", "Quantization"))
         self.quit_button.setText(_translate("MainWindow", "Quit App"))
 
         # Sidebar
         self.label.setText(_translate("MainWindow", "Move your mouse here to generate signal"))
+        self.load_signal_button.setText(_translate("MainWindow", "Load Signal"))
+        self.play_button.setText(_translate("MainWindow", "Play"))
         self.original_signal_groupbox.setTitle(_translate("MainWindow", "Original Signal"))
         self.filtered_signal_groupbox.setTitle(_translate("MainWindow", "Filtered Signal"))
 
@@ -577,7 +638,7 @@ class Ui_MainWindow(object):
         self.redo_button.setText(_translate("MainWindow", "Redo"))
         self.z_plane_plot_groupbox.setTitle(_translate("MainWindow", "Z Plane"))
         self.filter_realizaion_structure.setText(_translate("MainWindow", "Structure"))
-        # self.filter_realization_code.setText(_translate("MainWindow", "Code"))
+        self.filter_realization_code.setText(_translate("MainWindow", "Code"))
 
 
 
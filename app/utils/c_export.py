@@ -0,0 +1,336 @@
+"""
+C code generation for the current filter design, plus an optional native
+streaming engine compiled with the system C compiler and loaded via ctypes.
+
+``generate_c_code`` emits a self-contained C file with the design in both
+direct-form II transposed (one transfer function) and cascade (second-order
+sections, each DF2T) structures, for use in other applications.
+
+``NativeStreamingFilter`` is a drop-in replacement for ``StreamingFilter``
+backed by a small compiled cascade kernel. It is used for the live signal
+when ``DIGITAL_FILTER_NATIVE=1`` is set.
+"""
+import ctypes
+import hashlib
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+
+import numpy as np
+
+from app.utils.streaming_filter import StreamingFilter
+
+C_COMPILER_FLAGS = ["-O2", "-shared", "-fPIC"]
+
+
+class NativeBuildError(RuntimeError):
+    """The C compiler is missing or failed to build a kernel."""
+
+
+def _real_coefficients(values, what):
+    values = np.asarray(values)
+    if np.iscomplexobj(values):
+        if np.max(np.abs(values.imag), initial=0.0) > 1e-9 * max(1.0, np.max(np.abs(values))):
+            raise ValueError(f"The {what} are complex (unpaired complex roots); C export needs a real design")
+        values = values.real
+    return np.asarray(values, dtype=np.float64)
+
+
+def _c_array(values):
+    return ", ".join(repr(float(value)) for value in np.asarray(values, dtype=np.float64).ravel())
+
+
+def generate_c_code(sos, name="digital_filter"):
+    """
+    Return C source implementing ``sos`` as DF2T and as a cascade of biquads.
+
+    The generated API (``<name>`` prefix):
+
+        <name>_df2t_state / <name>_cascade_state     filter state structs
+        <name>_df2t_reset(state), <name>_cascade_reset(state)
+        <name>_df2t_process(state, x, y, n), <name>_cascade_process(state, x, y, n)
+        <name>_df2t_state_size(), <name>_cascade_state_size()
+    """
+    from scipy.signal import sos2tf
+
+    sos = _real_coefficients(np.atleast_2d(sos), "section coefficients")
+    b, a = sos2tf(sos)
+    b = _real_coefficients(b, "numerator coefficients")
+    a = _real_coefficients(a, "denominator coefficients")
+    b, a = b / a[0], a / a[0]
+    order = max(len(a), len(b)) - 1
+    b = np.pad(b, (0, order + 1 - len(b)))
+    a = np.pad(a, (0, order + 1 - len(a)))
+    sections = len(sos)
+    upper = name.upper()
+
+    return f"""/*
+ * {name}: generated by the Digital Filter application.
+ *
+ * Order {order}, {sections} second-order section(s).
+ * Direct-form II transposed:  y[n] = b0 x[n] + w1
+ *                             w_k  = b_k x[n] - a_k y[n] + w_(k+1)
+ * The cascade form runs one DF2T biquad per section and stays numerically
+ * stable for high orders; prefer it when the order is above ~8.
+ */
+#include <stddef.h>
+
+#define {upper}_ORDER {order}
+#define {upper}_SECTIONS {sections}
+
+static const double {name}_b[{order + 1}] = {{ {_c_array(b)} }};
+static const double {name}_a[{order + 1}] = {{ {_c_array(a)} }};
+
+/* Each row: b0, b1, b2, a0, a1, a2 (a0 == 1) */
+static const double {name}_sos[{sections}][6] = {{
+{",".join(chr(10) + "    { " + _c_array(row / row[3]) + " }" for row in sos)}
+}};
+
+typedef struct {{ double w[{max(order, 1)}]; }} {name}_df2t_state;
+typedef struct {{ double w[{sections}][2]; }} {name}_cascade_state;
+
+size_t {name}_df2t_state_size(void) {{ return sizeof({name}_df2t_state); }}
+size_t {name}_cascade_state_size(void) {{ return sizeof({name}_cascade_state); }}
+
+void {name}_df2t_reset({name}_df2t_state *state)
+{{
+    for (int k = 0; k < {max(order, 1)}; k++) state->w[k] = 0.0;
+}}
+
+void {name}_df2t_process({name}_df2t_state *state, const double *x, double *y, size_t n)
+{{
+    double *w = state->w;
+    for (size_t i = 0; i < n; i++) {{
+        double in = x[i];
+        double out = {name}_b[0] * in{" + w[0]" if order else ""};
+        for (int k = 0; k < {order} - 1; k++)
+            w[k] = {name}_b[k + 1] * in - {name}_a[k + 1] * out + w[k + 1];
+        {f"w[{order - 1}] = {name}_b[{order}] * in - {name}_a[{order}] * out;" if order else ""}
+        y[i] = out;
+    }}
+}}
+
+void {name}_cascade_reset({name}_cascade_state *state)
+{{
+    for (int s = 0; s < {sections}; s++) state->w[s][0] = state->w[s][1] = 0.0;
+}}
+
+void {name}_cascade_process({name}_cascade_state *state, const double *x, double *y, size_t n)
+{{
+    for (size_t i = 0; i < n; i++) {{
+        double v = x[i];
+        for (int s = 0; s < {sections}; s++) {{
+            const double *c = {name}_sos[s];
+            double *w = state->w[s];
+            double out = c[0] * v + w[0];
+            w[0] = c[1] * v - c[4] * out + w[1];
+            w[1] = c[2] * v - c[5] * out;
+            v = out;
+        }}
+        y[i] = v;
+    }}
+}}
+"""
+
+
+# Runtime kernel used by NativeStreamingFilter: coefficients are arguments,
+# so design changes (e.g. dragging a pole) never need a recompile
+KERNEL_SOURCE = """
+#include <stddef.h>
+
+void sos_process(const double *sos, int sections, double *state,
+                 const double *x, double *y, size_t n)
+{
+    for (size_t i = 0; i < n; i++) {
+        double v = x[i];
+        for (int s = 0; s < sections; s++) {
+            const double *c = sos + 6 * s;
+            double *w = state + 2 * s;
+            double out = c[0] * v + w[0];
+            w[0] = c[1] * v - c[4] * out + w[1];
+            w[1] = c[2] * v - c[5] * out;
+            v = out;
+        }
+        y[i] = v;
+    }
+}
+
+double sos_process_sample(const double *sos, int sections, double *state, double x)
+{
+    double y;
+    sos_process(sos, sections, state, &x, &y, 1);
+    return y;
+}
+"""
+
+
+def build_dir():
+    """Per-user directory for compiled kernels (the temp dir is shared with other users)."""
+    cache_root = os.environ.get("DIGITAL_FILTER_CACHE_DIR")
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(cache_root or tempfile.gettempdir(), f"digital_filter_native_{user}")
+
+
+def check_private(path):
+    """
+    Refuse ``path`` unless this user owns it and nobody else can write it.
+
+    Libraries in the build directory are loaded into the process, so one
+    planted by another local user would run with our rights.
+    """
+    if not hasattr(os, "getuid"):
+        return
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise NativeBuildError(f"{path} is not private to this user; remove it or set DIGITAL_FILTER_CACHE_DIR")
+
+
+def compile_shared_library(source, compiler=None):
+    """Compile C ``source`` into a shared library (cached by source hash) and return its path."""
+    compiler = compiler or os.environ.get("CC") or shutil.which("cc") or shutil.which("gcc")
+    if not compiler:
+        raise NativeBuildError("No C compiler found (set CC or install cc/gcc)")
+    directory = build_dir()
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    check_private(directory)
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+    library_path = os.path.join(directory, f"filter_{digest}.so")
+    if os.path.lexists(library_path):
+        check_private(library_path)
+        return library_path
+
+    source_path = os.path.join(directory, f"filter_{digest}.c")
+    with open(source_path, "w") as file:
+        file.write(source)
+    temp_path = library_path + f".{os.getpid()}.tmp"
+    try:
+        result = subprocess.run([compiler, *C_COMPILER_FLAGS, "-o", temp_path, source_path],
+                                capture_output=True, text=True)
+    except OSError as e:
+        raise NativeBuildError(f"Could not run {compiler}: {e}") from e
+    if result.returncode != 0:
+        raise NativeBuildError(f"{compiler} failed:\n{result.stderr}")
+    os.replace(temp_path, library_path)
+    return library_path
+
+
+_DOUBLE_POINTER = ctypes.POINTER(ctypes.c_double)
+_kernel = None
+
+
+def load_kernel():
+    """Compile (once) and load the runtime cascade kernel."""
+    global _kernel
+    if _kernel is None:
+        library = ctypes.CDLL(compile_shared_library(KERNEL_SOURCE))
+        library.sos_process.argtypes = [_DOUBLE_POINTER, ctypes.c_int, _DOUBLE_POINTER,
+                                        _DOUBLE_POINTER, _DOUBLE_POINTER, ctypes.c_size_t]
+        library.sos_process.restype = None
+        library.sos_process_sample.argtypes = [_DOUBLE_POINTER, ctypes.c_int, _DOUBLE_POINTER, ctypes.c_double]
+        library.sos_process_sample.restype = ctypes.c_double
+        _kernel = library
+    return _kernel
+
+
+def load_generated(code, name="digital_filter", structure="cascade"):
+    """
+    Compile code from ``generate_c_code`` and return ``process(x) -> y`` for one structure.
+
+    The returned function keeps its own state between calls (used by the
+    verification harness to check the exported code itself).
+    """
+    library = ctypes.CDLL(compile_shared_library(code))
+    process = getattr(library, f"{name}_{structure}_process")
+    process.argtypes = [ctypes.c_void_p, _DOUBLE_POINTER, _DOUBLE_POINTER, ctypes.c_size_t]
+    process.restype = None
+    state_size = getattr(library, f"{name}_{structure}_state_size")
+    state_size.restype = ctypes.c_size_t
+    state = np.zeros(state_size() // 8)
+
+    def run(x):
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        y = np.empty_like(x)
+        process(state.ctypes.data, x.ctypes.data_as(_DOUBLE_POINTER), y.ctypes.data_as(_DOUBLE_POINTER), len(x))
+        return y
+    return run
+
+
+class NativeStreamingFilter:
+    """
+    ``StreamingFilter`` interface (1-D signals, sos designs) running in compiled C.
+
+    Single samples cost one ctypes call instead of a scipy dispatch, which is
+    what the mouse loop does per event. Designs with complex coefficients
+    (unpaired complex roots) fall back to the scipy ``StreamingFilter``.
+    """
+
+    def __init__(self, sos=None):
+        self.kernel = load_kernel()
+        self.channels = None
+        self._fallback = None
+        self.set_sos(np.array([[1.0, 0.0, 0.0, 1.0, 0.0, 0.0]]) if sos is None else sos)
+
+    @classmethod
+    def from_sos(cls, sos, channels=None):
+        if channels is not None:
+            raise ValueError("NativeStreamingFilter only filters 1-D signals")
+        return cls(sos)
+
+    def set_sos(self, sos):
+        sos = np.atleast_2d(sos)
+        try:
+            sos = _real_coefficients(sos, "section coefficients")
+        except ValueError:
+            self._fallback = StreamingFilter.from_sos(sos)
+            self.sos = self._fallback.sos
+            return
+        self._fallback = None
+        self.sos = np.ascontiguousarray(sos / sos[:, 3:4])
+        self._sos_pointer = self.sos.ctypes.data_as(_DOUBLE_POINTER)
+        self.reset()
+
+    @property
+    def order(self):
+        return 2 * len(self.sos)
+
+    @property
+    def coefficient_dtype(self):
+        return self.sos.dtype
+
+    def reset(self):
+        if self._fallback is not None:
+            self._fallback.reset()
+            return
+        self.zi = np.zeros((len(self.sos), 2))
+        self._zi_pointer = self.zi.ctypes.data_as(_DOUBLE_POINTER)
+
+    def process(self, block):
+        if self._fallback is not None:
+            return self._fallback.process(block)
+        block = np.ascontiguousarray(np.atleast_1d(block), dtype=np.float64)
+        output = np.empty_like(block)
+        self.kernel.sos_process(self._sos_pointer, len(self.sos), self._zi_pointer,
+                                block.ctypes.data_as(_DOUBLE_POINTER), output.ctypes.data_as(_DOUBLE_POINTER),
+                                len(block))
+        return output
+
+    def process_sample(self, sample):
+        if self._fallback is not None:
+            return self._fallback.process_sample(sample)
+        return self.kernel.sos_process_sample(self._sos_pointer, len(self.sos), self._zi_pointer, float(sample))
+
+    def filter(self, signal):
+        self.reset()
+        return self.process(signal)
+
+
+def make_streaming_filter(sos):
+    """The live streaming engine: native when DIGITAL_FILTER_NATIVE=1 and a compiler works, else scipy."""
+    if os.environ.get("DIGITAL_FILTER_NATIVE") == "1":
+        try:
+            return NativeStreamingFilter(sos)
+        except (NativeBuildError, OSError) as e:
+            print(f"Native filter unavailable, using scipy: {e}")
+    return StreamingFilter.from_sos(sos)
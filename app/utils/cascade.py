@@ -0,0 +1,78 @@
+import numpy as np
+
+# A pass-through section: H(z) = 1
+IDENTITY_SECTION = np.array([[1.0, 0.0, 0.0, 1.0, 0.0, 0.0]])
+
+
+def roots_to_sos(zeros, poles, gain=1.0):
+    """
+    Pair zeros and poles into second-order sections.
+
+    The result has the same transfer function as
+    ``lfilter(gain * np.poly(zeros), np.poly(poles), x)`` but avoids expanding
+    the polynomials, which loses precision quickly past order ~10. Roots
+    without a conjugate partner (e.g. a single zero placed off the real axis)
+    give complex-valued sections.
+    """
+    zeros = np.atleast_1d(np.asarray(zeros, dtype=complex))
+    poles = np.atleast_1d(np.asarray(poles, dtype=complex))
+    if len(zeros) == 0 and len(poles) == 0:
+        return IDENTITY_SECTION * np.array([gain, gain, gain, 1, 1, 1])
+    from scipy.signal import zpk2sos  # Slow to import; not needed for an empty design
+    try:
+        return zpk2sos(zeros, poles, gain)
+    except ValueError:
+        # Unpaired complex roots: fall back to complex-coefficient sections
+        return _complex_sos(zeros, poles, gain)
+
+
+def _complex_sos(zeros, poles, gain):
+    """Pair roots into (possibly complex) sections, nearest zeros to each pole."""
+    # Pad with roots at the origin so both sides have the same even count
+    count = max(len(zeros), len(poles))
+    count += count % 2
+    zeros = np.concatenate([zeros, np.zeros(count - len(zeros), dtype=complex)])
+    poles = np.concatenate([poles, np.zeros(count - len(poles), dtype=complex)])
+
+    # Poles closest to the unit circle go last in the cascade, as in zpk2sos
+    poles = poles[np.argsort(np.abs(1 - np.abs(poles)))[::-1]]
+    remaining_zeros = list(zeros)
+
+    sections = np.zeros((count // 2, 6), dtype=complex)
+    for i in range(count // 2):
+        p1, p2 = poles[2 * i], poles[2 * i + 1]
+        pair = []
+        for pole in (p1, p2):
+            nearest = int(np.argmin(np.abs(np.array(remaining_zeros) - pole)))
+            pair.append(remaining_zeros.pop(nearest))
+        z1, z2 = pair
+        sections[i] = [1, -(z1 + z2), z1 * z2, 1, -(p1 + p2), p1 * p2]
+
+    # Roots at the origin contribute a factor of 1 in the z^-1 form, so the
+    # padding leaves the transfer function unchanged
+    sections[0, :3] *= gain
+    return sections
+
+
+def cascade_sos(*sections):
+    """Chain several sos arrays into one cascade."""
+    sections = [np.atleast_2d(s) for s in sections if s is not None and len(s)]
+    if not sections:
+        return IDENTITY_SECTION.copy()
+    return np.vstack(sections)
+
+
+def sos_response(sos, worN=500):
+    """
+    Frequency response of a cascade, evaluated section by section.
+
+    Returns ``(w, h)`` on the same grid as ``freqz(b, a, worN)``.
+    """
+    sos = np.atleast_2d(sos)
+    w = np.linspace(0, np.pi, worN, endpoint=False)
+    e1 = np.exp(-1j * w)
+    e2 = e1 * e1
+    numerator = sos[:, 0, None] + sos[:, 1, None] * e1 + sos[:, 2, None] * e2
+    denominator = sos[:, 3, None] + sos[:, 4, None] * e1 + sos[:, 5, None] * e2
+    h = np.prod(numerator / denominator, axis=0)
+    return w, h
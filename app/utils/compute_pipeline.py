@@ -0,0 +1,128 @@
+"""
+Background computation for the GUI: worker threads that only ever run the
+newest request per job, and front/back buffers for handing results over.
+
+The UI thread submits immutable snapshots (tuples of roots, lists of signal
+chunks) together with the back buffer the job may write to. It keeps
+drawing from the front buffer meanwhile, and swaps the two when it picks the
+finished result up on a later frame, so a slow job never blocks input or
+repainting and the UI never sees a half-written result.
+"""
+import threading
+from collections import OrderedDict
+
+
+class DoubleBuffer:
+    """
+    Front and back instances of a result (e.g. two response engines).
+
+    Only the UI thread uses ``front``; a pipeline job fills ``back``, and the
+    UI calls ``swap`` once it has taken the job's result. Both instances are
+    reused, so nothing is reallocated per job.
+    """
+
+    def __init__(self, front, back):
+        self.front = front
+        self.back = back
+
+    def swap(self):
+        self.front, self.back = self.back, self.front
+
+
+class ComputePipeline:
+    """
+    Runs jobs on worker threads, keeping only the newest request per key.
+
+    ``submit(key, func, *args)`` replaces a request for ``key`` that has not
+    started yet and marks a running one as stale. Jobs are called as
+    ``func(*args, is_stale)`` so long loops can stop early once superseded.
+    A key never runs on two workers at once, so a job may reuse its key's
+    back buffer. The result of the newest request waits until the UI
+    ``take``s it; results of superseded requests are dropped.
+    """
+
+    def __init__(self, workers=2):
+        self._condition = threading.Condition()
+        self._requests = OrderedDict()  # key -> (generation, func, args), not started yet
+        self._generations = {}  # key -> newest submitted generation
+        self._running = set()
+        self._results = {}  # key -> result of the newest generation
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"compute-{index}", daemon=True)
+            for index in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, key, func, *args):
+        """Queue ``func(*args, is_stale)`` as the newest request for ``key``; returns its generation."""
+        with self._condition:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            self._requests.pop(key, None)
+            self._requests[key] = (generation, func, args)
+            self._results.pop(key, None)
+            self._condition.notify()
+        return generation
+
+    def cancel(self, key):
+        """Drop the queued request and any unclaimed result for ``key``; a running job becomes stale."""
+        with self._condition:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._requests.pop(key, None)
+            self._results.pop(key, None)
+
+    def is_current(self, key, generation):
+        return self._generations.get(key) == generation
+
+    def pending(self, key):
+        """True while a request for ``key`` is queued, running or waiting to be taken."""
+        with self._condition:
+            return key in self._requests or key in self._running or key in self._results
+
+    def take(self, key, default=None):
+        """Return (once) the finished result of the newest request for ``key``."""
+        with self._condition:
+            return self._results.pop(key, default)
+
+    def close(self):
+        """Stop the workers; queued requests are dropped and running jobs become stale."""
+        with self._condition:
+            self._closed = True
+            self._requests.clear()
+            for key in self._generations:
+                self._generations[key] += 1
+            self._condition.notify_all()
+
+    def _next_request(self):
+        """Wait for a request whose key is not already running (None once closed)."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                for key in self._requests:
+                    if key not in self._running:
+                        generation, func, args = self._requests.pop(key)
+                        self._running.add(key)
+                        return key, generation, func, args
+                self._condition.wait()
+
+    def _work(self):
+        while True:
+            request = self._next_request()
+            if request is None:
+                return
+            key, generation, func, args = request
+            try:
+                result = func(*args, lambda: not self.is_current(key, generation))
+                failed = False
+            except Exception as e:
+                print(f"Error in background job '{key}': {e}")
+                failed = True
+            with self._condition:
+                self._running.discard(key)
+                if not failed and self.is_current(key, generation):
+                    self._results[key] = result
+                # A newer request for this key may have been waiting for this one to finish
+                self._condition.notify_all()
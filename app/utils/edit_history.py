@@ -0,0 +1,93 @@
+from collections import deque, namedtuple
+
+# One reversible edit of the zero/pole sets.
+#   op:    "add", "remove", "move", "swap", "clear" or "load"
+#   kind:  "zero", "pole" or None (for edits touching both sets)
+#   index: position in the zeros/poles list ("move": one position per root)
+#   old:   roots before the edit, new: roots after the edit (tuples; a
+#          (zeros, poles) pair of tuples when kind is None)
+# "add"/"remove"/"move"/"swap" only store the roots they touch. "clear" and
+# "load" replace whole sets, so they carry a snapshot of what they replaced.
+Edit = namedtuple("Edit", ["op", "kind", "index", "old", "new"], defaults=(None, None, None, None))
+
+# Rough per-root and per-entry costs used for the memory cap
+_ROOT_BYTES = 16
+_ENTRY_BYTES = 120
+
+
+def edit_size(edit):
+    """Estimate the memory held by an edit, in bytes."""
+    roots = 0
+    for value in (edit.old, edit.new):
+        if value is None:
+            continue
+        if edit.op in ("clear", "load") and edit.kind is None:
+            roots += sum(len(part) for part in value)  # (zeros, poles) pair
+        else:
+            roots += len(value)
+    return _ENTRY_BYTES + roots * _ROOT_BYTES
+
+
+class EditHistory:
+    """
+    Bounded undo/redo stacks of reversible edits.
+
+    Each entry stores only the delta of one operation, so undo/redo costs
+    O(size of the edit) rather than O(total roots). The oldest entries are
+    dropped once either ``max_entries`` or ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = []
+        self.bytes_used = 0
+
+    def __len__(self):
+        return len(self._undo)
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def record(self, edit):
+        """Record a new edit; this discards anything that could be redone."""
+        for undone in self._redo:
+            self.bytes_used -= edit_size(undone)
+        self._redo.clear()
+        self._push_undo(edit)
+        self._trim()
+
+    def undo(self):
+        """Pop the latest edit (to be reverted by the caller), or None."""
+        if not self._undo:
+            return None
+        edit = self._undo.pop()
+        self._redo.append(edit)
+        return edit
+
+    def redo(self):
+        """Pop the latest undone edit (to be re-applied by the caller), or None."""
+        if not self._redo:
+            return None
+        edit = self._redo.pop()
+        self._undo.append(edit)
+        return edit
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.bytes_used = 0
+
+    def _push_undo(self, edit):
+        self._undo.append(edit)
+        self.bytes_used += edit_size(edit)
+
+    def _trim(self):
+        while self._undo and (len(self._undo) > self.max_entries or self.bytes_used > self.max_bytes):
+            self.bytes_used -= edit_size(self._undo.popleft())
@@ -0,0 +1,198 @@
+import glob
+import hashlib
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.utils.cascade import roots_to_sos, sos_response
+from app.utils.filter_design import FILTER_LIBRARY_SPECS, FilterDesignCache
+from app.utils.filter_io import read_roots_csv
+from app.utils.filter_project import BUNDLE_EXTENSION, PROJECT_EXTENSION, ProjectBundle, load_project
+
+# Bump when the computed fields change so stale cache files are ignored
+CATALOG_CACHE_VERSION = 1
+
+# One browsable design with its precomputed responses.
+#   source: "library" (payload = library name), "csv" or "project" (payload =
+#   file path) or "bundle" (payload = (bundle path, index))
+CatalogEntry = namedtuple(
+    "CatalogEntry",
+    ["name", "source", "payload", "design_hash", "w", "magnitude", "phase", "group_delay", "zeros", "poles"],
+)
+
+
+def design_hash(zeros, poles, gain=1.0, worN=256):
+    """Stable hash of a design (its roots, gain and grid size)."""
+    digest = hashlib.sha1(f"v{CATALOG_CACHE_VERSION}:{worN}:{complex(gain)!r}".encode("utf-8"))
+    digest.update(np.asarray(zeros, dtype=np.complex128).tobytes())
+    digest.update(b"|")
+    digest.update(np.asarray(poles, dtype=np.complex128).tobytes())
+    return digest.hexdigest()
+
+
+def group_delay(zeros, poles, w):
+    """Group delay of the design, summed analytically over its roots."""
+    unit = np.exp(-1j * w)
+
+    def root_delay(roots):
+        roots = np.asarray(roots, dtype=complex)[:, None]
+        if not roots.size:
+            return np.zeros(len(w))
+        product = roots * unit
+        # Undefined where a root sits exactly on the unit circle at w
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ((np.abs(roots) ** 2 - product.real) / np.abs(1 - product) ** 2).sum(axis=0)
+
+    return root_delay(zeros) - root_delay(poles)
+
+
+def compute_responses(zeros, poles, gain=1.0, worN=256):
+    """Return (w, magnitude, phase, group_delay) for a zeros/poles design."""
+    w, h = sos_response(roots_to_sos(zeros, poles, gain), worN=worN)
+    return w, np.abs(h), np.angle(h), group_delay(zeros, poles, w)
+
+
+def _compute_job(job):
+    """Process-pool worker: (key, zeros, poles, gain, worN) -> (key, responses)."""
+    key, zeros, poles, gain, worN = job
+    return key, compute_responses(zeros, poles, gain, worN)
+
+
+def project_source(name, path, project):
+    """
+    Catalog source of a loaded .dfp project.
+
+    Projects store the response of the filter they apply (library gain and
+    enabled all-pass sections included), so it is used as is instead of
+    being recomputed from the base roots.
+    """
+    zeros, poles = np.asarray(project.zeros), np.asarray(project.poles)
+    if project.all_pass_enabled:
+        zeros = np.concatenate([zeros, *(ap_zeros for _, ap_zeros, _ in project.all_pass)])
+        poles = np.concatenate([poles, *(ap_poles for _, _, ap_poles in project.all_pass)])
+    # Monic z^-1 sections: the overall gain is the ratio of the leading coefficients
+    gain = complex(np.prod(project.sos[:, 0]) / np.prod(project.sos[:, 3]))
+    w, h = np.array(project.w), np.array(project.h)
+    responses = (w, np.abs(h), np.angle(h), group_delay(zeros, poles, w))
+    return name, "project", path, zeros, poles, gain, responses
+
+
+def catalog_sources(directory=None, design_cache=None):
+    """
+    List every catalog design as (name, source, payload, zeros, poles, gain, responses).
+
+    Includes all filter_library entries plus every zeros/poles CSV, .dfp
+    project and .dfpb bundle found in ``directory``. ``responses`` is None
+    except for projects, which carry their own. Files that cannot be parsed
+    are skipped.
+    """
+    design_cache = design_cache or FilterDesignCache()
+    sources = []
+    for name, spec in FILTER_LIBRARY_SPECS.items():
+        zeros, poles, gain = design_cache.zpk(spec)
+        sources.append((name, "library", name, zeros, poles, gain, None))
+
+    if directory and os.path.isdir(directory):
+        for path in sorted(glob.glob(os.path.join(directory, "*.csv"))):
+            try:
+                zeros, poles = read_roots_csv(path)
+            except (OSError, ValueError, IndexError, StopIteration):
+                continue
+            name = os.path.splitext(os.path.basename(path))[0]
+            sources.append((name, "csv", path, zeros, poles, 1.0, None))
+
+        for path in sorted(glob.glob(os.path.join(directory, "*" + PROJECT_EXTENSION))):
+            try:
+                project = load_project(path, mmap=False)
+            except (OSError, ValueError):
+                continue
+            name = os.path.splitext(os.path.basename(path))[0]
+            sources.append(project_source(name, path, project))
+
+        for path in sorted(glob.glob(os.path.join(directory, "*" + BUNDLE_EXTENSION))):
+            try:
+                bundle = ProjectBundle(path)
+            except (OSError, ValueError, KeyError):
+                continue
+            for index, (name, zeros, poles) in enumerate(bundle):
+                sources.append((name, "bundle", (path, index), zeros, poles, 1.0, None))
+    return sources
+
+
+class FilterCatalog:
+    """
+    Precomputed magnitude, phase, group delay and pole-zero data for browsing.
+
+    ``build`` hashes every design, loads the ones already computed from
+    ``cache_dir`` and computes the rest in a process pool, writing them back
+    to the cache. Rebuilding an unchanged catalog only reads the cache.
+    """
+
+    def __init__(self, cache_dir=None, worN=256):
+        self.cache_dir = cache_dir
+        self.worN = worN
+        self.entries = []
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def build(self, directory=None, workers=None):
+        """Compute (or load) every catalog entry; returns the list of entries."""
+        sources = catalog_sources(directory)
+        keys = []
+        responses = {}
+        jobs = []
+        for _, _, _, zeros, poles, gain, stored in sources:
+            if stored is not None:
+                # Projects come with the response of their applied filter
+                key = design_hash(zeros, poles, gain, len(stored[0]))
+                responses[key] = stored
+            else:
+                key = design_hash(zeros, poles, gain, self.worN)
+                if key not in responses:
+                    responses[key] = self._load(key)
+                    if responses[key] is None:
+                        jobs.append((key, np.asarray(zeros), np.asarray(poles), gain, self.worN))
+            keys.append(key)
+
+        if len(jobs) > 1 and workers != 1:
+            # Spawn rather than fork: the GUI builds the catalog while other threads
+            # run, and a forked child could inherit a lock one of them held
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results = list(executor.map(_compute_job, jobs, chunksize=8))
+        else:
+            results = [_compute_job(job) for job in jobs]
+        for key, computed in results:
+            responses[key] = computed
+            self._save(key, computed)
+
+        self.entries = [
+            CatalogEntry(name, source, payload, key, *responses[key], np.asarray(zeros), np.asarray(poles))
+            for key, (name, source, payload, zeros, poles, _, _) in zip(keys, sources)
+        ]
+        return self.entries
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".npz")
+
+    def _load(self, key):
+        if not self.cache_dir or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                return data["w"], data["magnitude"], data["phase"], data["group_delay"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key, responses):
+        if not self.cache_dir:
+            return
+        w, magnitude, phase, delay = responses
+        temp_path = self._path(key) + ".tmp.npz"
+        try:
+            np.savez(temp_path, w=w, magnitude=magnitude, phase=phase, group_delay=delay)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            print(f"Error writing catalog cache {self._path(key)}: {e}")
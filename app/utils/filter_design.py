@@ -0,0 +1,183 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+# Parameters that fully determine a library design. ``cutoff`` is a float or a
+# (low, high) tuple; ``ripple``/``attenuation`` are in dB and only used by the
+# families that need them.
+FilterSpec = namedtuple(
+    "FilterSpec",
+    ["family", "order", "cutoff", "btype", "ripple", "attenuation"],
+    defaults=(None, None),
+)
+
+# A designed filter in every form the app needs
+FilterDesign = namedtuple("FilterDesign", ["b", "a", "zeros", "poles", "gain", "sos"])
+
+FILTER_LIBRARY_SPECS = {
+    # None Option
+    "None": FilterSpec("none", 0, None, None),  # No filtering applied
+
+    # Butterworth Filters
+    "Butterworth LPF": FilterSpec("butter", 4, 0.4, "low"),
+    "Butterworth HPF": FilterSpec("butter", 4, 0.4, "high"),
+    "Butterworth BPF": FilterSpec("butter", 4, (0.3, 0.6), "band"),
+
+    # Chebyshev I Filter
+    "Chebyshev I LPF": FilterSpec("cheby1", 4, 0.4, "low", ripple=1),
+    "Chebyshev I HPF": FilterSpec("cheby1", 4, 0.4, "high", ripple=1),
+    "Chebyshev I BPF": FilterSpec("cheby1", 4, (0.3, 0.6), "band", ripple=1),
+
+    # Chebyshev II Filters
+    "Chebyshev II LPF": FilterSpec("cheby2", 4, 0.4, "low", attenuation=20),
+    "Chebyshev II HPF": FilterSpec("cheby2", 4, 0.4, "high", attenuation=20),
+    "Chebyshev II BPF": FilterSpec("cheby2", 4, (0.3, 0.6), "band", attenuation=20),
+
+    # Elliptic Filters
+    "Elliptic LPF": FilterSpec("ellip", 4, 0.4, "low", ripple=1, attenuation=20),
+    "Elliptic HPF": FilterSpec("ellip", 4, 0.4, "high", ripple=1, attenuation=20),
+}
+
+# Bump when the on-disk layout changes so stale cache files are ignored
+DISK_CACHE_VERSION = 1
+
+
+def design_zpk(spec):
+    """Run the scipy design routine for ``spec`` and return (zeros, poles, gain)."""
+    family = spec.family
+    cutoff = list(spec.cutoff) if isinstance(spec.cutoff, tuple) else spec.cutoff
+    if family == "none":
+        return np.array([]), np.array([]), 1.0
+    # scipy.signal takes about a second to import: load it on the first real design
+    from scipy import signal
+    if family == "butter":
+        return signal.butter(spec.order, cutoff, btype=spec.btype, output="zpk")
+    if family == "bessel":
+        return signal.bessel(spec.order, cutoff, btype=spec.btype, output="zpk")
+    if family == "cheby1":
+        return signal.cheby1(spec.order, spec.ripple, cutoff, btype=spec.btype, output="zpk")
+    if family == "cheby2":
+        return signal.cheby2(spec.order, spec.attenuation, cutoff, btype=spec.btype, output="zpk")
+    if family == "ellip":
+        return signal.ellip(spec.order, spec.ripple, spec.attenuation, cutoff, btype=spec.btype, output="zpk")
+    raise ValueError(f"Unknown filter family: {family}")
+
+
+def design_filter(spec):
+    """Design ``spec`` and return it in ba, zpk and sos form."""
+    zeros, poles, gain = design_zpk(spec)
+    if len(zeros) or len(poles):
+        from scipy.signal import zpk2sos, zpk2tf
+        b, a = zpk2tf(zeros, poles, gain)
+        sos = zpk2sos(zeros, poles, gain)
+    else:
+        b, a = np.array([float(gain)]), np.array([1.0])
+        sos = np.array([[gain, 0.0, 0.0, 1.0, 0.0, 0.0]])
+    return _freeze(FilterDesign(b, a, np.asarray(zeros), np.asarray(poles), float(gain), sos))
+
+
+def spec_key(spec):
+    """Stable hash of a spec, used as the on-disk file name."""
+    text = f"v{DISK_CACHE_VERSION}:{tuple(spec)!r}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _freeze(design):
+    """Make the cached arrays read-only so callers cannot corrupt the cache."""
+    for value in design:
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return design
+
+
+class FilterDesignCache:
+    """
+    Memoized filter designs keyed by their FilterSpec.
+
+    Designs are kept in an in-memory LRU of ``maxsize`` entries. When
+    ``cache_dir`` is given, every design is also written there as an .npz file
+    so it survives restarts; a memory miss checks the disk before redesigning.
+    Lookups are locked, so the GUI and background jobs can share one cache.
+    """
+
+    def __init__(self, maxsize=256, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._designs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._designs)
+
+    def get(self, spec):
+        """Return the FilterDesign for ``spec``, designing it only on a miss."""
+        with self._lock:
+            design = self._designs.get(spec)
+            if design is not None:
+                self._designs.move_to_end(spec)
+                self.hits += 1
+                return design
+
+            self.misses += 1
+            design = self._load_from_disk(spec)
+            if design is None:
+                design = design_filter(spec)
+                self._save_to_disk(spec, design)
+
+            self._designs[spec] = design
+            if len(self._designs) > self.maxsize:
+                self._designs.popitem(last=False)  # Evict the least recently used
+            return design
+
+    def ba(self, spec):
+        """Return the (b, a) coefficients for ``spec``."""
+        design = self.get(spec)
+        return design.b, design.a
+
+    def zpk(self, spec):
+        """Return the (zeros, poles, gain) of ``spec``."""
+        design = self.get(spec)
+        return design.zeros, design.poles, design.gain
+
+    def sos(self, spec):
+        """Return the second-order sections of ``spec``."""
+        return self.get(spec).sos
+
+    def clear(self):
+        """Drop the in-memory tier (the disk tier is kept)."""
+        with self._lock:
+            self._designs.clear()
+
+    def _disk_path(self, spec):
+        return os.path.join(self.cache_dir, spec_key(spec) + ".npz")
+
+    def _load_from_disk(self, spec):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(spec)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                design = FilterDesign(*(data[field] for field in FilterDesign._fields))
+        except (OSError, ValueError, KeyError):
+            return None  # Corrupt or outdated entry: redesign it
+        return _freeze(design._replace(gain=float(design.gain)))
+
+    def _save_to_disk(self, spec, design):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(spec)
+        temp_path = path + ".tmp.npz"
+        try:
+            np.savez(temp_path, **design._asdict())
+            os.replace(temp_path, path)  # Atomic, so readers never see partial files
+        except OSError as e:
+            print(f"Error writing filter design cache {path}: {e}")
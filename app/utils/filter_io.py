@@ -0,0 +1,175 @@
+import csv
+import os
+import struct
+from itertools import islice
+
+import numpy as np
+
+SIGNAL_FORMATS = (".csv", ".npy", ".wav")
+OUTPUT_FORMATS = (".csv", ".npy")
+
+
+def write_roots_csv(filepath, zeros, poles):
+    """Save zeros and poles in the app's CSV format (Type, Real, Imaginary)."""
+    with open(filepath, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Type", "Real", "Imaginary"])
+        for z in zeros:
+            writer.writerow(["Zero", z.real, z.imag])
+        for p in poles:
+            writer.writerow(["Pole", p.real, p.imag])
+
+
+def read_roots_csv(filepath):
+    """Load (zeros, poles) from a CSV file written by ``write_roots_csv``."""
+    zeros = []
+    poles = []
+    with open(filepath, 'r') as file:
+        reader = csv.reader(file)
+        next(reader)  # Skip header
+        for row in reader:
+            if row[0] == "Zero":
+                zeros.append(complex(float(row[1]), float(row[2])))
+            elif row[0] == "Pole":
+                poles.append(complex(float(row[1]), float(row[2])))
+    return zeros, poles
+
+
+def open_signal(filepath):
+    """
+    Open a signal file without reading it into memory.
+
+    Returns ``(samples, sample_rate)``. NPY and WAV files are memory-mapped;
+    CSV files cannot be, so they are returned as a ``CsvSignal`` that is read
+    lazily, one chunk at a time. ``sample_rate`` is None unless the file
+    stores one (WAV).
+
+    Multi-channel signals are (channels, samples): 2-D NPY files are expected
+    in that layout, and multi-channel WAV data is returned as a transposed view.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".npy":
+        return np.load(filepath, mmap_mode="r"), None
+    if extension == ".wav":
+        from scipy.io import wavfile
+        sample_rate, samples = wavfile.read(filepath, mmap=True)
+        return samples.T, sample_rate
+    if extension == ".csv":
+        return CsvSignal(filepath), None
+    raise ValueError(f"Unsupported signal format '{extension}' (expected one of {', '.join(SIGNAL_FORMATS)})")
+
+
+def iter_chunks(samples, chunk_size):
+    """Yield consecutive float64 chunks (along the sample axis) of a signal."""
+    if isinstance(samples, CsvSignal):
+        yield from samples.iter_chunks(chunk_size)
+        return
+    for start in range(0, samples.shape[-1], chunk_size):
+        yield np.asarray(samples[..., start:start + chunk_size], dtype=np.float64)
+
+
+class CsvSignal:
+    """
+    A CSV signal read lazily in chunks (a header row is skipped).
+
+    One column per channel; multi-column chunks are returned as (channels, samples).
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+    def iter_chunks(self, chunk_size):
+        with open(self.filepath, 'r') as file:
+            first = file.readline()
+            try:
+                float(first.split(",")[0])
+                pending = [first]
+            except ValueError:
+                pending = []  # Header row
+            while True:
+                lines = pending + list(islice(file, chunk_size - len(pending)))
+                pending = []
+                lines = [line for line in lines if line.strip()]
+                if not lines:
+                    return
+                chunk = np.loadtxt(lines, delimiter=",", dtype=np.float64, ndmin=2)
+                yield chunk[:, 0] if chunk.shape[1] == 1 else chunk.T
+
+
+def open_output(filepath, channels=None, dtype=np.float64):
+    """Open a chunked output writer for ``filepath`` (.npy or .csv; ``dtype`` applies to .npy)."""
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".npy":
+        return NpyWriter(filepath, dtype=dtype, channels=channels)
+    if extension == ".csv":
+        return CsvWriter(filepath)
+    raise ValueError(f"Unsupported output format '{extension}' (expected one of {', '.join(OUTPUT_FORMATS)})")
+
+
+class NpyWriter:
+    """
+    Append float64 samples to an .npy file whose length is not known upfront.
+
+    The header is written with a fixed size and rewritten with the final
+    length on close, so the data can be streamed straight to disk.
+    Multi-channel output is stored as a Fortran-ordered (channels, samples)
+    array, whose memory layout is sample-major and can therefore be appended.
+    """
+
+    _HEADER_SIZE = 128  # Multiple of 64, as the .npy format requires
+
+    def __init__(self, filepath, dtype=np.float64, channels=None):
+        self.filepath = filepath
+        self.dtype = np.dtype(dtype)
+        self.channels = channels
+        self.length = 0
+        self._file = open(filepath, 'wb')
+        self._file.write(self._header())
+
+    def write(self, chunk):
+        chunk = np.asarray(chunk, dtype=self.dtype)
+        # (channels, n) chunks are written sample-major
+        np.ascontiguousarray(chunk.T).tofile(self._file)
+        self.length += chunk.shape[-1]
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+    def _header(self):
+        if self.channels is None:
+            layout = "'fortran_order': False, 'shape': (%d,)" % self.length
+        else:
+            layout = "'fortran_order': True, 'shape': (%d, %d)" % (self.channels, self.length)
+        header = "{'descr': %r, %s, }" % (np.lib.format.dtype_to_descr(self.dtype), layout)
+        header = header.ljust(self._HEADER_SIZE - 10 - 1) + "\n"
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvWriter:
+    """Append samples to a CSV file, one column per channel."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.length = 0
+        self._file = open(filepath, 'w')
+
+    def write(self, chunk):
+        np.savetxt(self._file, np.asarray(chunk).T, delimiter=",")
+        self.length += np.shape(chunk)[-1]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,219 @@
+"""
+Binary filter project files (.dfp) and bundles of many designs (.dfpb).
+
+Both use the same versioned container (little-endian):
+
+    magic    6 bytes   b"DFPROJ" (project) or b"DFBNDL" (bundle)
+    version  uint16
+    length   uint32    size of the JSON header that follows
+    header   JSON      metadata, plus "arrays": {name: [dtype, shape, offset]}
+    data     raw arrays, each starting on a 64-byte boundary (offsets are
+             relative to the first boundary after the header)
+
+Loading memory-maps the file and returns the arrays as read-only views, so
+opening a file costs one small header parse however many roots it holds. A
+bundle stores thousands of designs as two concatenated root arrays plus
+offsets, so ``ProjectBundle`` opens all of them with a single map.
+
+The zeros/poles CSV (``filter_io``) stays supported for import and export.
+"""
+import json
+import math
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from app.utils.filter_state import FilterState
+
+PROJECT_EXTENSION = ".dfp"
+BUNDLE_EXTENSION = ".dfpb"
+PROJECT_MAGIC = b"DFPROJ"
+BUNDLE_MAGIC = b"DFBNDL"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+# Frequency grid stored with each project (same grid as sos_response)
+PROJECT_RESPONSE_POINTS = 512
+
+_PREFIX = struct.Struct("<6sHI")
+
+# A loaded project. ``all_pass`` is a tuple of (name, zeros, poles) for the
+# selected all-pass sections; ``sos``/``w``/``h`` describe the filter that is
+# applied (the library design when one is selected, all-pass sections
+# included when ``all_pass_enabled``).
+FilterProject = namedtuple(
+    "FilterProject",
+    ["zeros", "poles", "library", "all_pass", "all_pass_enabled", "sos", "w", "h"],
+)
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_container(path, magic, metadata, arrays):
+    """Write ``arrays`` (name -> array) and JSON ``metadata`` to ``path`` atomically."""
+    layout = {}
+    blocks = []
+    end = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        offset = _align(end)
+        layout[name] = [array.dtype.str, list(array.shape), offset]
+        blocks.append((offset, array))
+        end = offset + array.nbytes
+    header = json.dumps(dict(metadata, arrays=layout)).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+
+    temp_path = path + f".{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_PREFIX.pack(magic, FORMAT_VERSION, len(header)))
+        file.write(header)
+        for offset, array in blocks:
+            file.seek(data_start + offset)
+            file.write(array.tobytes())
+        file.truncate(data_start + end)
+    os.replace(temp_path, path)
+
+
+def read_container(path, magic, mmap=True):
+    """Return ``(metadata, arrays)``; arrays are read-only views of a memory map when ``mmap``."""
+    if mmap and os.path.getsize(path) > 0:
+        # Plain ndarray views (which keep the map alive) slice much faster than memmap objects
+        buffer = np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+    if len(buffer) < _PREFIX.size:
+        raise ValueError(f"{path}: file is too short")
+    file_magic, version, length = _PREFIX.unpack(bytes(buffer[:_PREFIX.size]))
+    if file_magic != magic:
+        raise ValueError(f"{path}: not a {magic.decode()} file")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"{path}: format version {version} is newer than this app supports ({FORMAT_VERSION})")
+    metadata = json.loads(bytes(buffer[_PREFIX.size:_PREFIX.size + length]).decode("utf-8"))
+    data_start = _align(_PREFIX.size + length)
+
+    arrays = {}
+    for name, (dtype, shape, offset) in metadata.pop("arrays").items():
+        dtype = np.dtype(dtype)
+        start = data_start + offset
+        stop = start + math.prod(shape) * dtype.itemsize
+        if stop > len(buffer):
+            raise ValueError(f"{path}: array '{name}' is truncated")
+        arrays[name] = buffer[start:stop].view(dtype).reshape(shape)
+    return metadata, arrays
+
+
+def save_project(path, zeros, poles, library="None", all_pass=(), all_pass_enabled=False,
+                 worN=PROJECT_RESPONSE_POINTS, filter_state=None):
+    """
+    Save a design as a .dfp project.
+
+    ``all_pass`` lists the selected all-pass sections as (name, zeros, poles).
+    The sos cascade and frequency response of the applied filter are stored
+    too, so readers (e.g. the catalog) do not have to recompute them. They
+    come from ``filter_state`` (the FilterState of this design) when given,
+    otherwise from a FilterState built from the other arguments.
+    """
+    zeros = np.asarray(zeros, dtype=np.complex128).ravel()
+    poles = np.asarray(poles, dtype=np.complex128).ravel()
+    all_pass = [(name, np.asarray(ap_zeros, dtype=np.complex128).ravel(), np.asarray(ap_poles, dtype=np.complex128).ravel())
+                for name, ap_zeros, ap_poles in all_pass]
+
+    if filter_state is None:
+        filter_state = FilterState(zeros, poles, library, [(ap_zeros, ap_poles) for _, ap_zeros, ap_poles in all_pass],
+                                   all_pass_enabled)
+    sos = filter_state.sos()
+    w, h = filter_state.response(worN)
+
+    arrays = {"zeros": zeros, "poles": poles, "sos": sos, "w": w, "h": h}
+    for index, (_, ap_zeros, ap_poles) in enumerate(all_pass):
+        arrays[f"all_pass_{index}_zeros"] = ap_zeros
+        arrays[f"all_pass_{index}_poles"] = ap_poles
+    metadata = {
+        "library": library,
+        "all_pass": [name for name, _, _ in all_pass],
+        "all_pass_enabled": bool(all_pass_enabled),
+    }
+    write_container(path, PROJECT_MAGIC, metadata, arrays)
+
+
+def load_project(path, mmap=True):
+    """Load a .dfp project as a FilterProject (arrays memory-mapped when ``mmap``)."""
+    metadata, arrays = read_container(path, PROJECT_MAGIC, mmap)
+    try:
+        all_pass = tuple(
+            (name, arrays[f"all_pass_{index}_zeros"], arrays[f"all_pass_{index}_poles"])
+            for index, name in enumerate(metadata.get("all_pass", []))
+        )
+        return FilterProject(
+            arrays["zeros"], arrays["poles"], metadata.get("library", "None"), all_pass,
+            metadata.get("all_pass_enabled", False), arrays["sos"], arrays["w"], arrays["h"],
+        )
+    except KeyError as e:
+        raise ValueError(f"{path}: missing array {e}") from e
+
+
+def load_projects(paths, mmap=True):
+    """Load many .dfp files; files that cannot be read are reported and skipped."""
+    projects = []
+    for path in paths:
+        try:
+            projects.append(load_project(path, mmap))
+        except (OSError, ValueError) as e:
+            print(f"Skipping {path}: {e}")
+    return projects
+
+
+def save_bundle(path, designs):
+    """Save many (name, zeros, poles) designs into one .dfpb bundle."""
+    names, zeros, poles = [], [], []
+    for name, design_zeros, design_poles in designs:
+        names.append(name)
+        zeros.append(np.asarray(design_zeros, dtype=np.complex128).ravel())
+        poles.append(np.asarray(design_poles, dtype=np.complex128).ravel())
+    arrays = {
+        "zeros": np.concatenate(zeros) if zeros else np.zeros(0, dtype=np.complex128),
+        "poles": np.concatenate(poles) if poles else np.zeros(0, dtype=np.complex128),
+        "zero_offsets": np.cumsum([0] + [len(roots) for roots in zeros], dtype=np.int64),
+        "pole_offsets": np.cumsum([0] + [len(roots) for roots in poles], dtype=np.int64),
+    }
+    write_container(path, BUNDLE_MAGIC, {"names": names}, arrays)
+
+
+class ProjectBundle:
+    """
+    Read-only view of a .dfpb bundle.
+
+    Opening it maps the file and parses one header; ``bundle[i]`` returns
+    ``(name, zeros, poles)`` as views into the map, without copying.
+    """
+
+    def __init__(self, path, mmap=True):
+        self.path = path
+        metadata, arrays = read_container(path, BUNDLE_MAGIC, mmap)
+        self.names = metadata["names"]
+        self.zeros = arrays["zeros"]
+        self.poles = arrays["poles"]
+        self.zero_offsets = arrays["zero_offsets"]
+        self.pole_offsets = arrays["pole_offsets"]
+        if len(self.zero_offsets) != len(self.names) + 1 or len(self.pole_offsets) != len(self.names) + 1:
+            raise ValueError(f"{path}: offsets do not match the number of designs")
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("ProjectBundle index out of range")
+        index %= len(self)
+        return (
+            self.names[index],
+            self.zeros[self.zero_offsets[index]:self.zero_offsets[index + 1]],
+            self.poles[self.pole_offsets[index]:self.pole_offsets[index + 1]],
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
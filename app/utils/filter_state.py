@@ -0,0 +1,138 @@
+"""
+The active filter design as one immutable, versioned value.
+
+``FilterState`` holds the base zeros/poles, the library selection, the
+selected all-pass sections and whether they are enabled. Everything derived
+from it (zpk, ba, sos, frequency response) is computed on first use and
+memoized on the instance, so each artifact is computed once per edit
+however many consumers read it. An edit creates a new state with
+``replace``, which bumps ``version``.
+
+States never change after construction, so the same object can be handed
+to a worker thread. Two threads asking for the same artifact at once may
+both compute it; they get equal results.
+"""
+import numpy as np
+
+from app.utils.cascade import cascade_sos, roots_to_sos, sos_response
+from app.utils.filter_design import FILTER_LIBRARY_SPECS, FilterDesignCache
+
+_FIELDS = ("zeros", "poles", "library", "all_pass", "all_pass_enabled")
+
+
+def _roots(values):
+    return tuple(complex(value) for value in values)
+
+
+def _freeze(array):
+    array = np.asarray(array)
+    array.flags.writeable = False
+    return array
+
+
+class FilterState:
+    def __init__(self, zeros=(), poles=(), library="None", all_pass=(), all_pass_enabled=False,
+                 design_cache=None, version=0):
+        self.zeros = _roots(zeros)
+        self.poles = _roots(poles)
+        self.library = library if library in FILTER_LIBRARY_SPECS else "None"
+        # ((zeros, poles), ...) of the selected all-pass sections
+        self.all_pass = tuple((_roots(ap_zeros), _roots(ap_poles)) for ap_zeros, ap_poles in all_pass)
+        self.all_pass_enabled = bool(all_pass_enabled)
+        self.design_cache = design_cache or FilterDesignCache()
+        self.version = version
+        self._memo = {}
+
+    def replace(self, **changes):
+        """Return the state with ``changes`` applied and the next version (self when nothing changed)."""
+        updated = FilterState(
+            **{field: changes.get(field, getattr(self, field)) for field in _FIELDS},
+            design_cache=self.design_cache, version=self.version + 1,
+        )
+        if all(getattr(updated, field) == getattr(self, field) for field in _FIELDS):
+            return self
+        return updated
+
+    def _memoized(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    @property
+    def library_spec(self):
+        return None if self.library == "None" else FILTER_LIBRARY_SPECS[self.library]
+
+    @property
+    def all_pass_zeros(self):
+        """Zeros of the enabled all-pass sections (empty when disabled)."""
+        if not self.all_pass_enabled:
+            return ()
+        return tuple(root for ap_zeros, _ in self.all_pass for root in ap_zeros)
+
+    @property
+    def all_pass_poles(self):
+        if not self.all_pass_enabled:
+            return ()
+        return tuple(root for _, ap_poles in self.all_pass for root in ap_poles)
+
+    @property
+    def combined_zeros(self):
+        """Base zeros plus the enabled all-pass zeros (what the Z-plane shows)."""
+        return self._memoized("combined_zeros", lambda: self.zeros + self.all_pass_zeros)
+
+    @property
+    def combined_poles(self):
+        return self._memoized("combined_poles", lambda: self.poles + self.all_pass_poles)
+
+    def _library_roots_unchanged(self):
+        """True while the base roots are exactly the selected library design's (no edits since)."""
+        def compute():
+            zeros, poles, _ = self.design_cache.zpk(self.library_spec)
+            return self.zeros == _roots(zeros) and self.poles == _roots(poles)
+        return self.library_spec is not None and self._memoized("library_roots_unchanged", compute)
+
+    def zpk(self):
+        """
+        (zeros, poles, gain) of the filter that is applied.
+
+        The roots are the combined ones the Z-plane shows; a selected library
+        design contributes its gain, so edits to its roots keep the gain.
+        """
+        def compute():
+            gain = 1.0 if self.library_spec is None else self.design_cache.zpk(self.library_spec)[2]
+            return self.combined_zeros, self.combined_poles, gain
+        return self._memoized("zpk", compute)
+
+    def ba(self):
+        """Direct-form (b, a) coefficients; ([1], [1]) when no roots are placed."""
+        def compute():
+            if self._library_roots_unchanged():
+                # Unedited library design: the designed coefficients, not a re-expansion of its roots
+                b, a = self.design_cache.ba(self.library_spec)
+                return (_freeze(np.convolve(b, np.poly(self.all_pass_zeros))),
+                        _freeze(np.convolve(a, np.poly(self.all_pass_poles))))
+            zeros, poles, gain = self.zpk()
+            return _freeze(gain * np.atleast_1d(np.poly(zeros))), _freeze(np.atleast_1d(np.poly(poles)))
+        return self._memoized("ba", compute)
+
+    def sos(self):
+        """Second-order sections of the applied filter (a copy, so callers may pass it to scipy)."""
+        return np.array(self._sos())
+
+    def _sos(self):
+        def compute():
+            if not self._library_roots_unchanged():
+                return _freeze(roots_to_sos(*self.zpk()))
+            sos = self.design_cache.sos(self.library_spec)
+            if self.all_pass_zeros or self.all_pass_poles:
+                # Include selected all-pass filters as extra sections
+                sos = cascade_sos(sos, roots_to_sos(self.all_pass_zeros, self.all_pass_poles))
+            return _freeze(sos)
+        return self._memoized("sos", compute)
+
+    def response(self, worN=500):
+        """(w, h) of the applied filter on the ``freqz`` grid."""
+        def compute():
+            w, h = sos_response(self._sos(), worN=worN)
+            return _freeze(w), _freeze(h)
+        return self._memoized(("response", worN), compute)
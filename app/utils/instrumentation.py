@@ -0,0 +1,169 @@
+"""
+Lightweight timing of the app's hot paths.
+
+Stages are timed with ``instrumentation.stage(name)`` (context manager) or
+``@instrumentation.timed(name)`` (decorator). Each stage keeps a rolling
+window of durations for p50/p95/p99 reporting.
+
+Disabled by default; while disabled a stage costs a single attribute check.
+Environment variables:
+
+    DIGITAL_FILTER_INSTRUMENT=1            enable timing at startup
+    DIGITAL_FILTER_TIMINGS=timings.jsonl   also append every sample as a JSON line
+    DIGITAL_FILTER_PROFILE=capture.prof    run cProfile from startup until close()
+
+In the GUI, F9 toggles the timing overlay, F10 starts/stops a cProfile
+capture and F11 dumps the current percentiles as JSON lines.
+"""
+import cProfile
+import functools
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyStats:
+    """Rolling window of the most recent durations of one stage (in seconds)."""
+
+    def __init__(self, window=1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """Percentiles of the window in seconds (NaN while empty)."""
+        if not self.samples:
+            return tuple(float("nan") for _ in percentiles)
+        return tuple(np.percentile(np.fromiter(self.samples, dtype=float), percentiles))
+
+
+class Instrumentation:
+    def __init__(self, enabled=False, window=1000, timings_path=None):
+        self.enabled = enabled
+        self.window = window
+        self.stats = {}
+        self.timings_path = timings_path
+        self._timings_file = None
+        self.profiler = None
+        self.profile_path = None
+
+    @classmethod
+    def from_env(cls):
+        timings_path = os.environ.get("DIGITAL_FILTER_TIMINGS")
+        enabled = bool(os.environ.get("DIGITAL_FILTER_INSTRUMENT")) or bool(timings_path)
+        instrumentation = cls(enabled=enabled, timings_path=timings_path)
+        profile_path = os.environ.get("DIGITAL_FILTER_PROFILE")
+        if profile_path:
+            instrumentation.start_profile()
+            instrumentation.profile_path = profile_path
+        return instrumentation
+
+    def record(self, name, seconds):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = LatencyStats(self.window)
+        stats.record(seconds)
+        if self.timings_path:
+            if self._timings_file is None:
+                self._timings_file = open(self.timings_path, "a")
+            self._timings_file.write(json.dumps({"stage": name, "time": time.time(), "ms": seconds * 1e3}) + "\n")
+
+    @contextmanager
+    def _timed_stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def stage(self, name):
+        """Context manager timing the enclosed block as ``name``."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed_stage(name)
+
+    def timed(self, name):
+        """Decorator timing every call of the function as ``name``."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """{stage: (count, p50_ms, p95_ms, p99_ms)} for every stage seen so far."""
+        return {
+            name: (stats.count, *(value * 1e3 for value in stats.percentiles()))
+            for name, stats in sorted(self.stats.items())
+        }
+
+    def format_summary(self):
+        lines = [f"{'stage':<20} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)"]
+        for name, (count, p50, p95, p99) in self.summary().items():
+            lines.append(f"{name:<20} {count:>7} {p50:>8.3f} {p95:>8.3f} {p99:>8.3f}")
+        return "\n".join(lines)
+
+    def dump_summary(self, path):
+        """Append one JSON line per stage with its current percentiles (ms)."""
+        now = time.time()
+        with open(path, "a") as file:
+            for name, (count, p50, p95, p99) in self.summary().items():
+                file.write(json.dumps({"stage": name, "time": now, "count": count,
+                                       "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}) + "\n")
+        return path
+
+    def reset(self):
+        self.stats.clear()
+
+    def start_profile(self):
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop_profile(self, path):
+        """Stop the running cProfile capture and write it to ``path`` (pstats format)."""
+        if self.profiler is None:
+            return None
+        self.profiler.disable()
+        self.profiler.dump_stats(path)
+        self.profiler = None
+        return path
+
+    def close(self):
+        """Flush the JSON-lines dump and any profile started from the environment."""
+        if self._timings_file is not None:
+            self._timings_file.close()
+            self._timings_file = None
+        if self.profile_path and self.profiler is not None:
+            self.stop_profile(self.profile_path)
+            print(f"Profile written to {self.profile_path}")
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+# Shared instance used by the controllers
+instrumentation = Instrumentation.from_env()
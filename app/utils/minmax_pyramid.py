@@ -0,0 +1,200 @@
+import numpy as np
+
+
+class GrowableArray:
+    """
+    Append-only in-memory float64 array with amortized O(1) growth.
+
+    Default storage of a MinMaxPyramid; ``SegmentedStore`` offers the same
+    interface with older samples spilled to disk.
+    """
+
+    def __init__(self, capacity=1024):
+        self._data = np.empty(capacity)
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        return self._data[:self.length][index]
+
+    def __setitem__(self, index, value):
+        self._data[:self.length][index] = value
+
+    def read(self, start, stop):
+        return self._data[max(0, start):min(self.length, stop)]
+
+    def snapshot(self, start=0, stop=None):
+        """Samples ``start:stop`` as a list of arrays that later appends never change."""
+        stop = self.length if stop is None else min(self.length, stop)
+        # Growing reallocates _data, so this view keeps the current contents
+        return [self._data[max(0, start):stop]]
+
+    def truncate(self, length):
+        self.length = min(self.length, length)
+
+    def clear(self):
+        self.length = 0
+
+    def close(self):
+        self.clear()
+
+    def append(self, value):
+        if self.length == len(self._data):
+            self.extend((value,))
+            return
+        self._data[self.length] = value
+        self.length += 1
+
+    def extend(self, values):
+        end = self.length + len(values)
+        if end > len(self._data):
+            grown = np.empty(max(end, 2 * len(self._data)))
+            grown[:self.length] = self._data[:self.length]
+            self._data = grown
+        self._data[self.length:end] = values
+        self.length = end
+
+
+class MinMaxPyramid:
+    """
+    A growing signal plus multi-level min/max summaries for fast plotting.
+
+    Level ``k`` stores the min and max of every bucket of ``factor ** k``
+    samples. Appending only recomputes the buckets the new samples fall in
+    (the last, partial bucket of each level is kept up to date), so
+    extending costs amortized O(new samples).
+
+    ``window(start, stop, max_points)`` returns what a plot needs to draw a
+    range of samples: the raw samples when they fit in ``max_points``,
+    otherwise a min/max envelope from the finest level that has at most
+    ``max_points / 2`` buckets in the range.
+    """
+
+    def __init__(self, factor=8, make_store=None):
+        if factor < 2:
+            raise ValueError("MinMaxPyramid factor must be at least 2")
+        self.factor = factor
+        # make_store(name) creates the storage of each level (GrowableArray or SegmentedStore)
+        self.make_store = make_store or (lambda name: GrowableArray())
+        self.samples = self.make_store("samples")
+        self.mins = []  # Level k + 1 bucket minimums
+        self.maxs = []
+
+    def __len__(self):
+        return self.samples.length
+
+    @property
+    def levels(self):
+        return len(self.mins) + 1
+
+    def clear(self):
+        for store in [self.samples] + self.mins + self.maxs:
+            store.close()
+        self.samples = self.make_store("samples")
+        self.mins = []
+        self.maxs = []
+
+    def append(self, value):
+        """Append one sample (scalar fast path of ``extend``)."""
+        value = float(value)
+        index = len(self)
+        self.samples.append(value)
+        bucket = 1
+        for mins, maxs in zip(self.mins, self.maxs):
+            bucket *= self.factor
+            slot = index // bucket
+            if slot == mins.length:
+                # First sample of a new bucket
+                mins.append(value)
+                maxs.append(value)
+                continue
+            low, high = mins[slot], maxs[slot]
+            if high >= value >= low:
+                return  # Inside the bucket's range: no coarser level changes
+            mins[slot] = min(low, value)
+            maxs[slot] = max(high, value)
+        self._add_levels()
+
+    def extend(self, values):
+        """Append samples and update the summaries they touch."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        old_length = len(self)
+        self.samples.extend(values)
+
+        lower_mins = lower_maxs = self.samples
+        bucket = 1
+        for level in range(len(self.mins)):
+            bucket *= self.factor
+            # First bucket of this level touched by the new samples
+            first = old_length // bucket
+            start = first * self.factor
+            starts = np.arange(0, len(lower_mins) - start, self.factor)
+            mins = np.minimum.reduceat(lower_mins.read(start, len(lower_mins)), starts)
+            maxs = np.maximum.reduceat(lower_maxs.read(start, len(lower_maxs)), starts)
+            self.mins[level].truncate(first)
+            self.maxs[level].truncate(first)
+            self.mins[level].extend(mins)
+            self.maxs[level].extend(maxs)
+            lower_mins, lower_maxs = self.mins[level], self.maxs[level]
+        self._add_levels()
+
+    def _add_levels(self):
+        """Add coarser levels until the top one is a single bucket."""
+        while True:
+            lower_mins = self.mins[-1] if self.mins else self.samples
+            lower_maxs = self.maxs[-1] if self.maxs else self.samples
+            if len(lower_mins) <= 1:
+                return
+            starts = np.arange(0, len(lower_mins), self.factor)
+            level = len(self.mins) + 1
+            mins, maxs = self.make_store(f"min{level}"), self.make_store(f"max{level}")
+            mins.extend(np.minimum.reduceat(lower_mins.read(0, len(lower_mins)), starts))
+            maxs.extend(np.maximum.reduceat(lower_maxs.read(0, len(lower_maxs)), starts))
+            self.mins.append(mins)
+            self.maxs.append(maxs)
+
+    def read(self, start, stop):
+        """Raw samples ``start:stop``."""
+        return self.samples.read(start, stop)
+
+    def snapshot(self, start=0, stop=None):
+        """
+        Raw samples ``start:stop`` as a list of arrays that stay valid and
+        unchanged while the pyramid keeps growing (safe to hand to a worker).
+        """
+        return self.samples.snapshot(start, stop)
+
+    def window(self, start, stop, max_points=2000):
+        """
+        Return ``(x, y)`` to plot samples ``start:stop`` with at most ~``max_points`` points.
+
+        ``x`` holds absolute sample indices. Decimated ranges interleave each
+        bucket's min and max so that spikes stay visible.
+        """
+        start = max(0, int(start))
+        stop = min(len(self), int(np.ceil(stop)))
+        if stop <= start:
+            return np.zeros(0), np.zeros(0)
+        if stop - start <= max_points:
+            return np.arange(start, stop, dtype=np.float64), self.samples.read(start, stop)
+
+        # Finest level with at most max_points / 2 buckets (two points each)
+        level = 0
+        bucket = 1
+        while level < len(self.mins) and (stop - start) / bucket > max_points / 2:
+            level += 1
+            bucket *= self.factor
+
+        first, last = start // bucket, -(-stop // bucket)
+        mins = self.mins[level - 1].read(first, last)
+        maxs = self.maxs[level - 1].read(first, last)
+        x = np.repeat(np.arange(first, first + len(mins), dtype=np.float64) * bucket, 2)
+        x[1::2] += bucket / 2
+        y = np.empty(2 * len(mins))
+        y[0::2] = mins
+        y[1::2] = maxs
+        return x, y
@@ -0,0 +1,317 @@
+"""
+Reduced-precision streaming and quantization error reports.
+
+Besides the float64 reference the filter can run in:
+
+    float32   StreamingFilter with single-precision coefficients and state
+    q31, q15  Bit-true fixed-point model of a DSP biquad cascade (direct
+              form I, one coefficient shift per section, 64-bit accumulator,
+              saturating outputs), on 32- or 16-bit samples
+
+The fixed-point model steps through the samples in Python, 50-75x slower
+than float64, so it only serves quantization reports: the live filter and
+batch_filter.py stream in ``STREAMING_PRECISIONS``.
+
+``quantization_report`` tells whether a design survives the move to one of
+these precisions: the SNR of its output against float64, and where the poles
+end up once the section coefficients are rounded.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from app.utils.c_export import _real_coefficients
+from app.utils.streaming_filter import StreamingFilter
+
+PRECISIONS = ("float64", "float32", "q31", "q15")
+# Fast enough to filter signals with (live captures and batch files)
+STREAMING_PRECISIONS = ("float64", "float32")
+# Word length of the fixed-point formats (one sign bit, the rest fraction)
+FIXED_POINT_BITS = {"q31": 32, "q15": 16}
+
+_ACCUMULATOR_LIMIT = 1 << 63
+# Up to this many channels, filtering each on Python ints beats vectorizing across them
+SCALAR_CHANNEL_LIMIT = 32
+
+QuantizationReport = namedtuple(
+    "QuantizationReport",
+    "precision snr_db max_pole_shift max_pole_radius unstable_poles direct_form_radius",
+)
+
+
+def check_precision(precision):
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}' (expected one of {', '.join(PRECISIONS)})")
+    return precision
+
+
+def check_streaming_precision(precision):
+    if precision not in STREAMING_PRECISIONS:
+        raise ValueError(
+            f"Precision '{precision}' is not available for filtering signals (expected one of "
+            f"{', '.join(STREAMING_PRECISIONS)}); fixed point is only modelled in quantization reports"
+        )
+    return precision
+
+
+def fixed_point_coefficients(sos, bits):
+    """
+    Quantize sections for a ``bits``-wide fixed-point target.
+
+    Returns ``(coefficients, shifts)``: integer rows (b0, b1, b2, a1, a2) and,
+    per section, the number of integer bits reserved so that its largest
+    coefficient fits the word (the coefficients have ``bits - 1 - shift``
+    fraction bits).
+    """
+    sos = _real_coefficients(np.atleast_2d(sos), "section coefficients")
+    sos = sos / sos[:, 3:4]
+    rows = sos[:, [0, 1, 2, 4, 5]]
+    fraction = bits - 1
+    largest = np.max(np.abs(rows), axis=1)
+    shifts = np.zeros(len(rows), dtype=np.int64)
+    nonzero = largest > 0
+    shifts[nonzero] = np.maximum(0, np.floor(np.log2(largest[nonzero])) + 1)
+    # Keep at least one fraction bit; larger coefficients saturate
+    shifts = np.minimum(shifts, fraction - 1)
+    limit = 2 ** fraction
+    scaled = np.round(rows * 2.0 ** (fraction - shifts)[:, None])
+    return np.clip(scaled, -limit, limit - 1).astype(np.int64), shifts
+
+
+def quantize_sos(sos, precision):
+    """The sections as the target precision actually stores them (as float64 values)."""
+    check_precision(precision)
+    sos = np.atleast_2d(sos)
+    if precision == "float64":
+        return np.array(sos)
+    if precision == "float32":
+        return sos.astype(np.complex64 if np.iscomplexobj(sos) else np.float32).astype(sos.dtype)
+    coefficients, shifts = fixed_point_coefficients(sos, FIXED_POINT_BITS[precision])
+    values = coefficients / 2.0 ** (FIXED_POINT_BITS[precision] - 1 - shifts)[:, None]
+    return np.column_stack([values[:, :3], np.ones(len(values)), values[:, 3:]])
+
+
+def to_fixed_point(samples, bits, full_scale=1.0):
+    """Round samples (``full_scale`` maps to 1.0) to saturated ``bits``-wide integers."""
+    limit = 2 ** (bits - 1)
+    scaled = np.round(np.asarray(samples, dtype=np.float64) * (limit / full_scale))
+    return np.clip(scaled, -limit, limit - 1).astype(np.int64)
+
+
+def from_fixed_point(values, bits, full_scale=1.0):
+    return np.asarray(values, dtype=np.float64) * (full_scale / 2 ** (bits - 1))
+
+
+class FixedPointStreamingFilter:
+    """
+    ``StreamingFilter`` interface running a bit-true Q15/Q31 biquad cascade.
+
+    Each section computes, on integers,
+
+        acc = b0 x[n] + b1 x[n-1] + b2 x[n-2] - a1 y[n-1] - a2 y[n-2]
+        y[n] = saturate(round(acc >> (fraction - shift)))
+
+    with a 64-bit accumulator that wraps on overflow like the hardware.
+    Float samples are mapped to the fixed-point range with ``full_scale``
+    (that value becomes 1.0) and converted back on output.
+
+    The recursion runs one sample at a time (on Python ints per channel, or
+    vectorized across channels in numpy for many channels), so this is a
+    model for checking designs in ``quantization_report`` rather than a
+    filter for signals.
+    """
+
+    def __init__(self, sos, precision="q15", channels=None, full_scale=1.0):
+        self.bits = FIXED_POINT_BITS[check_precision(precision)]
+        self.precision = precision
+        self.channels = channels
+        self.full_scale = full_scale
+        self.set_sos(sos)
+
+    @classmethod
+    def from_sos(cls, sos, channels=None, precision="q15", full_scale=1.0):
+        return cls(sos, precision, channels, full_scale)
+
+    def set_sos(self, sos):
+        self.coefficients, self.shifts = fixed_point_coefficients(sos, self.bits)
+        self.sos = quantize_sos(sos, self.precision)
+        self.reset()
+
+    @property
+    def order(self):
+        return 2 * len(self.coefficients)
+
+    @property
+    def coefficient_dtype(self):
+        return np.dtype(np.float64)
+
+    def reset(self):
+        channel_shape = (1,) if self.channels is None else (self.channels,)
+        # Per section: x[n-1], x[n-2], y[n-1], y[n-2]
+        self.zi = np.zeros((len(self.coefficients), 4) + channel_shape, dtype=np.int64)
+
+    def process_fixed(self, block):
+        """Filter a block of fixed-point integers (shape (samples,) or (channels, samples))."""
+        block = np.asarray(block, dtype=np.int64)
+        if self.channels is None:
+            block = np.atleast_1d(block)[None, :]
+        elif block.shape[:-1] != (self.channels,):
+            raise ValueError(f"Expected a ({self.channels}, samples) block, got shape {block.shape}")
+
+        fraction = self.bits - 1
+        low, high = -2 ** fraction, 2 ** fraction - 1
+        if len(block) <= SCALAR_CHANNEL_LIMIT:
+            output = np.array([self._process_scalar(row, channel, low, high) for channel, row in enumerate(block)])
+            return output[0] if self.channels is None else output
+        sections = [
+            (*(int(c) for c in row), int(fraction - shift), 1 << int(fraction - shift - 1), state)
+            for row, shift, state in zip(self.coefficients, self.shifts, self.zi)
+        ]
+        output = np.empty(block.shape, dtype=np.int64)
+        with np.errstate(over="ignore"):
+            for n in range(block.shape[-1]):
+                value = block[:, n]
+                for b0, b1, b2, a1, a2, shift, rounding, state in sections:
+                    x1, x2, y1, y2 = state
+                    accumulator = b0 * value + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+                    result = np.clip((accumulator + rounding) >> shift, low, high)
+                    state[1] = x1
+                    state[0] = value
+                    state[3] = y1
+                    state[2] = result
+                    value = result
+                output[:, n] = value
+        return output
+
+    def _process_scalar(self, block, channel, low, high):
+        """One channel on Python ints (much faster than numpy on single values)."""
+        fraction = self.bits - 1
+        sections = [
+            ([int(c) for c in row], int(fraction - shift), 1 << int(fraction - shift - 1), [int(v) for v in state[:, channel]])
+            for row, shift, state in zip(self.coefficients, self.shifts, self.zi)
+        ]
+        output = []
+        for value in block.tolist():
+            for (b0, b1, b2, a1, a2), shift, rounding, state in sections:
+                x1, x2, y1, y2 = state
+                accumulator = b0 * value + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+                # Wrap like a 64-bit accumulator (Python ints never overflow)
+                if not -_ACCUMULATOR_LIMIT <= accumulator < _ACCUMULATOR_LIMIT:
+                    accumulator = (accumulator + _ACCUMULATOR_LIMIT) % (2 * _ACCUMULATOR_LIMIT) - _ACCUMULATOR_LIMIT
+                result = (accumulator + rounding) >> shift
+                result = low if result < low else high if result > high else result
+                state[:] = value, x1, result, y1
+                value = result
+            output.append(value)
+        for (_, _, _, state), zi in zip(sections, self.zi):
+            zi[:, channel] = state
+        return np.array(output, dtype=np.int64)
+
+    def process(self, block):
+        """Filter float samples through the fixed-point cascade, carrying the state over."""
+        block = np.asarray(block, dtype=np.float64)
+        if self.channels is None:
+            block = np.atleast_1d(block)
+        elif block.shape[:-1] != (self.channels,):
+            raise ValueError(f"Expected a ({self.channels}, samples) block, got shape {block.shape}")
+        fixed = self.process_fixed(to_fixed_point(block, self.bits, self.full_scale))
+        return from_fixed_point(fixed, self.bits, self.full_scale)
+
+    def process_sample(self, sample):
+        return self.process((sample,))[0]
+
+    def filter(self, signal):
+        self.reset()
+        return self.process(signal)
+
+
+def make_precision_filter(sos, precision="float64", channels=None, full_scale=1.0):
+    """Streaming filter for ``sos`` running at ``precision`` (see PRECISIONS)."""
+    check_precision(precision)
+    if precision in FIXED_POINT_BITS:
+        return FixedPointStreamingFilter(sos, precision, channels, full_scale)
+    return StreamingFilter.from_sos(sos, channels=channels, dtype=np.dtype(precision))
+
+
+def _poles(sos):
+    """Poles of every section (roots of a0 + a1 z^-1 + a2 z^-2)."""
+    return np.concatenate([np.roots(row[3:]) for row in np.atleast_2d(sos)])
+
+
+def _match(reference, moved):
+    """Distance from each reference pole to the nearest moved pole."""
+    if not len(reference) or not len(moved):
+        return np.zeros(0)
+    return np.min(np.abs(reference[:, None] - moved[None, :]), axis=1)
+
+
+def probe_signal(samples=8192, seed=0, amplitude=0.25):
+    """White noise at ``amplitude`` of full scale: excites every frequency, leaves headroom."""
+    return amplitude * np.random.default_rng(seed).uniform(-1.0, 1.0, samples)
+
+
+def quantization_report(sos, precision, signal=None, full_scale=1.0):
+    """
+    Compare ``sos`` running at ``precision`` with the float64 reference.
+
+    ``snr_db`` is the output SNR for ``signal`` (default: ``probe_signal()``).
+    The poles of the rounded section coefficients give ``max_pole_shift``,
+    ``max_pole_radius`` and ``unstable_poles`` (on or outside the unit
+    circle). ``direct_form_radius`` is the largest pole radius when the whole
+    transfer function is instead rounded as one polynomial (as a direct-form
+    realization would store it), which shows how much the cascade buys.
+    """
+    sos = np.atleast_2d(sos)
+    signal = probe_signal() if signal is None else np.asarray(signal, dtype=np.float64)
+    reference = StreamingFilter.from_sos(sos).filter(signal)
+    output = make_precision_filter(sos, precision, full_scale=full_scale).filter(signal)
+    error = np.sum(np.abs(reference - output) ** 2)
+    power = np.sum(np.abs(reference) ** 2)
+    snr_db = np.inf if error == 0 else 10 * np.log10(power / error) if power > 0 else -np.inf
+
+    poles = _poles(sos)
+    quantized_poles = _poles(quantize_sos(sos, precision))
+    radii = np.abs(quantized_poles)
+    shift = _match(poles, quantized_poles)
+
+    a = np.atleast_1d(np.poly(poles))
+    if precision in FIXED_POINT_BITS and np.isrealobj(sos):
+        bits = FIXED_POINT_BITS[precision]
+        # One shared scale for the whole polynomial, as a direct form stores it
+        scale = 2 ** max(0, int(np.floor(np.log2(np.max(np.abs(a))))) + 1)
+        step = scale / 2 ** (bits - 1)
+        a = np.round(a.real / step) * step
+    elif precision == "float32":
+        a = a.astype(np.complex64 if np.iscomplexobj(a) else np.float32)
+    direct_radius = np.max(np.abs(np.roots(a)), initial=0.0) if len(a) > 1 else 0.0
+
+    return QuantizationReport(
+        precision=precision,
+        snr_db=float(snr_db),
+        max_pole_shift=float(np.max(shift, initial=0.0)),
+        max_pole_radius=float(np.max(radii, initial=0.0)),
+        unstable_poles=int(np.sum(radii >= 1.0)),
+        direct_form_radius=float(direct_radius),
+    )
+
+
+def quantization_reports(sos, precisions=PRECISIONS[1:], signal=None, full_scale=1.0):
+    """One report per precision; precisions the design cannot use (complex coefficients) are skipped."""
+    reports = []
+    for precision in precisions:
+        try:
+            reports.append(quantization_report(sos, precision, signal, full_scale))
+        except ValueError as e:
+            print(f"Skipping {precision}: {e}")
+    return reports
+
+
+def format_reports(reports):
+    """Readable table of quantization reports."""
+    lines = [f"{'precision':<10}{'SNR dB':>9}{'pole shift':>12}{'max |p|':>10}{'unstable':>10}{'direct |p|':>12}"]
+    for report in reports:
+        lines.append(
+            f"{report.precision:<10}{report.snr_db:>9.1f}{report.max_pole_shift:>12.2e}"
+            f"{report.max_pole_radius:>10.6f}{report.unstable_poles:>10d}{report.direct_form_radius:>12.6f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,121 @@
+"""
+Direct form II realization diagrams, rendered off the UI thread.
+
+Drawing a schemdraw/matplotlib figure takes long enough to freeze the
+window, so ``DiagramRenderer`` renders on a worker thread and keeps the PNG
+bytes in memory, keyed by a hash of the coefficients. Asking again for an
+unchanged design returns the cached image immediately.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+
+def coefficient_key(b, a):
+    """Hash of the (b, a) coefficients, used as the diagram cache key."""
+    digest = hashlib.sha1()
+    for values in (b, a):
+        values = np.ascontiguousarray(values, dtype=np.complex128)
+        digest.update(str(values.shape).encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def render_direct_form_ii(b_coeffs, a_coeffs, dpi=100):
+    """Draw the Direct Form II realization with SchemDraw and return it as PNG bytes."""
+    # schemdraw and matplotlib are heavy: import them on the first render (on the worker thread)
+    import schemdraw
+    import schemdraw.elements as elm
+    from matplotlib.figure import Figure
+
+    b_coeffs = np.asarray(b_coeffs)
+    a_coeffs = np.asarray(a_coeffs)
+    # Normalize coefficients if a[0] != 1
+    if a_coeffs[0] != 1:
+        b_coeffs = b_coeffs / a_coeffs[0]
+        a_coeffs = a_coeffs / a_coeffs[0]
+
+    # No context manager: it would draw through pyplot, which is not thread-safe
+    d = schemdraw.Drawing(show=False)
+    d.config(unit=2)  # Set unit scale for spacing
+
+    # Input signal
+    d.add(elm.SourceV().label("x[n]", loc='left'))  # x_in
+
+    # First Summation Node (Input to Feedforward and Feedback Paths)
+    sum_node1 = d.add(elm.Dot(open=True).label("Σ", loc='center'))
+
+    # Feedforward Path (b-coefficients)
+    for i, b in enumerate(b_coeffs):
+        d.add(elm.Line(w=1, h=1).label(f"b{i}={b:.2f}", loc='center'))
+        if i == 0:
+            d.add(elm.Dot(open=True).label("y[n]", loc='center'))  # output
+
+    # Feedback Path (a-coefficients)
+    for i, a in enumerate(a_coeffs[1:], start=1):  # Skip a[0] (assumed 1)
+        d.add(elm.Line().down().length(1.5))
+        d.add(elm.Rect(w=2, h=1).label("Z⁻¹", loc='center'))
+        d.add(elm.Line().left().length(1.5))
+        d.add(elm.Line(w=2, h=1).label(f"a{i}={a:.2f}", loc='center'))
+
+    # Shared Delay Line (Z⁻¹ blocks)
+    for _ in range(max(len(a_coeffs), len(b_coeffs)) - 1):
+        d.add(elm.Line().down().length(2))
+        d.add(elm.Rect(w=2, h=1).label("Z⁻¹", loc='center'))
+        d.add(elm.Line().down().length(2).at(sum_node1.end))
+
+    # Draw onto a standalone Agg figure and encode it in memory
+    figure = Figure()
+    d.draw(show=False, canvas=figure.add_subplot())
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+class DiagramRenderer:
+    """
+    Renders realization diagrams on one worker thread, with an LRU cache.
+
+    ``request(b, a)`` returns a Future holding the PNG bytes; it is already
+    done when the design was rendered before. Concurrent requests for the
+    same design share one render.
+    """
+
+    def __init__(self, max_entries=32, render=render_direct_form_ii):
+        self.max_entries = max_entries
+        self.render = render
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def request(self, b, a):
+        key = coefficient_key(b, a)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                future = Future()
+                future.set_result(self.cache[key])
+                return future
+            if key in self.pending:
+                return self.pending[key]
+            future = self.executor.submit(self.render, np.array(b), np.array(a))
+            self.pending[key] = future
+        future.add_done_callback(lambda done, key=key: self._store(key, done))
+        return future
+
+    def _store(self, key, future):
+        with self.lock:
+            self.pending.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self.cache[key] = future.result()
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
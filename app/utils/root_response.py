@@ -0,0 +1,133 @@
+from collections import Counter
+
+import numpy as np
+
+
+class RootResponse:
+    """
+    Frequency response H(e^jw) maintained incrementally from zeros and poles.
+
+    H is evaluated directly from the roots on a fixed grid (the same grid as
+    ``freqz(b, a, worN)``) without expanding any polynomial:
+
+        H(e^jw) = k * e^{jw(P - Z)} * prod(e^jw - z_i) / prod(e^jw - p_i)
+
+    The response is kept as a sum of per-root log-magnitude and phase
+    vectors, and each root's vectors are cached, so adding, removing or
+    moving one root is a single vectorized add/subtract over the grid instead
+    of a full recomputation.
+    """
+
+    # Guards log(0) for a root that lies exactly on a grid point
+    _TINY = 1e-300
+
+    def __init__(self, worN=500, rebuild_every=10000):
+        self.w = np.linspace(0, np.pi, worN, endpoint=False)
+        self._unit = np.exp(1j * self.w)
+        self._factors = {}  # root -> (log|e^jw - root|, angle(e^jw - root))
+        self.rebuild_every = rebuild_every
+        self.reset()
+
+    def reset(self, zeros=(), poles=(), gain=1.0):
+        """Recompute the response from scratch for the given roots."""
+        self.gain = complex(gain)
+        self.zeros = Counter()
+        self.poles = Counter()
+        self._factors = {}
+        self._log_magnitude = np.zeros(len(self.w))
+        self._phase = np.zeros(len(self.w))
+        self._updates = 0
+        for root in zeros:
+            self._add_root(self.zeros, root, 1)
+        for root in poles:
+            self._add_root(self.poles, root, -1)
+
+    @property
+    def zero_count(self):
+        return sum(self.zeros.values())
+
+    @property
+    def pole_count(self):
+        return sum(self.poles.values())
+
+    def add_zero(self, root):
+        self._add_root(self.zeros, root, 1)
+        self._count_update()
+
+    def add_pole(self, root):
+        self._add_root(self.poles, root, -1)
+        self._count_update()
+
+    def remove_zero(self, root):
+        self._remove_root(self.zeros, root, 1)
+        self._count_update()
+
+    def remove_pole(self, root):
+        self._remove_root(self.poles, root, -1)
+        self._count_update()
+
+    def move_zero(self, old, new):
+        self.remove_zero(old)
+        self.add_zero(new)
+
+    def move_pole(self, old, new):
+        self.remove_pole(old)
+        self.add_pole(new)
+
+    def swap(self):
+        """Swap zeros and poles by negating the accumulated root sums."""
+        self.zeros, self.poles = self.poles, self.zeros
+        self._log_magnitude = -self._log_magnitude
+        self._phase = -self._phase
+
+    def set_gain(self, gain):
+        self.gain = complex(gain)
+
+    def magnitude(self):
+        """Return |H(e^jw)|."""
+        return np.abs(self.gain) * np.exp(self._log_magnitude)
+
+    def phase(self):
+        """Return angle(H(e^jw)) wrapped to (-pi, pi]."""
+        delay = self.pole_count - self.zero_count
+        phase = self._phase + self.w * delay + np.angle(self.gain)
+        return np.angle(np.exp(1j * phase))
+
+    def response(self):
+        """Return ``(w, h)`` like ``freqz``."""
+        return self.w, self.magnitude() * np.exp(1j * self.phase())
+
+    def _factor(self, root):
+        factor = self._factors.get(root)
+        if factor is None:
+            difference = self._unit - root
+            factor = (np.log(np.maximum(np.abs(difference), self._TINY)), np.angle(difference))
+            self._factors[root] = factor
+        return factor
+
+    def _add_root(self, counter, root, sign):
+        root = complex(root)
+        log_magnitude, phase = self._factor(root)
+        self._log_magnitude += sign * log_magnitude
+        self._phase += sign * phase
+        counter[root] += 1
+
+    def _remove_root(self, counter, root, sign):
+        root = complex(root)
+        if counter.get(root, 0) <= 0:
+            raise ValueError(f"{root} is not a root of this response")
+        log_magnitude, phase = self._factor(root)
+        self._log_magnitude -= sign * log_magnitude
+        self._phase -= sign * phase
+        counter[root] -= 1
+        if counter[root] == 0:
+            del counter[root]
+            if root not in self.zeros and root not in self.poles:
+                del self._factors[root]
+
+    def _count_update(self):
+        # Recompute from the root multisets now and then so rounding errors
+        # from long add/remove sequences cannot accumulate
+        self._updates += 1
+        if self._updates >= self.rebuild_every:
+            self.reset(list(self.zeros.elements()), list(self.poles.elements()), self.gain)
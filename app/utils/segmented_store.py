@@ -0,0 +1,218 @@
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_SEGMENT_SIZE = 1 << 18  # 2 MiB of float64 per segment
+DEFAULT_CACHE_BYTES = 4 << 30  # Budget for spilled sessions in the cache directory
+
+
+def default_cache_root():
+    """Directory holding spilled signal sessions (DIGITAL_FILTER_CACHE_DIR/signals or the temp dir)."""
+    cache_root = os.environ.get("DIGITAL_FILTER_CACHE_DIR")
+    if cache_root:
+        return os.path.join(cache_root, "signals")
+    return os.path.join(tempfile.gettempdir(), "digital_filter_signals")
+
+
+def prune_cache(cache_root, max_bytes=DEFAULT_CACHE_BYTES, keep=()):
+    """Delete the oldest session directories until the cache fits in ``max_bytes``."""
+    if not os.path.isdir(cache_root):
+        return
+    sessions = []
+    for name in os.listdir(cache_root):
+        path = os.path.join(cache_root, name)
+        if not os.path.isdir(path) or path in keep:
+            continue
+        size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+        sessions.append((os.path.getmtime(path), size, path))
+
+    total = sum(size for _, size, _ in sessions)
+    for _, size, path in sorted(sessions):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+class SignalSession:
+    """
+    A directory for the stores of one capture, removed again on ``close``.
+
+    Creating a session first prunes older sessions (e.g. left behind by a
+    crash) so that the cache directory stays within ``max_bytes``.
+    """
+
+    def __init__(self, cache_root=None, max_bytes=DEFAULT_CACHE_BYTES, segment_size=DEFAULT_SEGMENT_SIZE, ram_segments=2):
+        self.cache_root = cache_root or default_cache_root()
+        os.makedirs(self.cache_root, exist_ok=True)
+        prune_cache(self.cache_root, max_bytes)
+        self.path = tempfile.mkdtemp(prefix="session_", dir=self.cache_root)
+        self.segment_size = segment_size
+        self.ram_segments = ram_segments
+        self.stores = []
+
+    def store(self, name):
+        """Create a new SegmentedStore spilling into this session."""
+        store = SegmentedStore(self.path, name, self.segment_size, self.ram_segments, session=self)
+        self.stores.append(store)
+        return store
+
+    def release(self, store):
+        """Forget a closed store (its files are already deleted)."""
+        if store in self.stores:
+            self.stores.remove(store)
+
+    def close(self):
+        for store in list(self.stores):
+            store.close()
+        self.stores = []
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class SegmentedStore:
+    """
+    Append-only float64 signal split into fixed-size segments.
+
+    The newest ``ram_segments`` segments live in memory; older ones are
+    written once to ``directory`` and read back through memory maps (a few
+    kept open, least recently used first), so RAM use stays constant however
+    long the capture grows while every sample remains addressable.
+    ``read(start, stop)`` returns any range, zero-copy when it lies within
+    one segment. Only samples still in memory can be modified or truncated.
+    """
+
+    def __init__(self, directory, name, segment_size=DEFAULT_SEGMENT_SIZE, ram_segments=2, max_open=32, session=None):
+        self.directory = directory
+        self.session = session  # SignalSession to release this store from on close
+        self.name = name
+        self.segment_size = int(segment_size)
+        self.ram_segments = max(1, ram_segments)
+        self.max_open = max_open
+        self.length = 0
+        self.spilled = 0  # Number of leading segments stored on disk
+        self.ram = []  # In-memory segments, oldest first
+        self._open_maps = OrderedDict()
+
+    def __len__(self):
+        return self.length
+
+    def _segment_path(self, index):
+        return os.path.join(self.directory, f"{self.name}_{index:06d}.f64")
+
+    def _segment(self, index):
+        if index >= self.spilled:
+            return self.ram[index - self.spilled]
+        segment = self._open_maps.get(index)
+        if segment is None:
+            segment = np.memmap(self._segment_path(index), dtype=np.float64, mode="r")
+            self._open_maps[index] = segment
+            if len(self._open_maps) > self.max_open:
+                self._open_maps.popitem(last=False)
+        else:
+            self._open_maps.move_to_end(index)
+        return segment
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        position = 0
+        while position < len(values):
+            offset = self.length % self.segment_size
+            if offset == 0:
+                self._new_segment()
+            count = min(self.segment_size - offset, len(values) - position)
+            self.ram[-1][offset:offset + count] = values[position:position + count]
+            self.length += count
+            position += count
+
+    def append(self, value):
+        offset = self.length % self.segment_size
+        if offset == 0:
+            self._new_segment()
+        self.ram[-1][offset] = value
+        self.length += 1
+
+    def _new_segment(self):
+        if len(self.ram) == self.ram_segments:
+            # Spill the oldest in-memory segment (it is full)
+            self.ram.pop(0).tofile(self._segment_path(self.spilled))
+            self.spilled += 1
+        self.ram.append(np.empty(self.segment_size))
+
+    def truncate(self, length):
+        """Drop samples after ``length`` (which must still be in memory)."""
+        length = min(length, self.length)
+        if length < self.spilled * self.segment_size:
+            raise ValueError("Cannot truncate into segments already spilled to disk")
+        self.length = length
+        # Release in-memory segments that are now empty
+        keep = -(-length // self.segment_size) - self.spilled
+        del self.ram[max(keep, 0):]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("SegmentedStore index out of range")
+        return self._segment(index // self.segment_size)[index % self.segment_size]
+
+    def __setitem__(self, index, value):
+        if index < 0:
+            index += self.length
+        if not self.spilled * self.segment_size <= index < self.length:
+            raise IndexError("Only samples still in memory can be modified")
+        self.ram[index // self.segment_size - self.spilled][index % self.segment_size] = value
+
+    def read(self, start, stop):
+        """Samples ``start:stop`` as an array (a view when in a single segment)."""
+        start = max(0, start)
+        stop = min(self.length, stop)
+        if stop <= start:
+            return np.zeros(0)
+        first, last = start // self.segment_size, (stop - 1) // self.segment_size
+        if first == last:
+            base = first * self.segment_size
+            return self._segment(first)[start - base:stop - base]
+        parts = []
+        for index in range(first, last + 1):
+            base = index * self.segment_size
+            parts.append(self._segment(index)[max(start, base) - base:min(stop, base + self.segment_size) - base])
+        return np.concatenate(parts)
+
+    def snapshot(self, start=0, stop=None):
+        """
+        Samples ``start:stop`` as a list of arrays that later appends never change.
+
+        Spilled segments are opened as new memory maps, so the list can be
+        read on another thread while this store keeps growing.
+        """
+        start = max(0, start)
+        stop = self.length if stop is None else min(self.length, stop)
+        parts = []
+        for index in range(start // self.segment_size, -(-stop // self.segment_size)):
+            base = index * self.segment_size
+            if index < self.spilled:
+                segment = np.memmap(self._segment_path(index), dtype=np.float64, mode="r")
+            else:
+                segment = self.ram[index - self.spilled]
+            parts.append(segment[max(start, base) - base:min(stop, base + self.segment_size) - base])
+        return parts
+
+    def clear(self):
+        self._open_maps.clear()
+        for index in range(self.spilled):
+            try:
+                os.remove(self._segment_path(index))
+            except OSError:
+                pass
+        self.length = 0
+        self.spilled = 0
+        self.ram = []
+
+    def close(self):
+        self.clear()
+        if self.session is not None:
+            self.session.release(self)
+            self.session = None
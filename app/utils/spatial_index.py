@@ -0,0 +1,123 @@
+import math
+
+
+class RootIndex:
+    """
+    Uniform-grid spatial index over points in the complex plane.
+
+    Each key (e.g. ``("zero", 3)``) is stored in the grid cell containing its
+    position. Insert, remove and move are O(1); nearest-point and radius
+    queries only visit the cells around the query point, so hit testing stays
+    fast with thousands of roots.
+    """
+
+    def __init__(self, cell_size=0.05):
+        self.cell_size = cell_size
+        self._cells = {}  # (column, row) -> set of keys
+        self._positions = {}  # key -> complex position
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def position(self, key):
+        return self._positions[key]
+
+    def clear(self):
+        self._cells.clear()
+        self._positions.clear()
+
+    def insert(self, key, position):
+        """Add ``key`` at ``position`` (replacing any previous entry for it)."""
+        if key in self._positions:
+            self.remove(key)
+        position = complex(position)
+        self._positions[key] = position
+        self._cells.setdefault(self._cell(position), set()).add(key)
+
+    def remove(self, key):
+        """Remove ``key``; returns its last position."""
+        position = self._positions.pop(key)
+        cell = self._cell(position)
+        keys = self._cells[cell]
+        keys.discard(key)
+        if not keys:
+            del self._cells[cell]
+        return position
+
+    def move(self, key, position):
+        """Move ``key`` to a new position."""
+        self.remove(key)
+        self.insert(key, position)
+
+    def nearest(self, point, max_distance=None):
+        """Return ``(key, distance)`` of the closest entry to ``point``, or None."""
+        if not self._positions:
+            return None
+        point = complex(point)
+        column, row = self._cell(point)
+        best_key, best_distance = None, math.inf
+        scanned = 0
+
+        ring = 0
+        while True:
+            # Every cell in ring r is at least (r - 1) * cell_size away, so once
+            # the best hit is closer than that no further ring can beat it
+            if best_key is not None and best_distance <= (ring - 1) * self.cell_size:
+                break
+            if max_distance is not None and (ring - 1) * self.cell_size > max_distance:
+                break
+            if scanned > len(self._cells):
+                # The query is far from every entry: scanning the occupied
+                # cells directly is cheaper than walking more empty rings
+                return self._nearest_brute_force(point, max_distance)
+
+            for cell in self._ring_cells(column, row, ring):
+                scanned += 1
+                for key in self._cells.get(cell, ()):
+                    distance = abs(self._positions[key] - point)
+                    if distance < best_distance:
+                        best_key, best_distance = key, distance
+            ring += 1
+
+        if best_key is None or (max_distance is not None and best_distance > max_distance):
+            return None
+        return best_key, best_distance
+
+    def within(self, point, radius):
+        """Return the keys whose position lies within ``radius`` of ``point``."""
+        point = complex(point)
+        min_column, min_row = self._cell(point - complex(radius, radius))
+        max_column, max_row = self._cell(point + complex(radius, radius))
+        hits = []
+        for column in range(min_column, max_column + 1):
+            for row in range(min_row, max_row + 1):
+                for key in self._cells.get((column, row), ()):
+                    if abs(self._positions[key] - point) <= radius:
+                        hits.append(key)
+        return hits
+
+    def _cell(self, position):
+        return math.floor(position.real / self.cell_size), math.floor(position.imag / self.cell_size)
+
+    @staticmethod
+    def _ring_cells(column, row, ring):
+        """Cells at Chebyshev distance ``ring`` from (column, row)."""
+        if ring == 0:
+            yield column, row
+            return
+        for offset in range(-ring, ring + 1):
+            yield column + offset, row - ring
+            yield column + offset, row + ring
+        for offset in range(-ring + 1, ring):
+            yield column - ring, row + offset
+            yield column + ring, row + offset
+
+    def _nearest_brute_force(self, point, max_distance):
+        key = min(self._positions, key=lambda k: abs(self._positions[k] - point))
+        distance = abs(self._positions[key] - point)
+        if max_distance is not None and distance > max_distance:
+            return None
+        return key, distance
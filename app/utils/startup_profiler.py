@@ -0,0 +1,70 @@
+"""
+Startup timing: named marks from the start of main.py to the first painted
+frame, plus which heavy optional modules were already loaded by then.
+
+main.py marks the import and window-construction phases and the controller
+marks "first_frame". Set ``DIGITAL_FILTER_STARTUP_REPORT=<path>`` to print
+the report and write it as JSON, and ``DIGITAL_FILTER_STARTUP_EXIT=1`` to quit
+right after the first frame (used by benchmarks/startup_budget.py).
+"""
+import json
+import os
+import sys
+import time
+
+# Modules that must only load on first use, never during startup
+LAZY_MODULES = ("scipy.signal", "schemdraw", "matplotlib", "tkinter", "pyqtgraph.examples")
+
+
+class StartupProfiler:
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []
+
+    def mark(self, name):
+        """Record the time elapsed since start under ``name``."""
+        self.marks.append((name, time.perf_counter() - self.start))
+
+    def elapsed(self, name):
+        for mark, seconds in self.marks:
+            if mark == name:
+                return seconds
+        return None
+
+    def loaded_lazy_modules(self):
+        return [name for name in LAZY_MODULES if name in sys.modules]
+
+    def report(self):
+        return {
+            "marks": dict(self.marks),
+            "modules": len(sys.modules),
+            "lazy_modules_loaded": self.loaded_lazy_modules(),
+        }
+
+    def format_report(self):
+        lines = ["Startup:"]
+        previous = 0.0
+        for name, seconds in self.marks:
+            lines.append(f"  {name:<16}{seconds * 1e3:9.1f} ms  (+{(seconds - previous) * 1e3:.1f} ms)")
+            previous = seconds
+        lines.append(f"  {len(sys.modules)} modules loaded")
+        loaded = self.loaded_lazy_modules()
+        if loaded:
+            lines.append(f"  Loaded before first use: {', '.join(loaded)}")
+        return "\n".join(lines)
+
+    def write(self, path):
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+
+# Created when main.py imports this module first, so start is the launch of main.py
+startup_profiler = StartupProfiler()
+
+
+def report_path():
+    return os.environ.get("DIGITAL_FILTER_STARTUP_REPORT")
+
+
+def exit_after_first_frame():
+    return os.environ.get("DIGITAL_FILTER_STARTUP_EXIT") == "1"
@@ -0,0 +1,53 @@
+"""
+Throughput of multi-channel streaming filtering against the number of worker threads.
+
+    python -m benchmarks.bench_multichannel --channels 64 --samples 200000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.utils.filter_design import FILTER_LIBRARY_SPECS, FilterDesignCache
+from app.utils.parallel_filter import ParallelStreamingFilter
+
+
+def measure(sos, signal, workers, block_size, repeats=3):
+    """Best-of-``repeats`` throughput in samples/s (all channels counted)."""
+    best = float("inf")
+    with ParallelStreamingFilter(sos, signal.shape[0], workers=workers) as stream_filter:
+        for _ in range(repeats):
+            stream_filter.reset()
+            start = time.perf_counter()
+            for offset in range(0, signal.shape[1], block_size):
+                stream_filter.process(signal[:, offset:offset + block_size])
+            best = min(best, time.perf_counter() - start)
+    return signal.size / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--block-size", type=int, default=8192)
+    parser.add_argument("--design", default="Elliptic LPF")
+    args = parser.parse_args(argv)
+
+    sos = FilterDesignCache().sos(FILTER_LIBRARY_SPECS[args.design])
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    rng = np.random.default_rng(0)
+
+    print(f"{'channels':>8} {'workers':>7} {'MS/s':>9} {'speedup':>8}")
+    for channels in args.channels:
+        signal = rng.standard_normal((channels, args.samples))
+        baseline = None
+        for workers in worker_counts:
+            rate = measure(sos, signal, workers, args.block_size)
+            baseline = baseline or rate
+            print(f"{channels:>8} {workers:>7} {rate / 1e6:>9.2f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
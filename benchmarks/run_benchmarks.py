@@ -0,0 +1,289 @@
+"""
+Micro-benchmarks for the numerical hot paths behind the GUI (no Qt needed).
+
+    python -m benchmarks.run_benchmarks                  # compare against baselines.json
+    python -m benchmarks.run_benchmarks --quick          # small sizes only
+    python -m benchmarks.run_benchmarks --save-baseline  # record new baselines
+
+Each case reports the best time per call. A case is flagged as a regression
+when it is slower than its stored baseline by more than ``--threshold``
+(the exit status is then 1). Baselines are machine-specific: record them on
+the machine you compare on.
+"""
+import argparse
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+from scipy.signal import freqz, lfilter
+
+from app.core.live_filter import LiveFilter
+from app.core.zplane_model import ZPlaneModel
+from app.utils.cascade import cascade_sos, roots_to_sos, sos_response
+from app.utils.filter_design import FILTER_LIBRARY_SPECS, FilterDesignCache
+from app.utils.filter_io import read_roots_csv, write_roots_csv
+from app.utils.filter_project import ProjectBundle, load_project, save_bundle, save_project
+from app.utils.filter_state import FilterState
+from app.utils.minmax_pyramid import MinMaxPyramid
+from app.utils.quantization import make_precision_filter
+from app.utils.root_response import RootResponse
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+HISTORY_SIZES = [10 ** exponent for exponent in range(2, 8)]  # 1e2 .. 1e7 samples
+ROOT_COUNTS = [2, 10, 50, 100, 200]
+QUICK_HISTORY_LIMIT = 10 ** 5
+QUICK_ROOT_LIMIT = 50
+CHANNEL_COUNTS = [1, 16, 256]
+QUICK_CHANNEL_LIMIT = 16
+BUNDLE_DESIGNS = 1000
+
+
+def random_roots(count, radius=0.9, seed=0):
+    """``count`` roots inside ``radius``, in conjugate pairs (plus a real root if odd)."""
+    # Seeded per case so --quick and -k runs time the same inputs as a full run
+    rng = np.random.default_rng((seed, count))
+    half = rng.uniform(0.1, radius, count // 2) * np.exp(1j * rng.uniform(0.1, np.pi - 0.1, count // 2))
+    roots = np.concatenate([half, half.conj()])
+    if count % 2:
+        roots = np.append(roots, rng.uniform(-radius, radius))
+    return roots
+
+
+def all_pass_roots(count):
+    """``count`` first-order all-pass sections: pole p, zero 1/conj(p)."""
+    poles = random_roots(count, radius=0.8, seed=2)
+    return 1 / poles.conj(), poles
+
+
+def time_per_call(func, repeats=5):
+    """Best time per call, with the loop count chosen by ``timeit`` autorange."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeats, number=number)) / number
+
+
+# Each bench_* function yields (case name, callable)
+
+def bench_apply_filter(history_sizes):
+    """Per mouse-event cost of LiveFilter.append against history length."""
+    design_cache = FilterDesignCache()
+    spec = FILTER_LIBRARY_SPECS["Elliptic LPF"]
+    b, a = design_cache.ba(spec)
+    zeros, poles, _ = design_cache.zpk(spec)
+    state = FilterState(zeros, poles, library="Elliptic LPF", design_cache=design_cache)
+    for size in history_sizes:
+        history = np.random.default_rng(size).standard_normal(size)
+        # Before streaming: the whole history was re-filtered on every event
+        yield f"apply_filter.legacy[n={size}]", lambda history=history: lfilter(b, a, history)
+
+        # Separate instances: the appends below must not grow the history the re-filter case times
+        streaming, refiltering = LiveFilter(), LiveFilter()
+        for live_filter in (streaming, refiltering):
+            live_filter.extend(history)
+            live_filter.set_design(state)
+        yield f"apply_filter.streaming[n={size}]", lambda live_filter=streaming: live_filter.append(0.5)
+
+        # Paid once whenever the design changes (LiveFilter.set_design)
+        yield f"apply_filter.refilter_history[n={size}]", refiltering.refilter
+
+
+def bench_plot_lod(history_sizes):
+    """Data handed to the signal plots per redraw: full history vs min/max windows."""
+    for size in history_sizes:
+        history = np.random.default_rng(size).standard_normal(size)
+        pyramid = MinMaxPyramid()
+        pyramid.extend(history)
+        # Before LOD the whole history was copied into the curve on every redraw
+        yield f"plot_lod.full_history[n={size}]", lambda history=history: np.array(history)
+        yield f"plot_lod.window_latest[n={size}]", lambda pyramid=pyramid: pyramid.window(len(pyramid) - 100, len(pyramid), 1600)
+        yield f"plot_lod.window_all[n={size}]", lambda pyramid=pyramid: pyramid.window(0, len(pyramid), 1600)
+        yield f"plot_lod.append[n={size}]", lambda pyramid=pyramid: pyramid.append(0.5)
+
+
+def bench_frequency_response(root_counts):
+    """ZPlaneController.update_frequency_response against the number of roots."""
+    for count in root_counts:
+        zeros, poles = random_roots(count), random_roots(count, seed=1)
+        yield f"frequency_response.freqz_poly[roots={count}]", \
+            lambda zeros=zeros, poles=poles: freqz(np.poly(zeros), np.poly(poles), worN=500)
+        yield f"frequency_response.sos_rebuild[roots={count}]", \
+            lambda zeros=zeros, poles=poles: sos_response(roots_to_sos(zeros, poles), worN=500)
+
+        engine = RootResponse(worN=500)
+        engine.reset(zeros, poles)
+        positions = [poles[0], poles[0] * 0.99]
+
+        def move_one_pole(engine=engine, positions=positions):
+            # Dragging a single pole back and forth
+            engine.move_pole(positions[0], positions[1])
+            positions.reverse()
+            return engine.response()
+        yield f"frequency_response.incremental_move[roots={count}]", move_one_pole
+
+
+def bench_root_round_trips(root_counts):
+    """np.roots/np.poly round trips in ZPlaneModel.select_library and get_filter_coefficients."""
+    design_cache = FilterDesignCache()
+    spec = FILTER_LIBRARY_SPECS["Elliptic LPF"]
+    b, a = design_cache.ba(spec)
+    yield "roots_round_trip.library_np_roots", lambda: (np.roots(b), np.roots(a))
+    yield "roots_round_trip.library_cached_zpk", lambda: design_cache.zpk(spec)
+    for count in root_counts:
+        zeros, poles = random_roots(count), random_roots(count, seed=1)
+        yield f"roots_round_trip.poly_roots[roots={count}]", \
+            lambda zeros=zeros, poles=poles: (np.roots(np.poly(zeros)), np.roots(np.poly(poles)))
+        yield f"filter_coefficients.poly[roots={count}]", \
+            lambda zeros=zeros, poles=poles: (np.poly(zeros), np.poly(poles))
+        yield f"filter_coefficients.sos[roots={count}]", \
+            lambda zeros=zeros, poles=poles: roots_to_sos(zeros, poles)
+
+
+def bench_filter_state(root_counts):
+    """Per-edit cost of a new FilterState, and reading an artifact it has already memoized."""
+    for count in root_counts:
+        zeros, poles = random_roots(count), random_roots(count, seed=1)
+        state = FilterState(zeros, poles)
+        state.sos()
+        moved = np.append(zeros[:-1], zeros[-1] * 0.99)
+        yield f"filter_state.replace[roots={count}]", \
+            lambda state=state, moved=moved: state.replace(zeros=moved)
+        yield f"filter_state.memoized_sos[roots={count}]", state.sos
+
+
+def bench_zplane_model(root_counts):
+    """One drag step through the headless ZPlaneModel (incremental response plus a new FilterState)."""
+    for count in root_counts:
+        model = ZPlaneModel()
+        model.load_roots(random_roots(count), random_roots(count, seed=1))
+        positions = [model.poles[0], model.poles[0] * 0.99]
+
+        def drag_step(model=model, positions=positions):
+            model.move_roots("pole", [0], positions[1])
+            positions.reverse()
+        yield f"zplane_model.drag_step[roots={count}]", drag_step
+
+
+def bench_all_pass(root_counts):
+    """Cost of combining the current design with the selected all-pass filters."""
+    spec = FILTER_LIBRARY_SPECS["Elliptic LPF"]
+    b, a = FilterDesignCache().ba(spec)
+    sos = FilterDesignCache().sos(spec)
+    for count in root_counts:
+        ap_zeros, ap_poles = all_pass_roots(count)
+        yield f"all_pass.poly_convolve[roots={count}]", \
+            lambda ap_zeros=ap_zeros, ap_poles=ap_poles: (np.convolve(b, np.poly(ap_zeros)), np.convolve(a, np.poly(ap_poles)))
+        yield f"all_pass.cascade_sos[roots={count}]", \
+            lambda ap_zeros=ap_zeros, ap_poles=ap_poles: cascade_sos(sos, roots_to_sos(ap_zeros, ap_poles))
+
+
+def bench_precision(channel_counts, block_size=4096):
+    """One streaming block per precision, for 1-D and multi-channel signals."""
+    sos = FilterDesignCache().sos(FILTER_LIBRARY_SPECS["Elliptic LPF"])
+    for channels in channel_counts:
+        block = 0.25 * np.random.default_rng(channels).standard_normal((channels, block_size))
+        for precision in ("float64", "float32", "q15"):
+            if precision == "q15" and channels > 16:
+                continue  # The fixed-point model is a Python loop: too slow to be interesting here
+            stream_filter = make_precision_filter(sos, precision, channels=channels)
+            typed_block = block.astype(np.float32) if precision == "float32" else block
+            yield f"precision.{precision}[channels={channels}]", \
+                lambda stream_filter=stream_filter, typed_block=typed_block: stream_filter.process(typed_block)
+
+
+def bench_project_files(root_counts):
+    """Loading a design from CSV vs. a .dfp project, and opening a bundle of many designs."""
+    directory = tempfile.mkdtemp(prefix="digital_filter_bench_")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    for count in root_counts:
+        zeros, poles = random_roots(count), random_roots(count, seed=1)
+        csv_path = os.path.join(directory, f"design_{count}.csv")
+        project_path = os.path.join(directory, f"design_{count}.dfp")
+        write_roots_csv(csv_path, zeros, poles)
+        save_project(project_path, zeros, poles)
+        yield f"project_load.csv[roots={count}]", lambda csv_path=csv_path: read_roots_csv(csv_path)
+        yield f"project_load.dfp[roots={count}]", lambda project_path=project_path: load_project(project_path)
+
+    bundle_path = os.path.join(directory, "designs.dfpb")
+    save_bundle(bundle_path, ((f"design_{index}", random_roots(8, seed=index), random_roots(8, seed=index + 1))
+                              for index in range(BUNDLE_DESIGNS)))
+    yield f"project_load.bundle_iterate[designs={BUNDLE_DESIGNS}]", lambda: list(ProjectBundle(bundle_path))
+
+
+def collect_cases(quick=False):
+    history_sizes = [size for size in HISTORY_SIZES if not quick or size <= QUICK_HISTORY_LIMIT]
+    root_counts = [count for count in ROOT_COUNTS if not quick or count <= QUICK_ROOT_LIMIT]
+    yield from bench_apply_filter(history_sizes)
+    yield from bench_plot_lod(history_sizes)
+    yield from bench_frequency_response(root_counts)
+    yield from bench_root_round_trips(root_counts)
+    yield from bench_filter_state(root_counts)
+    yield from bench_zplane_model(root_counts)
+    yield from bench_all_pass(root_counts)
+    yield from bench_precision([count for count in CHANNEL_COUNTS if not quick or count <= QUICK_CHANNEL_LIMIT])
+    yield from bench_project_files(root_counts)
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the numerical micro-benchmarks.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Allowed slowdown before flagging a regression (default: 0.5 = 50%%)")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest sizes")
+    parser.add_argument("-k", "--filter", default="", help="Only run cases whose name contains this text")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines(args.baseline)
+    results = {}
+    regressions = []
+    print(f"{'case':<48} {'time':>11} {'baseline':>11} {'change':>8}")
+    for name, func in collect_cases(args.quick):
+        if args.filter not in name:
+            continue
+        seconds = time_per_call(func)
+        results[name] = seconds
+        baseline = baselines.get(name)
+        if baseline is None:
+            print(f"{name:<48} {format_time(seconds)} {'-':>11} {'new':>8}")
+            continue
+        change = seconds / baseline - 1
+        flag = ""
+        if change > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {format_time(seconds)} {format_time(baseline)} {change:+7.0%}{flag}")
+
+    if args.save_baseline:
+        baselines.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} baselines to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
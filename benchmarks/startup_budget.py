@@ -0,0 +1,97 @@
+"""
+Time-to-first-frame check for the GUI.
+
+    python -m benchmarks.startup_budget                 # best of 3 launches vs. the 2 s budget
+    python -m benchmarks.startup_budget --budget 1.5 --imports 15
+
+Launches main.py (offscreen unless QT_QPA_PLATFORM is set) with
+DIGITAL_FILTER_STARTUP_EXIT=1 so it quits right after the first painted
+frame, and reads the startup report it writes. Fails (exit status 1) when
+the best first-frame time is over ``--budget`` seconds or when a module that
+should load lazily (scipy.signal, schemdraw, matplotlib, tkinter,
+pyqtgraph.examples) was imported before the first frame. ``--imports`` lists
+the slowest imports from ``python -X importtime``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def launch(import_times=False, timeout=60):
+    """Start the app once; return (startup report, importtime stderr)."""
+    handle, report_path = tempfile.mkstemp(suffix=".json", prefix="digital_filter_startup_")
+    os.close(handle)
+    env = dict(os.environ, DIGITAL_FILTER_STARTUP_EXIT="1", DIGITAL_FILTER_STARTUP_REPORT=report_path)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    command = [sys.executable] + (["-X", "importtime"] if import_times else []) + ["main.py"]
+    try:
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            raise RuntimeError(f"main.py exited with status {result.returncode}:\n{result.stderr[-2000:]}")
+        with open(report_path, "r") as file:
+            return json.load(file), result.stderr
+    finally:
+        os.remove(report_path)
+
+
+def slowest_imports(importtime_output, count):
+    """Top-level packages with the largest total import time (own modules only), in seconds."""
+    totals = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_time) / 1e6
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the GUI time to first frame against a budget.")
+    parser.add_argument("--budget", type=float, default=2.0, help="Allowed seconds to the first frame (default: 2.0)")
+    parser.add_argument("--runs", type=int, default=3, help="Launches; the best one is compared (default: 3)")
+    parser.add_argument("--imports", type=int, default=0, metavar="N", help="Show the N slowest imports")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for _ in range(max(1, args.runs)):
+        try:
+            report, _ = launch()
+        except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        reports.append(report)
+    best = min(reports, key=lambda report: report["marks"]["first_frame"])
+
+    previous = 0.0
+    for name, seconds in best["marks"].items():
+        print(f"{name:<16}{seconds * 1e3:9.1f} ms  (+{(seconds - previous) * 1e3:.1f} ms)")
+        previous = seconds
+    print(f"{best['modules']} modules loaded at the first frame")
+
+    if args.imports:
+        _, output = launch(import_times=True)
+        print("\nSlowest imports:")
+        for name, seconds in slowest_imports(output, args.imports):
+            print(f"  {name:<24}{seconds * 1e3:9.1f} ms")
+
+    failed = False
+    first_frame = best["marks"]["first_frame"]
+    if first_frame > args.budget:
+        print(f"\nFirst frame after {first_frame:.3f} s: over the {args.budget:.3f} s budget")
+        failed = True
+    if best["lazy_modules_loaded"]:
+        print(f"\nLoaded before the first frame (should be lazy): {', '.join(best['lazy_modules_loaded'])}")
+        failed = True
+    if not failed:
+        print(f"\nFirst frame after {first_frame:.3f} s (budget {args.budget:.3f} s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
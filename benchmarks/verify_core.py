@@ -0,0 +1,168 @@
+"""
+Check that the numerical core runs without the GUI.
+
+    python -m benchmarks.verify_core
+    python -m benchmarks.verify_core --samples 1000000 --roots 200
+
+Imports app.core in a fresh interpreter and fails if that pulls in a GUI
+module (PyQt5, pyqtgraph, schemdraw, matplotlib) or a display. Then, with
+and without a ComputePipeline, it loads every library design into a
+ZPlaneModel, edits roots (add, drag, undo/redo) and filters a signal through
+a LiveFilter with a design change halfway, comparing the incremental
+response with RootResponse.reset and FilterState.response and the live
+output with sosfilt. Exits with status 1 on any failure.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+from scipy.signal import sosfilt
+
+from app.core.live_filter import LiveFilter
+from app.core.zplane_model import ZPlaneModel
+from app.utils.compute_pipeline import ComputePipeline
+from app.utils.filter_design import FILTER_LIBRARY_SPECS
+from app.utils.root_response import RootResponse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_MODULES = ("PyQt5", "pyqtgraph", "schemdraw", "matplotlib")
+
+IMPORT_CHECK = f"""
+import sys, time
+start = time.perf_counter()
+import app.core.live_filter, app.core.zplane_model
+seconds = time.perf_counter() - start
+loaded = sorted({{name.split(".")[0] for name in sys.modules}} & set({GUI_MODULES!r}))
+print(seconds, *loaded)
+"""
+
+
+def check_imports():
+    """Import the core in a clean interpreter; return (seconds, GUI modules it loaded)."""
+    env = dict(os.environ)
+    env.pop("DISPLAY", None)
+    env.pop("WAYLAND_DISPLAY", None)
+    result = subprocess.run([sys.executable, "-c", IMPORT_CHECK], cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app.core failed:\n{result.stderr[-2000:]}")
+    seconds, *loaded = result.stdout.split()
+    return float(seconds), loaded
+
+
+def wait_for(collect, timeout=30.0):
+    """Call ``collect`` until it returns True (pipeline results arrive on worker threads)."""
+    deadline = time.perf_counter() + timeout
+    while not collect():
+        if time.perf_counter() > deadline:
+            raise RuntimeError("Timed out waiting for the compute pipeline")
+        time.sleep(0.001)
+
+
+def response_error(model):
+    """Worst relative difference between the model's response and a rebuild from its roots."""
+    expected = RootResponse(worN=len(model.response_engine.w))
+    expected.reset(model.filter_state.combined_zeros, model.filter_state.combined_poles, model.response_gain())
+    magnitude = expected.magnitude()
+    return np.max(np.abs(model.response_engine.magnitude() - magnitude)) / max(1.0, np.max(magnitude))
+
+
+def plotted_error(model):
+    """Worst relative difference between the plotted response and the applied filter's (library gain included)."""
+    _, applied = model.filter_state.response(len(model.response_engine.w))
+    return np.max(np.abs(model.response_engine.magnitude() - np.abs(applied))) / max(1.0, np.max(np.abs(applied)))
+
+
+def check_model(pipeline, roots, tolerance):
+    """Load every design, then edit ``roots`` random roots; return the names of failed checks."""
+    model = ZPlaneModel(pipeline=pipeline)
+    failures = []
+    for name in FILTER_LIBRARY_SPECS:
+        model.select_library(name)
+        if model.library_design_pending():
+            wait_for(model.collect_library_design)
+        if model.response_pending:
+            wait_for(model.collect_response)
+        if response_error(model) > tolerance or plotted_error(model) > tolerance:
+            failures.append(f"library {name}")
+
+    # Editing a library design (the README example) must change the applied filter too
+    sos = model.filter_state.sos()
+    model.add_root("zero", -0.5 + 0.5j, conjugate=True)
+    if np.array_equal(model.filter_state.sos(), sos) or plotted_error(model) > tolerance:
+        failures.append("library edit")
+
+    rng = np.random.default_rng(0)
+    model.clear_all()
+    for position in 0.95 * np.exp(1j * rng.uniform(0, np.pi, roots // 2)):
+        model.add_root(["zero", "pole"][rng.integers(2)], position, conjugate=True)
+    if model.response_pending:
+        wait_for(model.collect_response)
+    before = model.response_engine.magnitude().copy()
+
+    kind, indices = model.find_drag_target(model.poles[0], 1e-9, conjugate=True)
+    origin = tuple(model.poles[index] for index in indices)
+    for step in np.linspace(0, 0.3, 20):
+        model.move_roots(kind, indices, origin[0] * (1 - step))
+    model.record_move(kind, indices, origin)
+    if response_error(model) > tolerance:
+        failures.append("drag")
+    model.undo()
+    if response_error(model) > tolerance or np.max(np.abs(model.response_engine.magnitude() - before)) > tolerance * max(1.0, np.max(before)):
+        failures.append("undo")
+    model.redo()
+    if response_error(model) > tolerance:
+        failures.append("redo")
+    return failures, model
+
+
+def check_live_filter(pipeline, model, samples, tolerance):
+    """Filter ``samples`` with a design change halfway; return the error against sosfilt."""
+    signal = np.random.default_rng(1).standard_normal(samples)
+    live_filter = LiveFilter(pipeline=pipeline)
+    live_filter.extend(signal[:samples // 2])
+    live_filter.set_design(model.filter_state)
+    live_filter.extend(signal[samples // 2:])
+    if pipeline is not None:
+        wait_for(live_filter.collect)
+
+    expected = sosfilt(model.filter_state.sos(), signal)
+    error = np.max(np.abs(live_filter.filtered_signal.read(0, samples) - expected)) / max(1.0, np.max(np.abs(expected)))
+    live_filter.close()
+    return error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify that the numerical core works without the GUI.")
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--roots", type=int, default=100, help="Roots placed for the edit check (above 64 rebuilds on the pipeline)")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="Allowed error relative to the peak")
+    args = parser.parse_args(argv)
+
+    failures = []
+    seconds, loaded = check_imports()
+    print(f"import app.core: {seconds * 1e3:.1f} ms" + (f", loaded {', '.join(loaded)}" if loaded else ""))
+    if loaded:
+        failures.append("imports")
+
+    for label, pipeline in (("inline", None), ("pipeline", ComputePipeline())):
+        model_failures, model = check_model(pipeline, args.roots, args.tolerance)
+        error = check_live_filter(pipeline, model, args.samples, args.tolerance)
+        status = "ok" if not model_failures and error <= args.tolerance else "MISMATCH"
+        print(f"{label:<9} designs={len(FILTER_LIBRARY_SPECS)} roots={len(model.zeros) + len(model.poles)} "
+              f"live_filter={error:.1e}" + (f" failed: {', '.join(model_failures)}" if model_failures else "") + f"  {status}")
+        if status != "ok":
+            failures.append(label)
+        if pipeline is not None:
+            pipeline.close()
+
+    if failures:
+        print(f"Failed: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
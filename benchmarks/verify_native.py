@@ -0,0 +1,97 @@
+"""
+Check the generated C code and the native streaming engine against scipy.
+
+    python -m benchmarks.verify_native
+    python -m benchmarks.verify_native --samples 1000000 --design "Elliptic LPF"
+
+For every library design, the exported cascade and DF2T code and the runtime
+kernel (NativeStreamingFilter) are compiled, fed the same signal in uneven
+blocks, and compared with sosfilt/lfilter. Throughput is reported for whole
+blocks and for one sample per call (the mouse loop). Exits with status 1
+when any output differs by more than the tolerance.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+from scipy.signal import lfilter, sos2tf, sosfilt
+
+from app.utils.c_export import NativeBuildError, NativeStreamingFilter, generate_c_code, load_generated
+from app.utils.filter_design import FILTER_LIBRARY_SPECS, FilterDesignCache
+from app.utils.streaming_filter import StreamingFilter
+
+
+def in_blocks(process, signal, block_size):
+    return np.concatenate([process(signal[start:start + block_size]) for start in range(0, len(signal), block_size)])
+
+
+def rate(func, samples, repeats=3):
+    """Best-of-``repeats`` throughput in samples/s."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return samples / best
+
+
+def verify(name, sos, signal, tolerance):
+    """Return the worst relative error of the native paths for one design."""
+    expected = sosfilt(sos, signal)
+    scale = max(1.0, np.max(np.abs(expected)))
+    b, a = sos2tf(sos)
+    expected_df2t = lfilter(b, a, signal)
+
+    code = generate_c_code(sos)
+    cascade = load_generated(code, structure="cascade")
+    df2t = load_generated(code, structure="df2t")
+    native = NativeStreamingFilter(sos)
+
+    errors = {
+        "export cascade": np.max(np.abs(in_blocks(cascade, signal, 1000) - expected)),
+        "export df2t": np.max(np.abs(in_blocks(df2t, signal, 1000) - expected_df2t)),
+        "native": np.max(np.abs(in_blocks(native.process, signal, 777) - expected)),
+    }
+    worst = max(errors.values()) / scale
+    status = "ok" if worst <= tolerance else "MISMATCH"
+    print(f"{name:<20} " + " ".join(f"{key}={value:.1e}" for key, value in errors.items()) + f"  {status}")
+    return worst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify the native C filter paths against scipy.")
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--design", default="Elliptic LPF", help="Design used for the throughput comparison")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="Allowed error relative to the output peak")
+    args = parser.parse_args(argv)
+
+    design_cache = FilterDesignCache()
+    signal = np.random.default_rng(0).standard_normal(args.samples)
+    try:
+        failures = [
+            name for name, spec in FILTER_LIBRARY_SPECS.items()
+            if verify(name, np.array(design_cache.sos(spec)), signal[:20000], args.tolerance) > args.tolerance
+        ]
+    except NativeBuildError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    sos = np.array(design_cache.sos(FILTER_LIBRARY_SPECS[args.design]))
+    scipy_filter = StreamingFilter.from_sos(sos)
+    native_filter = NativeStreamingFilter(sos)
+    per_sample = signal[:20000]
+    print(f"\nThroughput ({args.design}, {len(sos)} sections):")
+    print(f"  block   scipy  {rate(lambda: scipy_filter.filter(signal), len(signal)) / 1e6:8.2f} MS/s")
+    print(f"  block   native {rate(lambda: native_filter.filter(signal), len(signal)) / 1e6:8.2f} MS/s")
+    print(f"  sample  scipy  {rate(lambda: [scipy_filter.process_sample(x) for x in per_sample], len(per_sample)) / 1e6:8.2f} MS/s")
+    print(f"  sample  native {rate(lambda: [native_filter.process_sample(x) for x in per_sample], len(per_sample)) / 1e6:8.2f} MS/s")
+
+    if failures:
+        print(f"{len(failures)} design(s) differ from scipy: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,15 @@
 import sys
+from app.utils.startup_profiler import startup_profiler  # Imported first: its clock starts here
 from app.controller import MainWindowController
 from PyQt5 import QtWidgets
 
+startup_profiler.mark("imports")
+
 
 def main():
     app = QtWidgets.QApplication(sys.argv)
     main_window = MainWindowController(app)
+    startup_profiler.mark("window_built")
     main_window.showFullScreen()
     sys.exit(app.exec_())
 